@@ -14,7 +14,6 @@
 # limitations under the License.
 
 import asyncio
-import logging
 from typing import AsyncGenerator
 from typing_extensions import override
 
@@ -25,6 +24,7 @@ from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 from google.adk.events import Event
 from pydantic import BaseModel, Field
+from app_logging import Payload, get_logger, setup_logging
 
 # --- Constants ---
 APP_NAME = "story_app"
@@ -33,8 +33,7 @@ SESSION_ID = "123344"
 GEMINI_2_FLASH = "gemini-2.0-flash"
 
 # --- Configure Logging ---
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 # --- Custom Orchestrator Agent ---
@@ -117,52 +116,52 @@ class StoryFlowAgent(BaseAgent):
         Implements the custom orchestration logic for the story workflow.
         Uses the instance attributes assigned by Pydantic (e.g., self.story_generator).
         """
-        logger.info(f"[{self.name}] Starting story generation workflow.")
+        logger.info("[%s] Starting story generation workflow.", self.name)
 
         # 1. Initial Story Generation
-        logger.info(f"[{self.name}] Running StoryGenerator...")
+        logger.info("[%s] Running StoryGenerator...", self.name)
         async for event in self.story_generator.run_async(ctx):
-            logger.info(f"[{self.name}] Event from StoryGenerator: {event.model_dump_json(indent=2, exclude_none=True)}")
+            logger.info("[%s] Event from StoryGenerator: %s", self.name, Payload(event))
             yield event
 
         # Check if story was generated before proceeding
         if "current_story" not in ctx.session.state or not ctx.session.state["current_story"]:
-             logger.error(f"[{self.name}] Failed to generate initial story. Aborting workflow.")
+             logger.error("[%s] Failed to generate initial story. Aborting workflow.", self.name)
              return # Stop processing if initial story failed
 
-        logger.info(f"[{self.name}] Story state after generator: {ctx.session.state.get('current_story')}")
+        logger.info("[%s] Story state after generator: %s", self.name, ctx.session.state.get('current_story'))
 
 
         # 2. Critic-Reviser Loop
-        logger.info(f"[{self.name}] Running CriticReviserLoop...")
+        logger.info("[%s] Running CriticReviserLoop...", self.name)
         # Use the loop_agent instance attribute assigned during init
         async for event in self.loop_agent.run_async(ctx):
-            logger.info(f"[{self.name}] Event from CriticReviserLoop: {event.model_dump_json(indent=2, exclude_none=True)}")
+            logger.info("[%s] Event from CriticReviserLoop: %s", self.name, Payload(event))
             yield event
 
-        logger.info(f"[{self.name}] Story state after loop: {ctx.session.state.get('current_story')}")
+        logger.info("[%s] Story state after loop: %s", self.name, ctx.session.state.get('current_story'))
 
         # 3. Sequential Post-Processing (Grammar and Tone Check)
-        logger.info(f"[{self.name}] Running PostProcessing...")
+        logger.info("[%s] Running PostProcessing...", self.name)
         # Use the sequential_agent instance attribute assigned during init
         async for event in self.sequential_agent.run_async(ctx):
-            logger.info(f"[{self.name}] Event from PostProcessing: {event.model_dump_json(indent=2, exclude_none=True)}")
+            logger.info("[%s] Event from PostProcessing: %s", self.name, Payload(event))
             yield event
 
         # 4. Tone-Based Conditional Logic
         tone_check_result = ctx.session.state.get("tone_check_result")
-        logger.info(f"[{self.name}] Tone check result: {tone_check_result}")
+        logger.info("[%s] Tone check result: %s", self.name, tone_check_result)
 
         if tone_check_result == "negative":
-            logger.info(f"[{self.name}] Tone is negative. Regenerating story...")
+            logger.info("[%s] Tone is negative. Regenerating story...", self.name)
             async for event in self.story_generator.run_async(ctx):
-                logger.info(f"[{self.name}] Event from StoryGenerator (Regen): {event.model_dump_json(indent=2, exclude_none=True)}")
+                logger.info("[%s] Event from StoryGenerator (Regen): %s", self.name, Payload(event))
                 yield event
         else:
-            logger.info(f"[{self.name}] Tone is not negative. Keeping current story.")
+            logger.info("[%s] Tone is not negative. Keeping current story.", self.name)
             pass
 
-        logger.info(f"[{self.name}] Workflow finished.")
+        logger.info("[%s] Workflow finished.", self.name)
 
 # --- Define the individual LLM agents ---
 story_generator = LlmAgent(
@@ -226,7 +225,7 @@ INITIAL_STATE = {"topic": "a brave kitten exploring a haunted house"}
 async def setup_session_and_runner():
     session_service = InMemorySessionService()
     session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID, state=INITIAL_STATE)
-    logger.info(f"Initial session state: {session.state}")
+    logger.info("Initial session state: %s", session.state)
     runner = Runner(
         agent=story_flow_agent, # Pass the custom orchestrator agent
         app_name=APP_NAME,
@@ -251,7 +250,7 @@ async def call_agent_async(user_input_topic: str):
         return
 
     current_session.state["topic"] = user_input_topic
-    logger.info(f"Updated session state topic to: {user_input_topic}")
+    logger.info("Updated session state topic to: %s", user_input_topic)
 
     content = types.Content(role='user', parts=[types.Part(text=f"Generate a story about: {user_input_topic}")])
     events = runner.run_async(user_id=USER_ID, session_id=SESSION_ID, new_message=content)
@@ -259,7 +258,7 @@ async def call_agent_async(user_input_topic: str):
     final_response = "No final response captured."
     async for event in events:
         if event.is_final_response() and event.content and event.content.parts:
-            logger.info(f"Potential final response from [{event.author}]: {event.content.parts[0].text}")
+            logger.info("Potential final response from [%s]: %s", event.author, event.content.parts[0].text)
             final_response = event.content.parts[0].text
 
     print("\n--- Agent Interaction Result ---")
@@ -283,6 +282,7 @@ async def main():
 # Note: In Colab, you can directly use 'await' at the top level.
 # # If running this code as a standalone Python script, you'll need to use asyncio.run() or manage the event loop.
 if __name__ == "__main__":
+    setup_logging()
     asyncio.run(call_agent_async("a lonely robot finding a friend in a junkyard"))
 
 # # Execute the main async function
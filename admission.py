@@ -0,0 +1,122 @@
+# admission.py
+# Token-bucket rate limiting with a bounded wait queue, one limiter per upstream host.
+# Limiters live in one process; mcp_serving gives each HTTP worker its share of
+# MCP_UPSTREAM_RATE and MCP_UPSTREAM_BURST, so the settings hold for the server as a whole.
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict
+from urllib.parse import urlsplit
+
+# Upstream requests per second and burst size per host; a rate of 0 disables limiting
+UPSTREAM_RATE = float(os.getenv("MCP_UPSTREAM_RATE", "50"))
+UPSTREAM_BURST = int(os.getenv("MCP_UPSTREAM_BURST", "100"))
+# Callers allowed to wait for a token at once, and the longest any one may wait
+UPSTREAM_MAX_QUEUE = int(os.getenv("MCP_UPSTREAM_MAX_QUEUE", "200"))
+UPSTREAM_MAX_WAIT = float(os.getenv("MCP_UPSTREAM_MAX_WAIT_MS", "2000")) / 1000
+
+
+class OverloadedError(RuntimeError):
+    """Raised instead of queueing when a request could not be admitted within the limits."""
+
+
+class RateLimiter:
+    """
+    Token bucket that hands out reservations: a caller takes a token now, or
+    the next free one and sleeps until it is due. When that wait would be
+    longer than max_wait, or max_queue callers are already waiting, the caller
+    is rejected at once with OverloadedError instead of hanging.
+    Meant for use from one event loop.
+    Args:
+        rate (float): Tokens added per second.
+        burst (int): Bucket size, i.e. requests allowed back to back.
+        max_queue (int): Callers allowed to wait at once.
+        max_wait (float): Longest wait in seconds before rejecting.
+        clock (callable): Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        rate: float = UPSTREAM_RATE,
+        burst: int = UPSTREAM_BURST,
+        max_queue: int = UPSTREAM_MAX_QUEUE,
+        max_wait: float = UPSTREAM_MAX_WAIT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_wait = 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Waits for a token, or raises OverloadedError if that would take too long."""
+        if self.rate <= 0:
+            self.admitted += 1
+            return
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            self.admitted += 1
+            return
+        # Reserve the next token; tokens go negative while callers wait for them
+        wait = (1 - self._tokens) / self.rate
+        if self.queued >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise OverloadedError(f"upstream queue is full ({self.queued} waiting)")
+        if wait > self.max_wait:
+            self.rejected_wait += 1
+            raise OverloadedError(f"upstream is rate limited, next slot in {wait * 1000:.0f} ms")
+        self._tokens -= 1
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self._tokens += 1  # give the reservation back
+            raise
+        finally:
+            self.queued -= 1
+        self.admitted += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns admission counters and the current queue depth. Read-only, so safe from other threads."""
+        tokens = min(self.burst, self._tokens + (self._clock() - self._updated) * self.rate)
+        return {
+            "rate": self.rate,
+            "tokens": max(0.0, tokens),
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "admitted_total": self.admitted,
+            "rejected_queue_full_total": self.rejected_queue_full,
+            "rejected_wait_total": self.rejected_wait,
+        }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def limiter_for(url: str) -> RateLimiter:
+    """Returns the shared limiter for the host of `url`, created with the MCP_UPSTREAM_* settings."""
+    host = urlsplit(url).netloc
+    limiter = _limiters.get(host)
+    if limiter is None:
+        limiter = _limiters[host] = RateLimiter()
+    return limiter
+
+
+def admission_stats() -> Dict[str, Dict[str, Any]]:
+    """Returns limiter stats keyed by upstream host."""
+    return {host: limiter.stats() for host, limiter in _limiters.items()}
@@ -1,12 +1,39 @@
 from google.adk.agents import Agent
 import requests
+import httpx
 import json
+import logging
 from typing import Any, Dict, List, Optional
 from google.adk.agents import SequentialAgent,ParallelAgent
 from dotenv import load_dotenv
+from app_logging import Payload, get_logger
+from tool_compaction import ToolResultCompactor
+from objects_api import (
+    BASE_URL,
+    ObjectNotFoundError,
+    acreate_object,
+    afetch_all_objects,
+    afetch_object,
+    afetch_objects_by_ids,
+    afetch_objects_page,
+    apatch_object,
+    aremove_object,
+    areplace_object,
+    create_object,
+    fetch_all_objects,
+    fetch_object,
+    fetch_objects_by_ids,
+    fetch_objects_page,
+    patch_object,
+    read_path_stats,
+    remove_object,
+    replace_object,
+)
 
 load_dotenv()
 
+logger = get_logger(__name__)
+
 #1. Basic Agent
 base_agent = Agent(
     model='gemini-2.0-flash-001',
@@ -18,21 +45,35 @@ base_agent = Agent(
 
 # 2. Basic Agent with Tool and Multi-Tool Agent for calling RESTAPI
 
-BASE_URL = "https://api.restful-api.dev/objects"
-
 def get_all_objects() -> Optional[List[Dict[str, Any]]]:
     """
     Consumes GET List of all objects: https://api.restful-api.dev/objects
     """
-    print("\n--- GET All Objects ---")
+    logger.info("GET All Objects")
     try:
-        response = requests.get(BASE_URL)
-        response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
-        data = response.json()
-        print(json.dumps(data, indent=2))
+        data = fetch_all_objects()  # Raises for HTTP errors (4xx or 5xx)
+        logger.debug("Response: %s", Payload(data))
         return data
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching all objects: {e}")
+        logger.error("Error fetching all objects: %s", e)
+        return None
+
+def get_objects_page(limit: int = 50, offset: int = 0, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Consumes GET List of all objects page by page: https://api.restful-api.dev/objects
+    The list is parsed as it streams in and only the requested slice is returned.
+    Args:
+        limit (int): Maximum number of objects to return.
+        offset (int): Number of objects to skip from the start of the list.
+        fields (list): Optional fields to keep for each object, e.g. ["id", "name"] or ["data.color"].
+    """
+    logger.info("GET Objects Page: offset=%s limit=%s fields=%s", offset, limit, fields)
+    try:
+        page = fetch_objects_page(offset=offset, limit=limit, fields=fields)
+        logger.debug("Response: %s", Payload(page))
+        return page
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error("Error fetching objects page: %s", e)
         return None
 
 def get_objects_by_ids(ids: List[int]) -> Optional[List[Dict[str, Any]]]:
@@ -41,16 +82,13 @@ def get_objects_by_ids(ids: List[int]) -> Optional[List[Dict[str, Any]]]:
     Args:
         ids (list): A list of integer IDs.
     """
-    print(f"\n--- GET Objects by IDs: {ids} ---")
-    params = {'id': ids} # Requests handles list parameters correctly for multiple 'id'
+    logger.info("GET Objects by IDs: %s", ids)
     try:
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
-        print(json.dumps(data, indent=2))
+        data = fetch_objects_by_ids(ids)
+        logger.debug("Response: %s", Payload(data))
         return data
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching objects by IDs: {e}")
+        logger.error("Error fetching objects by IDs: %s", e)
         return None
 
 def get_single_object(object_id: str) -> Optional[Dict[str, Any]]:
@@ -59,16 +97,13 @@ def get_single_object(object_id: str) -> Optional[Dict[str, Any]]:
     Args:
         object_id (str): The ID of the object to retrieve.
     """
-    print(f"\n--- GET Single Object: {object_id} ---")
-    url = f"{BASE_URL}/{object_id}"
+    logger.info("GET Single Object: %s", object_id)
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        print(json.dumps(data, indent=2))
+        data = fetch_object(object_id)
+        logger.debug("Response: %s", Payload(data))
         return data
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching single object {object_id}: {e}")
+        logger.error("Error fetching single object %s: %s", object_id, e)
         return None
 
 def add_object(name: str, data_payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -78,20 +113,18 @@ def add_object(name: str, data_payload: Dict[str, Any]) -> Optional[Dict[str, An
         name (str): The name of the new object.
         data_payload (dict): A dictionary representing the 'data' field of the object.
     """
-    print(f"\n--- POST Add Object: {name} ---")
+    logger.info("POST Add Object: %s", name)
     payload = {
         "name": name,
         "data": data_payload
     }
     headers = {"Content-Type": "application/json"}
     try:
-        response = requests.post(BASE_URL, json=payload, headers=headers)
-        response.raise_for_status()
-        new_object = response.json()
-        print(json.dumps(new_object, indent=2))
+        new_object = create_object(payload, headers=headers)
+        logger.debug("Response: %s", Payload(new_object))
         return new_object
     except requests.exceptions.RequestException as e:
-        print(f"Error adding object: {e}")
+        logger.error("Error adding object: %s", e)
         return None
 
 def update_object(object_id: str, name: str, data_payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -102,21 +135,18 @@ def update_object(object_id: str, name: str, data_payload: Dict[str, Any]) -> Op
         name (str): The new name for the object.
         data_payload (dict): The new 'data' field for the object.
     """
-    print(f"\n--- PUT Update Object: {object_id} ---")
-    url = f"{BASE_URL}/{object_id}"
+    logger.info("PUT Update Object: %s", object_id)
     payload = {
         "name": name,
         "data": data_payload
     }
     headers = {"Content-Type": "application/json"}
     try:
-        response = requests.put(url, json=payload, headers=headers)
-        response.raise_for_status()
-        updated_object = response.json()
-        print(json.dumps(updated_object, indent=2))
+        updated_object = replace_object(object_id, payload, headers=headers)
+        logger.debug("Response: %s", Payload(updated_object))
         return updated_object
     except requests.exceptions.RequestException as e:
-        print(f"Error updating object {object_id}: {e}")
+        logger.error("Error updating object %s: %s", object_id, e)
         return None
 
 def partially_update_object(object_id: str, data_to_update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -126,17 +156,14 @@ def partially_update_object(object_id: str, data_to_update: Dict[str, Any]) -> O
         object_id (str): The ID of the object to partially update.
         data_to_update (dict): A dictionary containing the fields to update (e.g., {"name": "New Name"}).
     """
-    print(f"\n--- PATCH Partially Update Object: {object_id} ---")
-    url = f"{BASE_URL}/{object_id}"
+    logger.info("PATCH Partially Update Object: %s", object_id)
     headers = {"Content-Type": "application/json"}
     try:
-        response = requests.patch(url, json=data_to_update, headers=headers)
-        response.raise_for_status()
-        patched_object = response.json()
-        print(json.dumps(patched_object, indent=2))
+        patched_object = patch_object(object_id, data_to_update, headers=headers)
+        logger.debug("Response: %s", Payload(patched_object))
         return patched_object
     except requests.exceptions.RequestException as e:
-        print(f"Error partially updating object {object_id}: {e}")
+        logger.error("Error partially updating object %s: %s", object_id, e)
         return None
 
 def delete_object(object_id: str) -> Optional[Dict[str, Any]]:
@@ -145,20 +172,163 @@ def delete_object(object_id: str) -> Optional[Dict[str, Any]]:
     Args:
         object_id (str): The ID of the object to delete.
     """
-    print(f"\n--- DELETE Object: {object_id} ---")
-    url = f"{BASE_URL}/{object_id}"
+    logger.info("DELETE Object: %s", object_id)
     try:
-        response = requests.delete(url)
-        response.raise_for_status()
         # A successful DELETE often returns 200 OK with a message, or 204 No Content
         # The restful-api.dev returns 200 OK with a success message for DELETE
-        data = response.json()
-        print(json.dumps(data, indent=2))
+        data = remove_object(object_id)
+        logger.debug("Response: %s", Payload(data))
         return data
     except requests.exceptions.RequestException as e:
-        print(f"Error deleting object {object_id}: {e}")
+        logger.error("Error deleting object %s: %s", object_id, e)
+        return None
+
+# Async variants of the object tools. They await the shared httpx pool instead of
+# blocking the Runner event loop, so concurrent sessions are not serialized.
+
+async def get_all_objects_async() -> Optional[List[Dict[str, Any]]]:
+    """
+    Consumes GET List of all objects: https://api.restful-api.dev/objects
+    """
+    logger.info("GET All Objects")
+    try:
+        data = await afetch_all_objects()
+        logger.debug("Response: %s", Payload(data))
+        return data
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("Error fetching all objects: %s", e)
+        return None
+
+async def get_objects_page_async(limit: int = 50, offset: int = 0, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Consumes GET List of all objects page by page: https://api.restful-api.dev/objects
+    The list is parsed as it streams in and only the requested slice is returned.
+    Args:
+        limit (int): Maximum number of objects to return.
+        offset (int): Number of objects to skip from the start of the list.
+        fields (list): Optional fields to keep for each object, e.g. ["id", "name"] or ["data.color"].
+    """
+    logger.info("GET Objects Page: offset=%s limit=%s fields=%s", offset, limit, fields)
+    try:
+        page = await afetch_objects_page(offset=offset, limit=limit, fields=fields)
+        logger.debug("Response: %s", Payload(page))
+        return page
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("Error fetching objects page: %s", e)
+        return None
+
+async def get_objects_by_ids_async(ids: List[int]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Consumes GET List of objects by ids: https://api.restful-api.dev/objects?id=3&id=5&id=10
+    Args:
+        ids (list): A list of integer IDs.
+    """
+    logger.info("GET Objects by IDs: %s", ids)
+    try:
+        data = await afetch_objects_by_ids(ids)
+        logger.debug("Response: %s", Payload(data))
+        return data
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("Error fetching objects by IDs: %s", e)
+        return None
+
+async def get_single_object_async(object_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Consumes GET Single object: https://api.restful-api.dev/objects/7
+    Args:
+        object_id (str): The ID of the object to retrieve.
+    """
+    logger.info("GET Single Object: %s", object_id)
+    try:
+        data = await afetch_object(object_id)
+        logger.debug("Response: %s", Payload(data))
+        return data
+    except (httpx.HTTPError, ObjectNotFoundError, ValueError) as e:
+        logger.error("Error fetching single object %s: %s", object_id, e)
+        return None
+
+async def add_object_async(name: str, data_payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Consumes POST Add object: https://api.restful-api.dev/objects
+    Args:
+        name (str): The name of the new object.
+        data_payload (dict): A dictionary representing the 'data' field of the object.
+    """
+    logger.info("POST Add Object: %s", name)
+    payload = {
+        "name": name,
+        "data": data_payload
+    }
+    try:
+        new_object = await acreate_object(payload)
+        logger.debug("Response: %s", Payload(new_object))
+        return new_object
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("Error adding object: %s", e)
+        return None
+
+async def update_object_async(object_id: str, name: str, data_payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Consumes PUT Update object: https://api.restful-api.dev/objects/7
+    Args:
+        object_id (str): The ID of the object to update.
+        name (str): The new name for the object.
+        data_payload (dict): The new 'data' field for the object.
+    """
+    logger.info("PUT Update Object: %s", object_id)
+    payload = {
+        "name": name,
+        "data": data_payload
+    }
+    try:
+        updated_object = await areplace_object(object_id, payload)
+        logger.debug("Response: %s", Payload(updated_object))
+        return updated_object
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("Error updating object %s: %s", object_id, e)
+        return None
+
+async def partially_update_object_async(object_id: str, data_to_update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Consumes PATCH Partially update object: https://api.restful-api.dev/objects/7
+    Args:
+        object_id (str): The ID of the object to partially update.
+        data_to_update (dict): A dictionary containing the fields to update (e.g., {"name": "New Name"}).
+    """
+    logger.info("PATCH Partially Update Object: %s", object_id)
+    try:
+        patched_object = await apatch_object(object_id, data_to_update)
+        logger.debug("Response: %s", Payload(patched_object))
+        return patched_object
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("Error partially updating object %s: %s", object_id, e)
         return None
 
+async def delete_object_async(object_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Consumes DELETE object: https://api.restful-api.dev/objects/6
+    Args:
+        object_id (str): The ID of the object to delete.
+    """
+    logger.info("DELETE Object: %s", object_id)
+    try:
+        data = await aremove_object(object_id)
+        logger.debug("Response: %s", Payload(data))
+        return data
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("Error deleting object %s: %s", object_id, e)
+        return None
+
+
+# Trims tool results before they reach the model: list tools keep only the
+# fields the model needs to pick an object, and repeats within a session are
+# replaced by a short reference.
+result_compactor = ToolResultCompactor(
+    field_allowlists={
+        "get_all_objects": ["id", "name"],
+        "get_all_objects_async": ["id", "name"],
+    },
+)
 
 tool_agent = Agent(
     name="tool_agent",
@@ -168,14 +338,16 @@ tool_agent = Agent(
     You are a RestAPI service caller assistant. Call the given tools as per the instruction given by the uses and print the data in json format.
     """,
     tools=[
-        get_all_objects,
-        get_objects_by_ids,
-        get_single_object,
-        add_object,
-        update_object,
-        partially_update_object,
-        delete_object,
+        get_all_objects_async,
+        get_objects_page_async,
+        get_objects_by_ids_async,
+        get_single_object_async,
+        add_object_async,
+        update_object_async,
+        partially_update_object_async,
+        delete_object_async,
     ],
+    after_tool_callback=result_compactor.after_tool_callback,
 )
 
 #root_agent=tool_agent    
@@ -194,13 +366,10 @@ def get_single_object(object_id: str , tool_context: ToolContext) -> Optional[Di
     Args:
         object_id (str): The ID of the object to retrieve.
     """
-    print(f"\n--- GET Single Object: {object_id} ---")
-    url = f"{BASE_URL}/{object_id}"
+    logger.info("GET Single Object: %s", object_id)
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        print(json.dumps(data, indent=2))
+        data = fetch_object(object_id)
+        logger.debug("Response: %s", Payload(data))
         # Initialize recent_searches if it doesn't exist
         if "recent_searches" not in tool_context.state:
             tool_context.state["recent_searches"] = []
@@ -210,11 +379,36 @@ def get_single_object(object_id: str , tool_context: ToolContext) -> Optional[Di
             recent_searches.append(object_id)
             tool_context.state["recent_searches"] = recent_searches   
             #print  tool_context.state["recent_searches"]
-            print('tool_context.state["recent_searches"] ------------------------->',tool_context.state["recent_searches"]) 
+            logger.info("recent_searches: %s", tool_context.state["recent_searches"]) 
             
         return data
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching single object {object_id}: {e}")
+        logger.error("Error fetching single object %s: %s", object_id, e)
+        return None
+
+async def get_single_object_async(object_id: str , tool_context: ToolContext) -> Optional[Dict[str, Any]]:
+    """
+    Consumes GET Single object: https://api.restful-api.dev/objects/7
+    Args:
+        object_id (str): The ID of the object to retrieve.
+    """
+    logger.info("GET Single Object: %s", object_id)
+    try:
+        data = await afetch_object(object_id)
+        logger.debug("Response: %s", Payload(data))
+        # Initialize recent_searches if it doesn't exist
+        if "recent_searches" not in tool_context.state:
+            tool_context.state["recent_searches"] = []
+
+        recent_searches = tool_context.state["recent_searches"]
+        if object_id not in recent_searches:
+            recent_searches.append(object_id)
+            tool_context.state["recent_searches"] = recent_searches
+            logger.info("recent_searches: %s", tool_context.state["recent_searches"])
+
+        return data
+    except (httpx.HTTPError, ObjectNotFoundError, ValueError) as e:
+        logger.error("Error fetching single object %s: %s", object_id, e)
         return None
     
 stateful_agent = Agent(
@@ -225,7 +419,7 @@ stateful_agent = Agent(
     You are a RestAPI service caller assistant. Call the given tools as per the instruction given by the uses and print the data in json format.
     """,
     tools=[
-        get_single_object,        
+        get_single_object_async,
     ],
 )
 
@@ -247,16 +441,13 @@ def get_single_object(object_id: str , tool_context: ToolContext) -> Optional[Di
     Args:
         object_id (str): The ID of the object to retrieve.
     """
-    print(f"\n--- GET Single Object: {object_id} ---")
-    url = f"{BASE_URL}/{object_id}"
+    logger.info("GET Single Object: %s", object_id)
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        print(json.dumps(data, indent=2))        
+        data = fetch_object(object_id)
+        logger.debug("Response: %s", Payload(data))
         return data
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching single object {object_id}: {e}")
+        logger.error("Error fetching single object %s: %s", object_id, e)
         return None
 
 structured_agent = LlmAgent(
@@ -289,16 +480,28 @@ def get_single_object(object_id: str , tool_context: ToolContext) -> Optional[Di
     Args:
         object_id (str): The ID of the object to retrieve.
     """
-    print(f"\n--- GET Single Object: {object_id} ---")
-    url = f"{BASE_URL}/{object_id}"
+    logger.info("GET Single Object: %s", object_id)
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        print(json.dumps(data, indent=2))        
+        data = fetch_object(object_id)
+        logger.debug("Response: %s", Payload(data))
         return data
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching single object {object_id}: {e}")
+        logger.error("Error fetching single object %s: %s", object_id, e)
+        return None
+
+async def get_single_object_async(object_id: str , tool_context: ToolContext) -> Optional[Dict[str, Any]]:
+    """
+    Consumes GET Single object: https://api.restful-api.dev/objects/{object_id}
+    Args:
+        object_id (str): The ID of the object to retrieve.
+    """
+    logger.info("GET Single Object: %s", object_id)
+    try:
+        data = await afetch_object(object_id)
+        logger.debug("Response: %s", Payload(data))
+        return data
+    except (httpx.HTTPError, ObjectNotFoundError, ValueError) as e:
+        logger.error("Error fetching single object %s: %s", object_id, e)
         return None
 
 def before_tool_callback(tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext) -> Optional[Dict]:
@@ -312,12 +515,14 @@ def before_tool_callback(tool: BaseTool, args: Dict[str, Any], tool_context: Too
     tool_usage[tool_name] = tool_usage.get(tool_name, 0) + 1
     tool_context.state["tool_usage"] = tool_usage
     
-    print(f"[LOG] Running tool: {tool_name}")
+    logger.info("Running tool: %s", tool_name)
     return None
 
 def after_tool_callback(tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Dict) -> Optional[Dict]:
-    print(f"[LOG] Tool {tool.name} completed")
-    return None
+    # read_path_stats() gathers every cache and single-flight counter, so only build it when the record is emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Tool %s completed, read path: %s", tool.name, Payload(read_path_stats()))
+    return result_compactor.after_tool_callback(tool, args, tool_context, tool_response)
 
 # Initialize state before creating the agent
 initial_state = {"tool_usage": {}}
@@ -329,7 +534,7 @@ callback_agent = Agent(
     instruction="""
     You are a RestAPI service caller assistant. Call the given tools as per the instruction given by the uses and print the data in json format.
     """,
-    tools=[get_single_object],
+    tools=[get_single_object_async],
     before_tool_callback=before_tool_callback,
     after_tool_callback=after_tool_callback,
 )
@@ -462,7 +667,7 @@ COMPLETION_PHRASE = "No major issues found."
 # --- Tool Definition ---
 def exit_loop(tool_context: ToolContext):
   """Call this function ONLY when the critique indicates no further changes are needed, signaling the iterative process should end."""
-  print(f"  [Tool Call] exit_loop triggered by {tool_context.agent_name}")
+  logger.info("[Tool Call] exit_loop triggered by %s", tool_context.agent_name)
   tool_context.actions.escalate = True
   # Return empty dict as tools should typically return JSON-serializable output
   return {}
@@ -554,12 +759,12 @@ def add(object_id1: str,object_id2: str):
         object_id2 (str): Second number
 		
     """
-    print(f"\n--- {object_id1} --- {object_id2}")
+    logger.info("%s --- %s", object_id1, object_id2)
    
     try:
         return int(object_id1) + int(object_id2)
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching single object {object_id1} and {object_id2}: {e}")
+        logger.error("Error fetching single object %s and %s: %s", object_id1, object_id2, e)
         return None
     
 def Subtract(object_id1: str,object_id2: str):
@@ -569,12 +774,12 @@ def Subtract(object_id1: str,object_id2: str):
         object_id2 (str): Second number
 		
     """
-    print(f"\n--- {object_id1} --- {object_id2}")
+    logger.info("%s --- %s", object_id1, object_id2)
    
     try:
         return int(object_id1) - int(object_id2)
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching single object {object_id1} and {object_id2}: {e}")
+        logger.error("Error fetching single object %s and %s: %s", object_id1, object_id2, e)
         return None
     
 def Multiply(object_id1: str,object_id2: str):
@@ -585,12 +790,12 @@ def Multiply(object_id1: str,object_id2: str):
         object_id2 (str): Second number
 		
     """
-    print(f"\n--- {object_id1} --- {object_id2}")
+    logger.info("%s --- %s", object_id1, object_id2)
    
     try:
         return int(object_id1) * int(object_id2)
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching single object {object_id1} and {object_id2}: {e}")
+        logger.error("Error fetching single object %s and %s: %s", object_id1, object_id2, e)
         return None
             
 # Researcher 1: Addition Of two values
@@ -718,7 +923,7 @@ class ImageGeneratorAgent(BaseAgent): # Example custom agent
     # ... internal logic ...
     async def _run_async_impl(self, ctx): # Simplified run logic
         prompt = ctx.session.state.get("image_prompt", "default prompt")
-        print("Generating prompt ...",prompt)
+        logger.info("Generating prompt ... %s", prompt)
         # ... generate image bytes ...
         image_bytes = b"..."
         yield Event(author=self.name, content=types.Content(parts=[types.Part.from_bytes(image_bytes, "image/png")]))
@@ -810,7 +1015,7 @@ warnings.filterwarnings(
     module="pydantic._internal._fields"
 )
 import asyncio
-from fastmcp import Client
+from mcp_client_pool import call_mcp_tool, call_mcp_tool_batch
 from typing import Any
 from google.genai import types
 from dotenv import load_dotenv
@@ -825,11 +1030,19 @@ from google.adk.sessions import InMemorySessionService
 
 async def get_mcp_data(object_id: str) -> dict:
     """Fetches an object by its ID from the MCP server."""
-    print(f"Tool 'get_mcp_data' called with object_id: {object_id}")
-    async with Client("http://127.0.0.1:8001/mcp") as client:
-        single = await client.call_tool("get_object_by_id", {"object_id": object_id})
-        print("Fetched single:", single)
-        return single
+    logger.info("Tool 'get_mcp_data' called with object_id: %s", object_id)
+    # One MCP session, multiplexed over keep-alive connections, serves every call
+    single = await call_mcp_tool("http://127.0.0.1:8001/mcp", "get_object_by_id", {"object_id": object_id})
+    logger.debug("Fetched single: %s", Payload(single))
+    return single
+
+async def get_mcp_data_batch(object_ids: list[str]) -> dict:
+    """Fetches many objects by their IDs from the MCP server in one tool call, keeping the order of object_ids."""
+    logger.info("Tool 'get_mcp_data_batch' called with %d object_ids", len(object_ids))
+    # Concurrent calls over the pooled session; an ID that fails gets an error entry instead of failing the batch
+    batch = await call_mcp_tool_batch("http://127.0.0.1:8001/mcp", "get_object_by_id", [{"object_id": object_id} for object_id in object_ids], key="object_id")
+    logger.debug("Fetched batch: %s", Payload(batch))
+    return batch
         
 call_mcp_server_agent = LlmAgent(
     model="gemini-2.0-flash",
@@ -837,8 +1050,9 @@ call_mcp_server_agent = LlmAgent(
     description="This agent is used to get data using FASTMCP client by calling the FASTMCP server ",
     instruction="""Help user to fetch the data from the FASTMCP Server using FASTMCP Client.
     When the user asks to fetch data for a specific object ID, use the `get_mcp_data` tool and pass the ID to it.
+    When the user asks for several object IDs, use the `get_mcp_data_batch` tool once with all of the IDs instead of calling `get_mcp_data` for each.
     """,
-    tools=[get_mcp_data],
+    tools=[get_mcp_data, get_mcp_data_batch],
 )
     
  
@@ -848,7 +1062,8 @@ call_mcp_server_agent = LlmAgent(
 
 import os
 from google.adk.agents import LlmAgent
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
+from google.adk.tools.mcp_tool.mcp_toolset import StdioServerParameters
+from pooled_mcp_toolset import PooledMCPToolset
 
 # Example: Define a command to run a local MCP server.
 # In this case, we're assuming there's a script 'mcp_server.py'
@@ -863,8 +1078,9 @@ stdio_connection_params = StdioServerParameters(
 )
 
 # Create an MCPToolset instance with the stdio connection parameters.
-# The toolset will handle the connection and tool discovery.
-mcp_toolset = MCPToolset(
+# The toolset will handle the connection and tool discovery. Calls are spread
+# over MCP_STDIO_WORKERS pre-started server processes instead of one pipe.
+mcp_toolset = PooledMCPToolset(
     connection_params=stdio_connection_params
 )
 
@@ -889,7 +1105,7 @@ warnings.filterwarnings(
     module="pydantic._internal._fields"
 )
 import asyncio
-from fastmcp import Client
+from mcp_client_pool import call_mcp_tool, call_mcp_tool_batch
 from typing import Any
 from google.genai import types
 from dotenv import load_dotenv
@@ -904,11 +1120,19 @@ from google.adk.sessions import InMemorySessionService
 
 async def get_mcp_data(object_id: str) -> dict:
     """Fetches an object by its ID from the MCP server."""
-    print(f"Tool 'get_mcp_data' called with object_id: {object_id}")
-    async with Client("restapi-mcp-server.py") as client:
-        single = await client.call_tool("get_object_by_id", {"object_id": object_id})
-        print("Fetched single:", single)
-        return single
+    logger.info("Tool 'get_mcp_data' called with object_id: %s", object_id)
+    # Reuses one MCP session across calls instead of starting a server per call (in process by default, see MCP_CLIENT_TRANSPORT)
+    single = await call_mcp_tool("restapi-mcp-server.py", "get_object_by_id", {"object_id": object_id})
+    logger.debug("Fetched single: %s", Payload(single))
+    return single
+
+async def get_mcp_data_batch(object_ids: list[str]) -> dict:
+    """Fetches many objects by their IDs from the MCP server in one tool call, keeping the order of object_ids."""
+    logger.info("Tool 'get_mcp_data_batch' called with %d object_ids", len(object_ids))
+    # Concurrent calls over the pooled session; an ID that fails gets an error entry instead of failing the batch
+    batch = await call_mcp_tool_batch("restapi-mcp-server.py", "get_object_by_id", [{"object_id": object_id} for object_id in object_ids], key="object_id")
+    logger.debug("Fetched batch: %s", Payload(batch))
+    return batch
         
 call_local_mcp_server_agent = LlmAgent(
     model="gemini-2.0-flash",
@@ -916,8 +1140,9 @@ call_local_mcp_server_agent = LlmAgent(
     description="This agent is used to get data using FASTMCP client by calling the FASTMCP server ",
     instruction="""Help user to fetch the data from the FASTMCP Server using FASTMCP Client.
     When the user asks to fetch data for a specific object ID, use the `get_mcp_data` tool and pass the ID to it.
+    When the user asks for several object IDs, use the `get_mcp_data_batch` tool once with all of the IDs instead of calling `get_mcp_data` for each.
     """,
-    tools=[get_mcp_data],
+    tools=[get_mcp_data, get_mcp_data_batch],
 )
 
 #root_agent=call_local_mcp_server_agent
@@ -926,7 +1151,7 @@ call_local_mcp_server_agent = LlmAgent(
 #calling MCPServer having integrated ADK agent
 
 import asyncio
-from fastmcp import Client
+from mcp_client_pool import call_mcp_tool
 from typing import Any
 from google.genai import types
 from dotenv import load_dotenv
@@ -941,15 +1166,14 @@ from google.adk.sessions import InMemorySessionService
 
 async def get_mcp_data(object_id: str) -> dict:
     """Fetches an object by its ID from the MCP server."""
-    print(f"Tool 'get_mcp_data' called with object_id: {object_id}")
+    logger.info("Tool 'get_mcp_data' called with object_id: %s", object_id)
     # async with Client("restapi-mcp-server.py") as client:
     #     single = await client.call_tool("get_object_by_id", {"object_id": object_id})
     #     print("Fetched single:", single)
     #     return single
-    async with Client("http://127.0.0.1:8001/mcp") as client:
-        single = await client.call_tool("get_objects_by_ids_using_adk_agent")
-        print("Fetched single:", single)
-        return single
+    single = await call_mcp_tool("http://127.0.0.1:8001/mcp", "get_objects_by_ids_using_adk_agent")
+    logger.debug("Fetched single: %s", Payload(single))
+    return single
         
 call_local_mcp_adk_remote_server_agent = LlmAgent(
     model="gemini-2.0-flash",
@@ -967,7 +1191,7 @@ call_local_mcp_adk_remote_server_agent = LlmAgent(
 #calling restapi-mcp-adk-server having integrated ADK agent
 
 import asyncio
-from fastmcp import Client
+from mcp_client_pool import call_mcp_tool, call_mcp_tool_batch
 from typing import Any
 from google.genai import types
 from dotenv import load_dotenv
@@ -982,15 +1206,22 @@ from google.adk.sessions import InMemorySessionService
 
 async def get_mcp_adk_data(object_id: str) -> dict:
     """Fetches an object by its ID from the MCP server."""
-    print(f"Tool 'get_mcp_data' called with object_id: {object_id}")
+    logger.info("Tool 'get_mcp_data' called with object_id: %s", object_id)
     # async with Client("restapi-mcp-server.py") as client:
     #     single = await client.call_tool("get_object_by_id", {"object_id": object_id})
     #     print("Fetched single:", single)
     #     return single
-    async with Client("restapi-mcp-adk-server.py") as client:
-        single = await client.call_tool("get_objects_by_id_using_adk_agent", {"object_id": object_id})
-        print("Fetched single:", single)
-        return single
+    single = await call_mcp_tool("restapi-mcp-adk-server.py", "get_objects_by_id_using_adk_agent", {"object_id": object_id})
+    logger.debug("Fetched single: %s", Payload(single))
+    return single
+
+async def get_mcp_adk_data_batch(object_ids: list[str]) -> dict:
+    """Fetches many objects by their IDs from the MCP server in one tool call, keeping the order of object_ids."""
+    logger.info("Tool 'get_mcp_adk_data_batch' called with %d object_ids", len(object_ids))
+    # Concurrent calls over the pooled session; an ID that fails gets an error entry instead of failing the batch
+    batch = await call_mcp_tool_batch("restapi-mcp-adk-server.py", "get_objects_by_id_using_adk_agent", [{"object_id": object_id} for object_id in object_ids], key="object_id")
+    logger.debug("Fetched batch: %s", Payload(batch))
+    return batch
         
 call_local_mcp_adk_server_agent = LlmAgent(
     model="gemini-2.0-flash",
@@ -998,8 +1229,9 @@ call_local_mcp_adk_server_agent = LlmAgent(
     description="This agent is used to get data using FASTMCP client by calling the FASTMCP server ",
     instruction="""Help user to fetch the data from the FASTMCP Server using FASTMCP Client.
     When the user asks to fetch data for a specific object ID, use the `get_mcp_adk_data` tool and pass the ID to it.
+    When the user asks for several object IDs, use the `get_mcp_adk_data_batch` tool once with all of the IDs instead of calling `get_mcp_adk_data` for each.
     """,
-    tools=[get_mcp_adk_data],
+    tools=[get_mcp_adk_data, get_mcp_adk_data_batch],
 )
 
 root_agent=call_local_mcp_adk_server_agent
\ No newline at end of file
@@ -0,0 +1,139 @@
+# app_logging.py
+# Logging setup shared by the agents, MCP servers and MCP clients.
+#
+# Entry points (a script's __main__ block, mcp_serving.serve) call
+# setup_logging(); modules only call get_logger(), so importing them leaves the
+# logging of an embedding program alone. Once set up, records are handed to a
+# queue on the calling thread and formatted/written by a background listener
+# thread, so the event loop never blocks on stderr. Output goes to stderr,
+# which keeps stdio MCP transports clean.
+#
+# Environment:
+#   LOG_LEVEL              root level, default INFO
+#   LOG_PAYLOAD_MAX_CHARS  characters kept when logging a Payload, default 1000
+#   LOG_SAMPLING           per-logger sample rates for records below WARNING,
+#                          e.g. "app.agent=0.1,restapi-mcp-server=0.5"
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "1000"))
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class Payload:
+    """
+    Lazily serialized log argument. The JSON dump and truncation only happen if
+    the record is actually emitted, e.g. logger.debug("response %s", Payload(data)).
+    The wrapped value must not be mutated after logging, since it is formatted
+    later on the listener thread.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = PAYLOAD_MAX_CHARS if limit is None else limit
+
+    def __str__(self) -> str:
+        value = self.value
+        if hasattr(value, "model_dump"):  # pydantic models such as ADK events
+            value = value.model_dump(mode="json", exclude_none=True)
+        try:
+            text = json.dumps(value, separators=(",", ":"), default=str)
+        except (TypeError, ValueError):
+            text = repr(value)
+        if self.limit and len(text) > self.limit:
+            return f"{text[:self.limit]}... [{len(text) - self.limit} chars truncated]"
+        return text
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random fraction of records below WARNING; warnings and errors always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # The stock QueueHandler formats the message on the caller's thread; keep the
+    # record as-is so formatting (and Payload serialization) runs on the listener.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _parse_sampling(spec: str) -> Dict[str, float]:
+    rates = {}
+    for part in spec.split(","):
+        if "=" in part:
+            name, rate = part.split("=", 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+_sample_rates: Dict[str, float] = _parse_sampling(os.getenv("LOG_SAMPLING", ""))
+
+
+def setup_logging(level: Optional[str] = None) -> None:
+    """
+    Installs the queue handler on the root logger, replacing its handlers, and
+    routes FastMCP's logger through it. For entry points only; safe to call
+    more than once.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(logging.Formatter(LOG_FORMAT))
+        _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_DeferredQueueHandler(log_queue))
+        root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+        _adopt("FastMCP")
+
+
+def _adopt(name: str) -> None:
+    # Libraries such as fastmcp install their own synchronous (rich) handler and
+    # stop propagation; send their records through the queue like ours instead,
+    # so rendering e.g. a tool error traceback does not stall the event loop
+    library_logger = logging.getLogger(name)
+    if library_logger.handlers or not library_logger.propagate:
+        for handler in list(library_logger.handlers):
+            library_logger.removeHandler(handler)
+        library_logger.propagate = True
+
+
+def get_logger(name: str, sample_rate: Optional[float] = None) -> logging.Logger:
+    """
+    Returns logging.getLogger(name) with its sampling filter attached; handlers
+    are left to setup_logging().
+    Args:
+        name (str): Logger name, usually the module name.
+        sample_rate (float): Fraction of records below WARNING to keep; the
+            LOG_SAMPLING environment variable takes precedence.
+    """
+    logger = logging.getLogger(name)
+    rate = _sample_rates.get(name, sample_rate)
+    if rate is not None and rate < 1 and not any(isinstance(f, SamplingFilter) for f in logger.filters):
+        logger.addFilter(SamplingFilter(rate))
+    return logger
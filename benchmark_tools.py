@@ -0,0 +1,199 @@
+# benchmark_tools.py
+# Throughput and latency benchmark for the object tools against the local stand-in.
+#
+#   python benchmark_tools.py --calls 1000 --concurrency 32 --latency-ms 5
+#   python benchmark_tools.py --suite mcp --no-cache --error-rate 0.01
+#
+# Starts objects_stub_server.py in-process, points OBJECTS_API_BASE_URL at it and
+# reports calls/s and p50/p99 latency for each tool. Requires the same packages
+# as app/agent.py and restapi-mcp-server.py.
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from objects_stub_server import start_stub_server
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class _StubToolContext(SimpleNamespace):
+    # Enough of ToolContext for the tools that record state
+    def __init__(self):
+        super().__init__(state={})
+
+
+def _load_script(filename: str):
+    # The MCP servers are scripts with dashes in their names, so load them by path
+    path = os.path.join(ROOT, filename)
+    spec = importlib.util.spec_from_file_location(filename[:-3].replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _unwrap(tool: Any) -> Callable:
+    # fastmcp's @mcp.tool() returns a tool object that keeps the function in .fn
+    return getattr(tool, "fn", tool)
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _summary(name: str, latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    return {
+        "tool": name,
+        "calls": len(latencies),
+        "errors": errors,
+        "calls_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+def run_sync(name: str, fn: Callable[[int], Any], calls: int, concurrency: int) -> Dict[str, Any]:
+    def one(i: int) -> Tuple[float, bool]:
+        start = time.perf_counter()
+        try:
+            ok = fn(i) is not None
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(calls)))
+    elapsed = time.perf_counter() - started
+    return _summary(name, [r[0] for r in results], sum(1 for r in results if not r[1]), elapsed)
+
+
+async def run_async(name: str, fn: Callable[[int], Awaitable[Any]], calls: int, concurrency: int) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> Tuple[float, bool]:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                ok = (await fn(i)) is not None
+            except Exception:
+                ok = False
+            return time.perf_counter() - start, ok
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+    return _summary(name, [r[0] for r in results], sum(1 for r in results if not r[1]), elapsed)
+
+
+def agent_scenarios(object_count: int):
+    """Returns (sync, async) scenario lists for the app/agent.py tools."""
+    agent = importlib.import_module("app.agent")
+    async_tools = {tool.__name__: tool for tool in agent.tool_agent.tools if callable(tool)}
+    object_id = lambda i: str(i % object_count + 1)
+    sync = [
+        ("agent.get_all_objects", lambda i: agent.get_all_objects()),
+        ("agent.get_objects_page", lambda i: agent.get_objects_page(limit=10, offset=i % object_count, fields=["id", "name"])),
+        ("agent.get_objects_by_ids", lambda i: agent.get_objects_by_ids([object_id(i), object_id(i + 1)])),
+        ("agent.get_single_object", lambda i: agent.get_single_object(object_id(i), _StubToolContext())),
+        ("agent.add_object", lambda i: agent.add_object(f"bench {i}", {"i": i})),
+    ]
+    asynchronous = [
+        ("agent.get_all_objects_async", lambda i: async_tools["get_all_objects_async"]()),
+        ("agent.get_objects_page_async", lambda i: async_tools["get_objects_page_async"](limit=10, offset=i % object_count, fields=["id", "name"])),
+        ("agent.get_objects_by_ids_async", lambda i: async_tools["get_objects_by_ids_async"]([object_id(i), object_id(i + 1)])),
+        ("agent.get_single_object_async", lambda i: async_tools["get_single_object_async"](object_id(i))),
+        ("agent.add_object_async", lambda i: async_tools["add_object_async"](f"bench {i}", {"i": i})),
+    ]
+    return sync, asynchronous
+
+
+def mcp_scenarios(object_count: int):
+    """Returns async scenarios for the restapi-mcp-server.py tools, called directly."""
+    server = _load_script("restapi-mcp-server.py")
+    object_id = lambda i: str(i % object_count + 1)
+    get_all_objects = _unwrap(server.get_all_objects)
+    get_objects_by_ids = _unwrap(server.get_objects_by_ids)
+    get_object_by_id = _unwrap(server.get_object_by_id)
+    add_object = _unwrap(server.add_object)
+    return [
+        ("mcp.get_all_objects", lambda i: get_all_objects(ctx=None)),
+        ("mcp.get_objects_by_ids", lambda i: get_objects_by_ids([object_id(i), object_id(i + 1)], ctx=None)),
+        ("mcp.get_object_by_id", lambda i: get_object_by_id(object_id(i), ctx=None)),
+        ("mcp.add_object", lambda i: add_object({"name": f"bench {i}", "data": {"i": i}}, ctx=None)),
+    ]
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    header = f"{'tool':34} {'calls':>6} {'errors':>6} {'calls/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['tool']:34} {r['calls']:>6} {r['errors']:>6} {r['calls_per_s']:>9.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['mean_ms']:>8.2f}")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the object tools against the local objects stand-in")
+    parser.add_argument("--suite", choices=["agent", "mcp", "all"], default="all")
+    parser.add_argument("--calls", type=int, default=500, help="calls per tool")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--objects", type=int, default=1000, help="objects seeded in the stand-in")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-cache", action="store_true", help="disable the object read caches")
+    parser.add_argument("--upstream-rate", type=float, default=0.0, help="MCP server upstream requests/s, 0 for unlimited")
+    args = parser.parse_args(argv)
+
+    server = start_stub_server(
+        seed_objects=args.objects,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+    )
+    # Must be set before the tool modules are imported, they read it at import time
+    os.environ["OBJECTS_API_BASE_URL"] = server.base_url
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ["MCP_UPSTREAM_RATE"] = str(args.upstream_rate)
+    if args.no_cache:
+        os.environ["OBJECTS_CACHE_TTL"] = "0"
+        os.environ["OBJECTS_CACHE_LIST_TTL"] = "0"
+        for name in ("MCP_CACHE_TTL_ALL", "MCP_CACHE_TTL_IDS", "MCP_CACHE_TTL_ID"):
+            os.environ[name] = "0"
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from app_logging import setup_logging
+
+    setup_logging()
+
+    results: List[Dict[str, Any]] = []
+
+    async def run_async_suite(scenarios) -> None:
+        for name, fn in scenarios:
+            results.append(await run_async(name, fn, args.calls, args.concurrency))
+
+    try:
+        if args.suite in ("agent", "all"):
+            sync, asynchronous = agent_scenarios(args.objects)
+            for name, fn in sync:
+                results.append(run_sync(name, fn, args.calls, args.concurrency))
+            asyncio.run(run_async_suite(asynchronous))
+        if args.suite in ("mcp", "all"):
+            asyncio.run(run_async_suite(mcp_scenarios(args.objects)))
+    finally:
+        server.shutdown()
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
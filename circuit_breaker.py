@@ -0,0 +1,95 @@
+# circuit_breaker.py
+# Consecutive-failure circuit breaker, one per MCP target.
+import os
+import time
+from typing import Any, Callable, Dict
+
+# Consecutive failures that open the circuit, and seconds it stays open before a trial call
+BREAKER_FAILURES = int(os.getenv("MCP_BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.getenv("MCP_BREAKER_RESET", "30"))
+# Trial calls let through at once while half-open
+BREAKER_HALF_OPEN_CALLS = int(os.getenv("MCP_BREAKER_HALF_OPEN_CALLS", "1"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a target whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed: calls go through; `failures` failures in a row open the circuit.
+    Open: calls fail at once with CircuitOpenError for `reset` seconds.
+    Half-open: up to `half_open_calls` trial calls go through; a success closes
+    the circuit, a failure opens it again for another `reset` seconds.
+    Callers report each call's outcome with record_success()/record_failure(),
+    or abandon() when it has none.
+    Meant for use from one event loop.
+    Args:
+        name (str): Target name, for error messages.
+        failures (int): Consecutive failures that open the circuit.
+        reset (float): Seconds the circuit stays open.
+        half_open_calls (int): Trial calls allowed at once while half-open.
+        clock (callable): Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failures: int = BREAKER_FAILURES,
+        reset: float = BREAKER_RESET,
+        half_open_calls: int = BREAKER_HALF_OPEN_CALLS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failures = max(1, failures)
+        self.reset = reset
+        self.half_open_calls = max(1, half_open_calls)
+        self._clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self.opened = 0
+        self.rejected = 0
+
+    def before_call(self) -> None:
+        """Admits a call, or raises CircuitOpenError."""
+        if self.state == OPEN:
+            remaining = self._opened_at + self.reset - self._clock()
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(f"circuit for {self.name} is open, next trial in {remaining:.1f} s")
+            self.state = HALF_OPEN
+            self._trials = 0
+        if self.state == HALF_OPEN:
+            if self._trials >= self.half_open_calls:
+                self.rejected += 1
+                raise CircuitOpenError(f"circuit for {self.name} is half-open and its trial call is still running")
+            self._trials += 1
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.state = CLOSED
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failures:
+            if self.state != OPEN:
+                self.opened += 1
+            self.state = OPEN
+            self._opened_at = self._clock()
+
+    def abandon(self) -> None:
+        """An admitted call ended without an outcome (e.g. it was cancelled); frees its half-open trial slot."""
+        if self.state == HALF_OPEN and self._trials > 0:
+            self._trials -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened_total": self.opened,
+            "rejected_total": self.rejected,
+        }
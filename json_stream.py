@@ -0,0 +1,110 @@
+# json_stream.py
+# Incremental parsing of a top-level JSON array from a stream of byte chunks.
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _ArrayParser:
+    """
+    Feeds text into a buffer and pops complete array items out of it. Only the
+    item currently being received is buffered, so memory stays flat however
+    long the array is.
+    """
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._started = False
+        self.finished = False
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        self._buf += self._text.decode(chunk, final=final)
+        items = []
+        pos = 0
+        buf = self._buf
+        while not self.finished:
+            while pos < len(buf) and (buf[pos] in _WHITESPACE or (self._started and buf[pos] == ",")):
+                pos += 1
+            if pos >= len(buf):
+                break
+            if not self._started:
+                if buf[pos] != "[":
+                    raise ValueError(f"Expected a JSON array, got {buf[pos]!r}")
+                self._started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                self.finished = True
+                pos += 1
+                break
+            try:
+                item, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break  # item not complete yet, wait for more data
+            if not isinstance(item, (dict, list, str)):
+                # raw_decode stops at the longest valid prefix ("-500." gives -500), so a
+                # bare number or literal is only complete once a , or ] follows it
+                after = end
+                while after < len(buf) and buf[after] in _WHITESPACE:
+                    after += 1
+                if after == len(buf) or buf[after] not in ",]":
+                    if final and after < len(buf):
+                        raise ValueError(f"Unexpected {buf[after]!r} after a JSON array item")
+                    break  # may continue in the next chunk
+            items.append(item)
+            pos = end
+        self._buf = buf[pos:]
+        if final and not self.finished:
+            raise ValueError("JSON array is truncated")
+        return items
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yields the items of a JSON array as the byte chunks arrive."""
+    parser = _ArrayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.finished:
+            return
+    yield from parser.feed(b"", final=True)
+
+
+async def aiter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """Async iter_json_array."""
+    parser = _ArrayParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+        if parser.finished:
+            return
+    for item in parser.feed(b"", final=True):
+        yield item
+
+
+def project(obj: Any, fields: Optional[List[str]]) -> Any:
+    """
+    Keeps only the given fields of an object. A field may be a dotted path
+    into nested dicts, e.g. "data.color". Missing fields are left out.
+    """
+    if not fields or not isinstance(obj, dict):
+        return obj
+    result: Dict[str, Any] = {}
+    for field in fields:
+        parts = field.split(".")
+        value = obj
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = result
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    return result
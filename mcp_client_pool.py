@@ -0,0 +1,831 @@
+# mcp_client_pool.py
+# Long-lived fastmcp client sessions shared by every tool call in the process.
+#
+#   result = await call_mcp_tool("restapi-mcp-server.py", "get_object_by_id", {"object_id": "7"})
+#
+# A target is a server script path or an http(s) URL. A script's FastMCP
+# instance is loaded into this process and called in memory (no subprocess, no
+# JSON over a pipe); MCP_CLIENT_TRANSPORT=stdio runs it as a child process
+# instead, for isolation, and MCP_CLIENT_TRANSPORT=http sends it to the server
+# URL given in MCP_SERVER_URLS. The first call to a target opens the session;
+# later calls reuse it, so each tool call costs one request instead of a
+# process start and an MCP handshake. Sessions idle for a while are pinged before reuse, and a
+# session found dead is replaced transparently.
+# Over streamable HTTP, concurrent calls share the session and its keep-alive
+# connections; a server restart (unknown session id) or a dropped connection
+# opens a new session.
+#
+# Environment:
+#   MCP_CLIENT_TRANSPORT            inprocess, stdio or http: how script targets are reached, default inprocess
+#   MCP_SERVER_URLS                 script=url pairs for http mode, e.g. restapi-mcp-server.py=http://127.0.0.1:8001/mcp
+#   MCP_POOL_PING_AFTER             idle seconds after which a session is pinged before use, default 30
+#   MCP_POOL_PING_TIMEOUT           seconds a ping may take, default 5
+#   MCP_POOL_HTTP_KEEPALIVE         idle HTTP connections kept per session, default 8
+#   MCP_POOL_HTTP_KEEPALIVE_EXPIRY  seconds an idle HTTP connection is kept, default 60
+#   MCP_STDIO_WORKERS               server processes per McpWorkerPool, default min(4, CPUs)
+#   MCP_WORKER_CHECK_INTERVAL       seconds between McpWorkerPool health checks, default 15
+#   MCP_CLIENT_BATCH_CONCURRENCY    most calls call_mcp_tool_batch runs at once, default 8
+#   MCP_CLIENT_CACHE_TOOLS          read-only tools whose results call_mcp_tool caches, as name=ttl_seconds
+#                                   pairs, e.g. get_object_by_id=60,hello=300 (a bare name gets 60); default none
+#   MCP_CLIENT_CACHE_MAXSIZE        cached tool results, default 1024
+#   MCP_CLIENT_STALE_MAX_AGE        oldest (seconds since fetched) a cached result may be to answer for a failed call,
+#                                   default 300, 0 disables the fallback
+#   MCP_RETRY_TOOLS                 idempotent tools resent once when the session breaks mid-call, comma separated;
+#                                   default the read tools of the servers here. Cached and hedged tools are resent too.
+#   MCP_CALL_TIMEOUT                seconds call_mcp_tool waits for an answer, retries included; default 30, 0 disables
+#   MCP_BREAKER_FAILURES            consecutive failed calls that open a target's circuit, default 5 (see circuit_breaker.py)
+#   MCP_BREAKER_RESET               seconds an open circuit fails calls at once before letting a trial call through, default 30
+#   MCP_HEDGE_TOOLS                 idempotent read-only tools whose slow calls are hedged, comma separated; default none.
+#                                   Not applied to in-process servers, where a second session has nothing separate to fail over to
+#   MCP_HEDGE_QUANTILE              latency quantile of recent calls after which the hedge is sent, default 0.95
+#   MCP_HEDGE_MIN_SAMPLES           calls seen before a tool is hedged at all, default 20
+#   MCP_HEDGE_MIN_DELAY_MS          shortest wait before hedging, default 5
+import asyncio
+import json
+import os
+import time
+import weakref
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import anyio
+import httpx
+from fastmcp import Client
+from fastmcp.client.transports import FastMCPTransport, PythonStdioTransport, StreamableHttpTransport
+from fastmcp.exceptions import ToolError
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+from app_logging import get_logger
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from mcp_serving import load_script
+from mcp_streaming import OnItems, StreamConsumer
+from object_cache import MISSING, TTLCache
+from singleflight import AsyncSingleFlight
+
+CLIENT_TRANSPORT = os.getenv("MCP_CLIENT_TRANSPORT", "inprocess").lower()
+SERVER_URLS = dict(pair.strip().split("=", 1) for pair in os.getenv("MCP_SERVER_URLS", "").split(",") if "=" in pair)
+PING_AFTER = float(os.getenv("MCP_POOL_PING_AFTER", "30"))
+PING_TIMEOUT = float(os.getenv("MCP_POOL_PING_TIMEOUT", "5"))
+HTTP_KEEPALIVE = int(os.getenv("MCP_POOL_HTTP_KEEPALIVE", "8"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("MCP_POOL_HTTP_KEEPALIVE_EXPIRY", "60"))
+STDIO_WORKERS = int(os.getenv("MCP_STDIO_WORKERS", str(min(4, os.cpu_count() or 1))))
+WORKER_CHECK_INTERVAL = float(os.getenv("MCP_WORKER_CHECK_INTERVAL", "15"))
+BATCH_CONCURRENCY = int(os.getenv("MCP_CLIENT_BATCH_CONCURRENCY", "8"))
+CACHE_MAXSIZE = int(os.getenv("MCP_CLIENT_CACHE_MAXSIZE", "1024"))
+# Tool name -> seconds its results stay cached; tools not listed are never cached
+CACHE_TOOLS = {
+    name.strip(): float(ttl or 60)
+    for name, _, ttl in (pair.partition("=") for pair in os.getenv("MCP_CLIENT_CACHE_TOOLS", "").split(","))
+    if name.strip()
+}
+STALE_MAX_AGE = float(os.getenv("MCP_CLIENT_STALE_MAX_AGE", "300"))
+CALL_TIMEOUT = float(os.getenv("MCP_CALL_TIMEOUT", "30"))
+# Hedging needs a separate process or connection behind the backup session, so
+# in-process sessions (the default MCP_CLIENT_TRANSPORT) are never hedged
+HEDGE_TOOLS = {name.strip() for name in os.getenv("MCP_HEDGE_TOOLS", "").split(",") if name.strip()}
+# A call cut off by a broken session may already have run on the server, so
+# only tools that are safe to run twice are resent; writes never are
+RETRY_TOOLS = {
+    name.strip()
+    for name in os.getenv("MCP_RETRY_TOOLS", "get_all_objects,get_object_by_id,get_objects_by_ids,get_metrics,hello").split(",")
+    if name.strip()
+} | set(CACHE_TOOLS) | HEDGE_TOOLS
+HEDGE_QUANTILE = float(os.getenv("MCP_HEDGE_QUANTILE", "0.95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("MCP_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY = float(os.getenv("MCP_HEDGE_MIN_DELAY_MS", "5")) / 1000
+
+logger = get_logger("mcp_client_pool")
+
+T = TypeVar("T")
+
+
+class SessionLostError(ConnectionError):
+    """The server dropped the session, e.g. its process exited or it restarted and no longer knows the session id."""
+
+
+# Transport failures, after which the session is replaced. Protocol errors (an
+# McpError for invalid params or a request timeout) and tool errors go to the
+# caller as they are; a failed connect and a closed connection surface as
+# ConnectionError (see PooledSession._open and _send).
+SESSION_ERRORS = (SessionLostError, ConnectionError, httpx.TransportError, anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+
+
+class HttpMonitor:
+    """
+    Watches the MCP HTTP sessions of one pooled target: counts requests and
+    TCP connections, and sets `lost` when the server rejects the session or
+    the connection fails. The MCP client does not surface those as errors on
+    pending calls (a 400 for an unknown session id leaves them waiting
+    forever), so PooledSession watches `lost` instead.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.lost = asyncio.Event()
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connections += 1
+
+    def client_factory(self, headers: Optional[Dict[str, str]] = None, timeout: Optional[httpx.Timeout] = None, auth: Optional[httpx.Auth] = None) -> httpx.AsyncClient:
+        """httpx_client_factory for the MCP HTTP transports: MCP's defaults plus keep-alive limits and monitoring."""
+        transport = _MonitoredTransport(self, limits=httpx.Limits(max_keepalive_connections=HTTP_KEEPALIVE, keepalive_expiry=HTTP_KEEPALIVE_EXPIRY))
+        return httpx.AsyncClient(headers=headers, timeout=timeout or httpx.Timeout(30.0), auth=auth, follow_redirects=True, transport=transport)
+
+
+class _MonitoredTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, monitor: HttpMonitor, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.monitor = monitor
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        monitor = self.monitor
+        monitor.requests += 1
+        request.extensions["trace"] = monitor._trace
+        # DELETE ends the session on close; its failures do not matter
+        watched = request.method != "DELETE"
+        try:
+            response = await super().handle_async_request(request)
+        except httpx.TransportError:
+            if watched:
+                monitor.lost.set()
+            raise
+        if watched and response.status_code in (400, 404) and "mcp-session-id" in request.headers:
+            monitor.lost.set()
+        return response
+
+
+# Absolute script path -> its FastMCP instance, loaded once per process
+_servers: Dict[str, Any] = {}
+
+
+def load_server(path: str) -> Any:
+    """Imports a server script (once) and returns its `mcp` FastMCP instance."""
+    path = os.path.abspath(path)
+    server = _servers.get(path)
+    if server is None:
+        server = _servers[path] = load_script(path, prefix="mcp_inprocess_").mcp
+        logger.info("Loaded MCP server %s in process", path)
+    return server
+
+
+def server_url(target: str) -> str:
+    """The MCP_SERVER_URLS entry for a script target, looked up by path and then by file name."""
+    url = SERVER_URLS.get(target) or SERVER_URLS.get(os.path.basename(target))
+    if url is None:
+        raise ValueError(f"MCP_CLIENT_TRANSPORT=http but MCP_SERVER_URLS has no URL for {target}")
+    return url
+
+
+def default_client_factory(target: str, http: Optional[HttpMonitor] = None, transport: Optional[str] = None) -> Client:
+    """
+    Builds a client for a target: streamable HTTP for http(s) URLs; for a
+    script, per `transport` (default MCP_CLIENT_TRANSPORT) the server loaded in
+    process, a stdio child process, or its MCP_SERVER_URLS URL.
+    """
+    transport = transport or CLIENT_TRANSPORT
+    if not target.startswith(("http://", "https://")):
+        if transport == "inprocess":
+            return Client(FastMCPTransport(load_server(target)))
+        if transport == "stdio":
+            # Unlike a bare Client("server.py"), hand the parent's environment down so
+            # the server sees OBJECTS_API_BASE_URL, API keys and LOG_* settings
+            return Client(PythonStdioTransport(target, env=dict(os.environ)))
+        if transport != "http":
+            raise ValueError(f"Unknown MCP client transport {transport!r}, expected inprocess, stdio or http")
+        target = server_url(target)
+    if target.rstrip("/").endswith("/sse"):
+        return Client(target)  # legacy SSE endpoint
+    return Client(StreamableHttpTransport(target, httpx_client_factory=http.client_factory if http else None))
+
+
+def mcp_client(target: str, transport: Optional[str] = None) -> Client:
+    """An unpooled Client for target, honouring MCP_CLIENT_TRANSPORT; use as `async with mcp_client(...) as client`."""
+    return default_client_factory(target, transport=transport)
+
+
+class PooledSession:
+    """
+    One shared, connected fastmcp Client for a target.
+    The session is opened on first use and reused by concurrent callers; MCP
+    requests on it are multiplexed by request id. A session idle for
+    ping_after seconds is pinged first, and one that fails the ping or breaks
+    during a call is closed and replaced.
+    Args:
+        target (str): Server script path or http(s) URL.
+        factory (callable): Builds a new, unconnected Client from (target, HttpMonitor).
+        ping_after (float): Idle seconds after which the session is pinged before use.
+    """
+
+    def __init__(self, target: str, factory: Callable[[str, HttpMonitor], Client] = default_client_factory, ping_after: float = PING_AFTER):
+        self.target = target
+        self.factory = factory
+        self.ping_after = ping_after
+        self.http = HttpMonitor()
+        self.client: Optional[Client] = None
+        self._lock = asyncio.Lock()
+        self._last_used = 0.0
+        self.connects = 0
+        self.reconnects = 0
+        self.calls = 0
+        self.reused = 0
+        self.failed_pings = 0
+        self.in_flight = 0
+
+    @property
+    def in_process(self) -> bool:
+        """Whether the connected client calls a server loaded in this process."""
+        return self.client is not None and isinstance(self.client.transport, FastMCPTransport)
+
+    async def _open(self) -> Client:
+        self.http.lost.clear()
+        client = self.factory(self.target, self.http)
+        started = time.perf_counter()
+        try:
+            await client.__aenter__()
+        except Exception as e:
+            # fastmcp reports a failed connect as RuntimeError
+            raise ConnectionError(f"could not connect to MCP server {self.target}: {e}") from e
+        self.connects += 1
+        logger.info("Connected to MCP server %s in %.0f ms", self.target, (time.perf_counter() - started) * 1000)
+        return client
+
+    async def _discard(self) -> None:
+        client, self.client = self.client, None
+        if client is not None:
+            try:
+                await client.close()
+            except Exception:
+                logger.debug("Error closing MCP session for %s", self.target, exc_info=True)
+
+    async def _healthy(self) -> bool:
+        try:
+            with anyio.fail_after(PING_TIMEOUT):
+                return await self.client.ping()
+        except (TimeoutError, McpError, RuntimeError, *SESSION_ERRORS):
+            return False
+
+    async def session(self) -> Client:
+        """Returns the connected client, connecting or reconnecting as needed."""
+        async with self._lock:
+            if self.client is not None and (not self.client.is_connected() or self.http.lost.is_set()):
+                await self._discard()
+                self.reconnects += 1
+            elif self.client is not None and self.in_flight == 0 and time.monotonic() - self._last_used > self.ping_after:
+                if not await self._healthy():
+                    self.failed_pings += 1
+                    logger.warning("MCP session for %s failed its health check, reconnecting", self.target)
+                    await self._discard()
+                    self.reconnects += 1
+            if self.client is None:
+                self.client = await self._open()
+            else:
+                self.reused += 1
+            self._last_used = time.monotonic()
+            return self.client
+
+    async def reconnect(self, broken: Client) -> None:
+        """Replaces the session if it is still the broken one (another caller may have replaced it already)."""
+        async with self._lock:
+            if self.client is broken:
+                await self._discard()
+                self.reconnects += 1
+
+    async def _send(self, client: Client, request: Awaitable[T]) -> T:
+        try:
+            return await self._watch(client, request)
+        except McpError as e:
+            # Pending requests of a session whose stream closed, e.g. a stdio server that exited
+            if e.error.code == CONNECTION_CLOSED:
+                raise SessionLostError(f"MCP session to {self.target} closed: {e}") from e
+            raise
+
+    async def _watch(self, client: Client, request: Awaitable[T]) -> T:
+        if not isinstance(client.transport, StreamableHttpTransport):
+            return await request
+        # Give up on the request as soon as the monitor sees the session go away
+        call = asyncio.ensure_future(request)
+        lost = asyncio.ensure_future(self.http.lost.wait())
+        try:
+            done, _ = await asyncio.wait((call, lost), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            lost.cancel()
+            if not call.done():
+                call.cancel()
+        if call in done:
+            return call.result()
+        raise SessionLostError(f"server dropped the MCP session to {self.target}")
+
+    async def run(self, request: Callable[[Client], Awaitable[T]], label: str = "request", retry: bool = False) -> T:
+        """
+        Runs request(client) on the shared session. If the session turns out to
+        be broken it is replaced; with retry=True, for requests that are safe to
+        run twice, the request is also resent once on the new session.
+        """
+        self.calls += 1
+        self.in_flight += 1
+        try:
+            for attempt in (1, 2):
+                client = await self.session()
+                try:
+                    return await self._send(client, request(client))
+                except ToolError:
+                    raise
+                except SESSION_ERRORS as e:
+                    logger.warning("MCP session for %s broke during %s: %r", self.target, label, e)
+                    await self.reconnect(client)
+                    if attempt == 2 or not retry:
+                        raise
+        finally:
+            self.in_flight -= 1
+            self._last_used = time.monotonic()
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, retry: Optional[bool] = None, **kwargs: Any) -> Any:
+        """client.call_tool on the shared session, see run(); retry defaults to whether name is in RETRY_TOOLS."""
+        return await self.run(lambda client: client.call_tool(name, arguments, **kwargs), name, name in RETRY_TOOLS if retry is None else retry)
+
+    async def check(self) -> bool:
+        """Pings the session now, replacing it (e.g. restarting a crashed server process) if the ping fails."""
+        async with self._lock:
+            if self.client is not None and self.client.is_connected() and await self._healthy():
+                return True
+            if self.client is not None:
+                self.failed_pings += 1
+                logger.warning("MCP session for %s failed its health check, restarting it", self.target)
+                await self._discard()
+                self.reconnects += 1
+            try:
+                self.client = await self._open()
+            except Exception:
+                logger.warning("Could not reconnect to MCP server %s", self.target, exc_info=True)
+                return False
+            self._last_used = time.monotonic()
+            return True
+
+    async def aclose(self) -> None:
+        async with self._lock:
+            await self._discard()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connected": self.client is not None and self.client.is_connected(),
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "calls": self.calls,
+            "reused": self.reused,
+            "failed_pings": self.failed_pings,
+            "in_flight": self.in_flight,
+            "http_requests": self.http.requests,
+            "http_connections": self.http.connections,
+        }
+
+
+class Hedger:
+    """
+    Hedged requests for one tool: a call that has not answered once the
+    `quantile` latency of recent calls has passed is sent a second time,
+    through `backup`, and whichever answers first wins; the other is
+    cancelled. A primary that fails outright is not hedged (PooledSession
+    already retries broken sessions), and nothing is hedged until
+    HEDGE_MIN_SAMPLES calls have been timed. Only for idempotent tools.
+    Args:
+        quantile (float): Latency quantile used as the hedging delay.
+        window (int): Recent calls the quantile is taken over.
+    """
+
+    def __init__(self, quantile: float = HEDGE_QUANTILE, window: int = 256):
+        self.quantile = quantile
+        self.latencies: "deque[float]" = deque(maxlen=window)
+        self.hedged = 0
+        self.backup_wins = 0
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return max(HEDGE_MIN_DELAY, ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))])
+
+    async def run(self, primary: Callable[[], Awaitable[T]], backup: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        delay = self.delay()
+        first = asyncio.ensure_future(primary())
+        pending = {first}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    self.hedged += 1
+                    pending.add(asyncio.ensure_future(backup()))
+            while True:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.discard(task)
+                    error = task.exception()
+                    # A tool or protocol error is the server's answer; a broken call waits for the other one
+                    answered = error is None or isinstance(error, (ToolError, McpError))
+                    if not answered and pending:
+                        continue
+                    if answered:
+                        self.latencies.append(time.perf_counter() - started)
+                        self.backup_wins += task is not first
+                    return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        delay = self.delay()
+        return {
+            "samples": len(self.latencies),
+            "delay_ms": None if delay is None else delay * 1000,
+            "hedged": self.hedged,
+            "backup_wins": self.backup_wins,
+        }
+
+
+class McpClientPool:
+    """
+    Process-wide (per event loop) set of PooledSessions keyed by target.
+    Each target has a CircuitBreaker: once it keeps failing, calls to it fail
+    at once with CircuitOpenError instead of waiting out another timeout.
+    Tools in MCP_HEDGE_TOOLS get a second, backup session per target that
+    slow calls are hedged to (for a stdio target, a second server process);
+    in-process targets are not hedged.
+    Args:
+        factory (callable): Builds a new, unconnected Client from (target, HttpMonitor).
+    """
+
+    def __init__(self, factory: Callable[[str, HttpMonitor], Client] = default_client_factory):
+        self.factory = factory
+        self._sessions: Dict[str, PooledSession] = {}
+        self._backups: Dict[str, PooledSession] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._hedgers: Dict[tuple, Hedger] = {}
+        self._tasks: set = set()
+
+    def get(self, target: str) -> PooledSession:
+        session = self._sessions.get(target)
+        if session is None:
+            session = self._sessions[target] = PooledSession(target, self.factory)
+        return session
+
+    def backup(self, target: str) -> PooledSession:
+        """The session hedged calls to target go to; connected in the background when first asked for."""
+        session = self._backups.get(target)
+        if session is None:
+            session = self._backups[target] = PooledSession(target, self.factory)
+            task = asyncio.ensure_future(session.check())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return session
+
+    def breaker(self, target: str) -> CircuitBreaker:
+        breaker = self._breakers.get(target)
+        if breaker is None:
+            breaker = self._breakers[target] = CircuitBreaker(target)
+        return breaker
+
+    async def _call(self, target: str, name: str, arguments: Optional[Dict[str, Any]], hedge: bool, **kwargs: Any) -> Any:
+        session = self.get(target)
+        # Unconnected (first call, nothing timed yet) or in process: no hedging, no backup session
+        if not hedge or session.client is None or session.in_process:
+            return await session.call_tool(name, arguments, **kwargs)
+        hedger = self._hedgers.get((target, name))
+        if hedger is None:
+            hedger = self._hedgers[(target, name)] = Hedger()
+        backup = self.backup(target)
+        return await hedger.run(
+            lambda: session.call_tool(name, arguments, **kwargs),
+            lambda: backup.call_tool(name, arguments, **kwargs),
+        )
+
+    async def call_tool(
+        self,
+        target: str,
+        name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        deadline: float = CALL_TIMEOUT,
+        hedge: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Calls a tool through target's circuit breaker.
+        Args:
+            deadline (float): Seconds to wait for the answer, retries and hedges included; 0 waits forever.
+            hedge (bool): Hedge slow calls, default whether name is in MCP_HEDGE_TOOLS.
+        Raises:
+            CircuitOpenError: The target's circuit is open.
+            TimeoutError: No answer within the deadline.
+        """
+        hedge = name in HEDGE_TOOLS if hedge is None else hedge
+        breaker = self.breaker(target)
+        breaker.before_call()
+        try:
+            with anyio.fail_after(deadline if deadline > 0 else None):
+                result = await self._call(target, name, arguments, hedge and kwargs.get("progress_handler") is None, **kwargs)
+        except (ToolError, McpError):
+            breaker.record_success()  # the server answered
+            raise
+        except TimeoutError:
+            breaker.record_failure()
+            raise TimeoutError(f"{name} on {target} did not answer within {deadline:g} s") from None
+        except SESSION_ERRORS:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.abandon()
+            raise
+        breaker.record_success()
+        return result
+
+    async def aclose(self) -> None:
+        """Closes every session, stopping the stdio server processes started for them."""
+        for task in list(self._tasks):
+            task.cancel()
+        sessions = [*self._sessions.values(), *self._backups.values()]
+        self._sessions, self._backups = {}, {}
+        for session in sessions:
+            await session.aclose()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        report: Dict[str, Dict[str, Any]] = {}
+        for target in {*self._sessions, *self._breakers}:
+            entry = report[target] = self._sessions[target].stats() if target in self._sessions else {}
+            if target in self._breakers:
+                entry["breaker"] = self._breakers[target].stats()
+            if target in self._backups:
+                entry["backup_session"] = self._backups[target].stats()
+            hedging = {name: hedger.stats() for (t, name), hedger in self._hedgers.items() if t == target}
+            if hedging:
+                entry["hedging"] = hedging
+        return report
+
+
+class McpWorkerPool:
+    """
+    N identical stdio server processes behind one interface. Each request goes
+    to the worker with the fewest requests in flight, so a slow or CPU-bound
+    tool call on one process does not hold up the others. start() launches all
+    workers at once; afterwards every check_interval seconds idle workers are
+    pinged and any that crashed or stopped answering are restarted.
+    Args:
+        name (str): Label for logs and stats, e.g. the server script.
+        factory (callable): Builds a new, unconnected Client from (target, HttpMonitor).
+        size (int): Number of server processes.
+        check_interval (float): Seconds between health checks; 0 disables them.
+    """
+
+    def __init__(self, name: str, factory: Callable[[str, HttpMonitor], Client] = default_client_factory, size: int = STDIO_WORKERS, check_interval: float = WORKER_CHECK_INTERVAL):
+        self.name = name
+        self.workers = [PooledSession(name, factory) for _ in range(max(1, size))]
+        self.check_interval = check_interval
+        self._started: Optional[asyncio.Task] = None
+        self._checker: Optional[asyncio.Task] = None
+        self._hedgers: Dict[str, Hedger] = {}
+
+    async def start(self) -> None:
+        """Starts every worker process (once; concurrent callers wait for the same start)."""
+        if self._started is None:
+            self._started = asyncio.ensure_future(self._start())
+        await asyncio.shield(self._started)
+
+    async def _start(self) -> None:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(worker.check() for worker in self.workers))
+        logger.info("Started %d/%d MCP workers for %s in %.0f ms", sum(results), len(self.workers), self.name, (time.perf_counter() - started) * 1000)
+        if self.check_interval > 0:
+            self._checker = asyncio.ensure_future(self._check_loop())
+
+    async def _check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            # Busy workers have just proven themselves; a hung call shows up as a failed call instead
+            await asyncio.gather(*(worker.check() for worker in self.workers if worker.in_flight == 0))
+
+    def pick(self, exclude: Optional[PooledSession] = None) -> PooledSession:
+        """The least-loaded running worker (other than exclude); ties go to the one that has served fewest calls."""
+        workers = [worker for worker in self.workers if worker is not exclude] or self.workers
+        return min(workers, key=lambda worker: (worker.client is None, worker.in_flight, worker.calls))
+
+    async def run(self, request: Callable[[Client], Awaitable[T]], label: str = "request", retry: bool = False, hedge: bool = False) -> T:
+        """
+        Runs request(client) on the least-loaded worker. With hedge, a call
+        still running after the usual latency of `label` is also sent to
+        another worker and the first answer wins (see Hedger).
+        """
+        await self.start()
+        worker = self.pick()
+        if not hedge or len(self.workers) < 2 or worker.in_process:
+            return await worker.run(request, label, retry)
+        hedger = self._hedgers.get(label)
+        if hedger is None:
+            hedger = self._hedgers[label] = Hedger()
+        return await hedger.run(lambda: worker.run(request, label, retry), lambda: self.pick(exclude=worker).run(request, label, retry))
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, retry: Optional[bool] = None, **kwargs: Any) -> Any:
+        return await self.run(lambda client: client.call_tool(name, arguments, **kwargs), name, name in RETRY_TOOLS if retry is None else retry, name in HEDGE_TOOLS)
+
+    async def aclose(self) -> None:
+        """Stops the health checks and every worker process; a later call starts them again."""
+        if self._checker is not None:
+            self._checker.cancel()
+        self._started = self._checker = None
+        for worker in self.workers:
+            await worker.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        report = {"name": self.name, "workers": [worker.stats() for worker in self.workers]}
+        if self._hedgers:
+            report["hedging"] = {label: hedger.stats() for label, hedger in self._hedgers.items()}
+        return report
+
+
+# Sessions run on the loop that opened them, so keep one pool per loop
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, McpClientPool]" = weakref.WeakKeyDictionary()
+
+
+def get_mcp_pool() -> McpClientPool:
+    """Returns the current event loop's pool."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = McpClientPool()
+    return pool
+
+
+# Results of opted-in tools, keyed by (target, tool, canonical JSON of the arguments),
+# with the time.monotonic() they were fetched at as meta.
+# Shared by every caller in the process, so the cached results must not be mutated.
+# Expired results are kept to answer with while the target is down.
+result_cache = TTLCache(maxsize=CACHE_MAXSIZE, keep_stale=True)
+inflight_calls = AsyncSingleFlight()
+# Target -> number of possible writes sent to it so far; a read that overlapped one is not cached
+_write_counts: Dict[str, int] = {}
+
+
+def cache_key(target: str, name: str, arguments: Optional[Dict[str, Any]]) -> tuple:
+    return (target, name, json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), default=str))
+
+
+async def call_mcp_tool(target: str, name: str, arguments: Optional[Dict[str, Any]] = None, cache_ttl: Optional[float] = None, **kwargs: Any) -> Any:
+    """
+    Calls a tool on a pooled session to target (a server script or URL).
+    Tools opted in through MCP_CLIENT_CACHE_TOOLS (or a cache_ttl > 0 here)
+    are answered from the local result cache while the entry for the same
+    arguments is fresh; concurrent identical misses share one call. Only use
+    this for read-only tools, and not with a progress_handler, which would
+    get no notifications on a hit. When the target times out, fails or has
+    its circuit open, such a tool gets its last (expired) result instead, if
+    it was fetched at most MCP_CLIENT_STALE_MAX_AGE seconds ago.
+    Any other tool not listed in MCP_RETRY_TOOLS may be a write, so every
+    cached result of its target is dropped once it has been sent.
+    Other keyword arguments, e.g. deadline, hedge and retry, go to McpClientPool.call_tool.
+    """
+    pool = get_mcp_pool()
+    ttl = CACHE_TOOLS.get(name, 0.0) if cache_ttl is None else cache_ttl
+    if ttl <= 0 or kwargs.get("progress_handler") is not None:
+        if name in RETRY_TOOLS:
+            return await pool.call_tool(target, name, arguments, **kwargs)
+        _write_counts[target] = _write_counts.get(target, 0) + 1
+        try:
+            return await pool.call_tool(target, name, arguments, **kwargs)
+        finally:
+            # Also after a failure or timeout: the write may still have been applied
+            _write_counts[target] += 1
+            clear_mcp_result_cache(target)
+    key = cache_key(target, name, arguments)
+    result = result_cache.get(key)
+    if result is not MISSING:
+        return result
+
+    async def load() -> Any:
+        writes = _write_counts.get(target, 0)
+        fetched_at = time.monotonic()
+        result = await pool.call_tool(target, name, arguments, **kwargs)
+        if not result.is_error and _write_counts.get(target, 0) == writes:
+            result_cache.set(key, result, ttl=ttl, meta=fetched_at)
+        return result
+
+    try:
+        return await inflight_calls.do(key, load)
+    except (TimeoutError, CircuitOpenError, *SESSION_ERRORS) as e:
+        stale, fetched_at = result_cache.get_stale(key)
+        if stale is MISSING or time.monotonic() - fetched_at > STALE_MAX_AGE:
+            raise
+        logger.warning("Answering %s on %s from a cache entry fetched %.0fs ago: %s", name, target, time.monotonic() - fetched_at, e)
+        return stale
+
+
+def clear_mcp_result_cache(target: Optional[str] = None, name: Optional[str] = None) -> int:
+    """Drops cached tool results, optionally only those of one target and/or tool; returns how many."""
+    return result_cache.invalidate_where(lambda key: (target is None or key[0] == target) and (name is None or key[1] == name))
+
+
+def mcp_result_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the client result cache and of its single-flight group."""
+    return {"cache": result_cache.stats(), "single_flight": inflight_calls.stats(), "tools": dict(CACHE_TOOLS)}
+
+
+def result_data(result: Any) -> Any:
+    """Plain data of a fastmcp CallToolResult: .data, else the structured content, else the text content (JSON decoded when it parses)."""
+    if result.data is not None:
+        return result.data
+    if result.structured_content is not None:
+        return result.structured_content
+    text = "".join(getattr(block, "text", "") for block in result.content)
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+async def call_mcp_tool_streamed(target: str, name: str, arguments: Optional[Dict[str, Any]] = None, on_items: Optional[OnItems] = None, **kwargs: Any) -> Any:
+    """
+    Calls a tool that can stream its list result (e.g. get_all_objects) with
+    stream=True, hands each slice to on_items as it arrives, and returns the
+    whole list. A streamed call's result is only {"streamed": true, "count": N}.
+    If fewer than N items arrived, the tool is called again without streaming.
+    That happens when the server drops progress notifications, e.g. one
+    answering with plain JSON (MCP_JSON_RESPONSE).
+    Other keyword arguments go to call_mcp_tool.
+    """
+    consumer = StreamConsumer(on_items=on_items)
+    result = result_data(await call_mcp_tool(target, name, {**(arguments or {}), "stream": True}, progress_handler=consumer, **kwargs))
+    if not (isinstance(result, dict) and result.get("streamed")):
+        return result  # answered whole, e.g. in passthrough mode
+    if len(consumer.items) == result.get("count"):
+        return consumer.items
+    logger.warning("%s on %s streamed %d of %s items, calling it again without streaming", name, target, len(consumer.items), result.get("count"))
+    return result_data(await call_mcp_tool(target, name, arguments, **kwargs))
+
+
+async def call_mcp_tool_batch(
+    target: str,
+    name: str,
+    arguments: List[Dict[str, Any]],
+    concurrency: Optional[int] = None,
+    key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Calls tool `name` once per entry of `arguments`, concurrently over the
+    pooled session to target, with at most `concurrency` calls in flight.
+    One failed call never fails the batch; each gets its own status entry,
+    in the same order as the input. Besides tool and transport errors, a
+    result like {"error": "..."} counts as failed: that is how the objects
+    servers relay an upstream error body such as a 404.
+    Args:
+        target (str): Server script path or http(s) URL.
+        name (str): Tool to call.
+        arguments (list): Arguments of each call.
+        concurrency (int): Calls in flight at once, capped by MCP_CLIENT_BATCH_CONCURRENCY.
+        key (str): Argument copied into each status entry to identify it, e.g. "object_id".
+    Returns:
+        {"total", "succeeded", "failed", "results": [{"index", "ok", "result" or "error"}]}
+    """
+    total = len(arguments)
+    semaphore = asyncio.Semaphore(max(1, min(concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY)))
+    results: List[Optional[Dict[str, Any]]] = [None] * total
+
+    async def one(index: int, args: Dict[str, Any]) -> None:
+        entry: Dict[str, Any] = {"index": index}
+        if key is not None:
+            entry[key] = args.get(key)
+        async with semaphore:
+            try:
+                data = result_data(await call_mcp_tool(target, name, args))
+            except (ToolError, McpError, TimeoutError, CircuitOpenError, *SESSION_ERRORS) as e:
+                entry.update(ok=False, error=f"{type(e).__name__}: {e}")
+            else:
+                if isinstance(data, dict) and "error" in data:
+                    entry.update(ok=False, error=str(data["error"]))
+                else:
+                    entry.update(ok=True, result=data)
+        results[index] = entry
+
+    await asyncio.gather(*(one(i, args) for i, args in enumerate(arguments)))
+    succeeded = sum(1 for r in results if r["ok"])
+    logger.info("%s x%d on %s: %d succeeded", name, total, target, succeeded)
+    return {"total": total, "succeeded": succeeded, "failed": total - succeeded, "results": results}
+
+
+def mcp_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Returns session and connection reuse, circuit breaker and hedging counters per target for the current event loop."""
+    return get_mcp_pool().stats()
+
+
+async def aclose_mcp_clients() -> None:
+    """Shutdown hook: closes the current loop's pooled sessions."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.aclose()
+
+
+async def closing_mcp_clients(awaitable):
+    """Awaits `awaitable`, then closes the pooled sessions, e.g. asyncio.run(closing_mcp_clients(main()))."""
+    try:
+        return await awaitable
+    finally:
+        await aclose_mcp_clients()
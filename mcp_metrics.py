@@ -0,0 +1,272 @@
+# mcp_metrics.py
+# Per-tool call metrics for the FastMCP servers.
+#
+# install(mcp) adds a middleware that times every tool call, a `get_metrics`
+# tool, and a GET /metrics route on the HTTP transport (Prometheus text format).
+# On stdio, mcp_serving starts a thread that logs a JSON snapshot to stderr
+# every MCP_METRICS_DUMP_INTERVAL seconds (default 60, 0 disables).
+#
+# Upstream time is the wall time during which at least one upstream request of
+# the call was in flight (wrap those requests in upstream_timer()); the rest of
+# the call's duration is reported as overhead.
+# With several HTTP workers each process keeps its own numbers, labelled by pid.
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app_logging import get_logger
+
+DUMP_INTERVAL = float(os.getenv("MCP_METRICS_DUMP_INTERVAL", "60"))
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = get_logger("mcp_metrics")
+
+
+class _CallTimer:
+    # Upstream bookkeeping for one tool call; only touched from its event loop
+    __slots__ = ("active", "busy_since", "upstream", "requests")
+
+    def __init__(self):
+        self.active = 0
+        self.busy_since = 0.0
+        self.upstream = 0.0
+        self.requests = 0
+
+
+_current_call: ContextVar[Optional[_CallTimer]] = ContextVar("mcp_current_call", default=None)
+
+
+def upstream_started() -> None:
+    """Marks the start of an upstream request made by the current tool call."""
+    call = _current_call.get()
+    if call is None:
+        return
+    if call.active == 0:
+        call.busy_since = time.perf_counter()
+    call.active += 1
+    call.requests += 1
+
+
+def upstream_finished() -> None:
+    """Marks the end of a request started with upstream_started()."""
+    call = _current_call.get()
+    if call is None or call.active == 0:
+        return
+    call.active -= 1
+    if call.active == 0:
+        call.upstream += time.perf_counter() - call.busy_since
+
+
+@contextmanager
+def upstream_timer():
+    """Times an upstream request, e.g. `with upstream_timer(): resp = await client.get(...)`."""
+    upstream_started()
+    try:
+        yield
+    finally:
+        upstream_finished()
+
+
+class _ToolStats:
+    __slots__ = ("calls", "errors", "in_flight", "buckets", "duration", "upstream", "upstream_requests")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last one is +Inf
+        self.duration = 0.0
+        self.upstream = 0.0
+        self.upstream_requests = 0
+
+
+class ToolMetrics:
+    """
+    Thread-safe per-tool counters: calls, errors, in-flight calls, a latency
+    histogram and total duration split into upstream time and own overhead.
+    """
+
+    def __init__(self, server: str):
+        self.server = server
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._tools: Dict[str, _ToolStats] = {}
+        self._sources: List[Tuple[str, str, Callable[[], Dict[str, Dict[str, float]]]]] = []
+
+    def add_source(self, name: str, label: str, collect: Callable[[], Dict[str, Dict[str, float]]]) -> None:
+        """
+        Adds metrics owned by another component to every report.
+        Args:
+            name: Prefix of the metric names, e.g. "upstream" gives mcp_upstream_<metric>.
+            label: Label naming the keys returned by collect, e.g. "host".
+            collect: Returns {key: {metric: value}}; metrics ending in _total
+                are reported as counters, the rest as gauges.
+        """
+        self._sources.append((name, label, collect))
+
+    def _stats(self, tool: str) -> _ToolStats:
+        stats = self._tools.get(tool)
+        if stats is None:
+            stats = self._tools[tool] = _ToolStats()
+        return stats
+
+    def begin(self, tool: str) -> None:
+        with self._lock:
+            self._stats(tool).in_flight += 1
+
+    def end(self, tool: str, duration: float, call: _CallTimer, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats(tool)
+            stats.in_flight -= 1
+            stats.calls += 1
+            stats.errors += failed
+            stats.duration += duration
+            stats.upstream += call.upstream
+            stats.upstream_requests += call.requests
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    stats.buckets[i] += 1
+                    break
+            else:
+                stats.buckets[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the counters as plain data, for JSON output."""
+        with self._lock:
+            tools = {}
+            for name, s in sorted(self._tools.items()):
+                tools[name] = {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "in_flight": s.in_flight,
+                    "mean_ms": s.duration / s.calls * 1000 if s.calls else 0.0,
+                    "upstream_ms": s.upstream * 1000,
+                    "overhead_ms": max(0.0, s.duration - s.upstream) * 1000,
+                    "upstream_requests": s.upstream_requests,
+                    "latency_buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], s.buckets)),
+                }
+        report = {"server": self.server, "pid": os.getpid(), "uptime_s": time.time() - self.started, "tools": tools}
+        for name, _, collect in self._sources:
+            report[name] = collect()
+        return report
+
+    def prometheus(self) -> str:
+        """Renders the counters in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._tools.items())
+            lines: List[str] = []
+
+            def family(name: str, kind: str, help_text: str) -> None:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+            def labels(tool: str, extra: str = "") -> str:
+                server = self.server.replace("\\", "\\\\").replace('"', '\\"')
+                return f'{{server="{server}",pid="{os.getpid()}",tool="{tool}"{extra}}}'
+
+            family("mcp_tool_calls_total", "counter", "Completed tool calls.")
+            lines += [f"mcp_tool_calls_total{labels(t)} {s.calls}" for t, s in items]
+            family("mcp_tool_errors_total", "counter", "Tool calls that raised.")
+            lines += [f"mcp_tool_errors_total{labels(t)} {s.errors}" for t, s in items]
+            family("mcp_tool_in_flight", "gauge", "Tool calls currently running.")
+            lines += [f"mcp_tool_in_flight{labels(t)} {s.in_flight}" for t, s in items]
+            family("mcp_tool_upstream_seconds_total", "counter", "Time tool calls spent waiting on the upstream API.")
+            lines += [f"mcp_tool_upstream_seconds_total{labels(t)} {s.upstream:.6f}" for t, s in items]
+            family("mcp_tool_overhead_seconds_total", "counter", "Time tool calls spent outside upstream requests.")
+            lines += [f"mcp_tool_overhead_seconds_total{labels(t)} {max(0.0, s.duration - s.upstream):.6f}" for t, s in items]
+            family("mcp_tool_upstream_requests_total", "counter", "Upstream requests made by tool calls.")
+            lines += [f"mcp_tool_upstream_requests_total{labels(t)} {s.upstream_requests}" for t, s in items]
+            family("mcp_tool_duration_seconds", "histogram", "Tool call latency.")
+            for t, s in items:
+                cumulative = 0
+                for bound, count in zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], s.buckets):
+                    cumulative += count
+                    le = f',le="{bound}"'
+                    lines.append(f"mcp_tool_duration_seconds_bucket{labels(t, le)} {cumulative}")
+                lines.append(f"mcp_tool_duration_seconds_sum{labels(t)} {s.duration:.6f}")
+                lines.append(f"mcp_tool_duration_seconds_count{labels(t)} {s.calls}")
+        server = self.server.replace("\\", "\\\\").replace('"', '\\"')
+        for name, label, collect in self._sources:
+            families: Dict[str, List[str]] = {}
+            for key, values in collect().items():
+                for metric, value in values.items():
+                    families.setdefault(metric, []).append(f'mcp_{name}_{metric}{{server="{server}",pid="{os.getpid()}",{label}="{key}"}} {value}')
+            for metric, samples in families.items():
+                lines.append(f"# TYPE mcp_{name}_{metric} {'counter' if metric.endswith('_total') else 'gauge'}")
+                lines += samples
+        return "\n".join(lines) + "\n"
+
+
+def _middleware(metrics: ToolMetrics):
+    from fastmcp.server.middleware import Middleware
+
+    class ToolMetricsMiddleware(Middleware):
+        async def on_call_tool(self, context, call_next):
+            tool = context.message.name
+            call = _CallTimer()
+            token = _current_call.set(call)
+            metrics.begin(tool)
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = await call_next(context)
+                failed = False
+                return result
+            finally:
+                if call.active:  # a request that never reported back, e.g. a failed model call
+                    call.upstream += time.perf_counter() - call.busy_since
+                metrics.end(tool, time.perf_counter() - start, call, failed)
+                _current_call.reset(token)
+
+    return ToolMetricsMiddleware()
+
+
+# FastMCP instance id -> its metrics, for mcp_serving's stdio dump
+_installed: Dict[int, ToolMetrics] = {}
+
+
+def install(mcp: Any) -> ToolMetrics:
+    """Instruments every tool of `mcp` and adds the get_metrics tool and /metrics route."""
+    from starlette.requests import Request
+    from starlette.responses import PlainTextResponse
+
+    metrics = ToolMetrics(mcp.name)
+    mcp.add_middleware(_middleware(metrics))
+
+    @mcp.tool()
+    async def get_metrics(format: str = "prometheus"):
+        """
+        Reports per-tool call counts, errors, in-flight calls, latency histogram
+        and upstream time versus own overhead.
+        Args:
+            format: "prometheus" for the text exposition format, or "json".
+        """
+        return metrics.snapshot() if format == "json" else metrics.prometheus()
+
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics_route(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
+    _installed[id(mcp)] = metrics
+    return metrics
+
+
+def start_json_dump(mcp: Any, interval: float = DUMP_INTERVAL) -> Optional[threading.Thread]:
+    """Logs a JSON snapshot of `mcp`'s metrics every `interval` seconds from a daemon thread."""
+    metrics = _installed.get(id(mcp))
+    if metrics is None or interval <= 0:
+        return None
+
+    def dump() -> None:
+        while True:
+            time.sleep(interval)
+            logger.info("metrics %s", json.dumps(metrics.snapshot(), separators=(",", ":")))
+
+    thread = threading.Thread(target=dump, name="mcp-metrics-dump", daemon=True)
+    thread.start()
+    return thread
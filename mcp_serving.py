@@ -0,0 +1,277 @@
+# mcp_serving.py
+# Command line and process management for the FastMCP servers.
+#
+#   python restapi-mcp-server.py                                  # stdio, as before
+#   python restapi-mcp-server.py --transport http --port 8001 --workers 4
+#
+# In HTTP mode the server listens on host:port with the MCP endpoint at --path
+# and a readiness probe at /ready. With more than one worker the listening
+# socket is shared by N processes, each with its own event loop, and the MCP
+# endpoint runs stateless so any worker can answer any request.
+#
+# Environment (the command line takes precedence):
+#   MCP_TRANSPORT         stdio or http, default stdio
+#   MCP_HOST, MCP_PORT    default 127.0.0.1:8001
+#   MCP_PATH              MCP endpoint path, default /mcp
+#   MCP_WORKERS           worker processes in HTTP mode, default 1; MCP_UPSTREAM_RATE
+#                         and MCP_UPSTREAM_BURST are split evenly between them
+#   MCP_WORKER_CACHE_TTL  with several workers, the read cache lifetime (seconds) of each
+#                         MCP_CACHE_TTL_* that is not set explicitly, default 1
+#   MCP_STATELESS         force stateless HTTP even with one worker
+#   MCP_JSON_RESPONSE     answer POSTs with plain JSON instead of an SSE stream
+#   MCP_GRACEFUL_TIMEOUT  seconds in-flight calls get to finish on shutdown, default 10
+#   MCP_WORKER_MAX_FAILED_STARTS  workers exiting right after start, in a row, before the
+#                         server gives up with exit code 1, default 5
+import argparse
+import importlib.util
+import math
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+from admission import UPSTREAM_BURST, UPSTREAM_RATE
+from app_logging import get_logger, setup_logging
+from mcp_metrics import start_json_dump
+
+logger = get_logger("mcp_serving")
+
+READY_PATH = "/ready"
+
+# Per-process read caches of the server scripts. A write served by one worker
+# only invalidates its own cache, so with several workers they default to a
+# short lifetime to bound how long another worker serves the old object.
+WORKER_CACHE_SETTINGS = ("MCP_CACHE_TTL_ALL", "MCP_CACHE_TTL_IDS", "MCP_CACHE_TTL_ID")
+WORKER_CACHE_TTL = float(os.getenv("MCP_WORKER_CACHE_TTL", "1"))
+
+# A worker that exits within WORKER_MIN_UPTIME seconds failed to start (bad
+# import, env or port). Such restarts back off exponentially, and after
+# WORKER_MAX_FAILED_STARTS of them in a row the supervisor gives up.
+WORKER_MIN_UPTIME = 10.0
+WORKER_MAX_FAILED_STARTS = int(os.getenv("MCP_WORKER_MAX_FAILED_STARTS", "5"))
+WORKER_BACKOFF_MIN, WORKER_BACKOFF_MAX = 0.5, 30.0
+
+# Flipped by the app lifespan; /ready answers 503 before startup and while draining
+_ready = threading.Event()
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "false").lower() in ("1", "true", "yes")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a FastMCP server over stdio or streamable HTTP")
+    parser.add_argument("--transport", choices=["stdio", "http"], default=os.getenv("MCP_TRANSPORT", "stdio"))
+    parser.add_argument("--host", default=os.getenv("MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("MCP_PORT", "8001")))
+    parser.add_argument("--path", default=os.getenv("MCP_PATH", "/mcp"))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("MCP_WORKERS", "1")))
+    parser.add_argument("--stateless", action="store_true", default=_env_flag("MCP_STATELESS"))
+    # JSON bodies are read to the end, so clients can keep their connections
+    # alive between calls; the price is that progress notifications
+    # (streamed partial results) are not delivered
+    parser.add_argument("--json-response", action="store_true", default=_env_flag("MCP_JSON_RESPONSE"))
+    parser.add_argument("--graceful-timeout", type=float, default=float(os.getenv("MCP_GRACEFUL_TIMEOUT", "10")))
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "INFO").lower())
+    return parser.parse_args(argv)
+
+
+def build_http_app(module: ModuleType, path: str, stateless: bool, json_response: bool = False):
+    """
+    Returns the Starlette app for a server script: the streamable-HTTP MCP
+    endpoint plus the readiness probe.
+    The script's optional `app_lifespan` (an async context manager factory
+    taking the FastMCP instance) is held open for the life of the app, so
+    resources it owns outlive individual MCP sessions and stateless requests.
+    """
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse
+    from starlette.routing import Mount, Route
+
+    mcp = module.mcp
+    mcp_app = mcp.http_app(path=path, stateless_http=stateless, json_response=json_response)
+    app_lifespan = getattr(module, "app_lifespan", None)
+
+    async def ready(request: Request) -> JSONResponse:
+        status = "ready" if _ready.is_set() else "unavailable"
+        return JSONResponse({"status": status, "server": mcp.name, "pid": os.getpid()}, status_code=200 if _ready.is_set() else 503)
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        async with AsyncExitStack() as stack:
+            if app_lifespan is not None:
+                await stack.enter_async_context(app_lifespan(mcp))
+            await stack.enter_async_context(mcp_app.lifespan(app))
+            _ready.set()
+            logger.info("%s ready on pid %d (stateless=%s)", mcp.name, os.getpid(), stateless)
+            try:
+                yield
+            finally:
+                _ready.clear()
+                logger.info("%s draining on pid %d", mcp.name, os.getpid())
+
+    return Starlette(routes=[Route(READY_PATH, ready, methods=["GET"]), Mount("/", app=mcp_app)], lifespan=lifespan)
+
+
+def _uvicorn_server(app: Any, options: Dict[str, Any]):
+    import uvicorn
+
+    config = uvicorn.Config(
+        app,
+        host=options["host"],
+        port=options["port"],
+        log_level=options["log_level"],
+        timeout_graceful_shutdown=options["graceful_timeout"],
+        # app_logging already owns the root logger
+        log_config=None,
+    )
+    return uvicorn.Server(config)
+
+
+def load_script(path: str, prefix: str = "mcp_worker_") -> ModuleType:
+    """Imports a server script by path; the scripts have dashes in their names, so they cannot be imported by name."""
+    name = prefix + os.path.splitext(os.path.basename(path))[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _run_worker(script: str, sock: socket.socket, options: Dict[str, Any]) -> None:
+    # Entry point of each worker process
+    setup_logging()
+    module = load_script(script)
+    app = build_http_app(module, options["path"], stateless=True, json_response=options["json_response"])
+    _uvicorn_server(app, options).run(sockets=[sock])
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _share_upstream_limits(workers: int) -> None:
+    # Every worker has its own token buckets, so without this N workers would send N times the rate.
+    # Spawned workers read the limits from the environment they inherit.
+    os.environ["MCP_UPSTREAM_RATE"] = str(UPSTREAM_RATE / workers)
+    os.environ["MCP_UPSTREAM_BURST"] = str(math.ceil(UPSTREAM_BURST / workers))
+    if UPSTREAM_RATE > 0:
+        logger.info("Upstream limit per worker: %.4g requests/s, burst %s", UPSTREAM_RATE / workers, os.environ["MCP_UPSTREAM_BURST"])
+
+
+def _shorten_worker_caches() -> None:
+    # Like the limits, spawned workers read the cache lifetimes from the environment
+    for name in WORKER_CACHE_SETTINGS:
+        if name not in os.environ:
+            os.environ[name] = str(WORKER_CACHE_TTL)
+        elif float(os.environ[name]) > WORKER_CACHE_TTL:
+            logger.warning("%s=%s: a write only clears the read cache of the worker that served it, so other workers may serve the old object for that long", name, os.environ[name])
+    logger.info("Read cache lifetime per worker: %s", ", ".join(f"{name}={os.environ[name]}" for name in WORKER_CACHE_SETTINGS))
+
+
+def _supervise(script: str, options: Dict[str, Any]) -> None:
+    """
+    Runs options["workers"] processes on one shared socket, restarting any that
+    die. Exits with code 1 when a worker keeps failing right after it starts.
+    """
+    _share_upstream_limits(options["workers"])
+    _shorten_worker_caches()
+    sock = _bind(options["host"], options["port"])
+    context = multiprocessing.get_context("spawn")
+    stopping = threading.Event()
+
+    def start(index: int):
+        process = context.Process(target=_run_worker, args=(script, sock, options), name=f"mcp-worker-{index}", daemon=False)
+        process.start()
+        logger.info("Started worker %d (pid %d)", index, process.pid)
+        return process
+
+    def request_stop(signum, frame) -> None:
+        stopping.set()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, request_stop)
+
+    workers = [start(i) for i in range(options["workers"])]
+    started = [time.monotonic()] * len(workers)
+    failed_starts = [0] * len(workers)
+    restart_at: List[Optional[float]] = [None] * len(workers)
+    logger.info("Serving %s on http://%s:%d%s with %d workers", script, options["host"], options["port"], options["path"], len(workers))
+    try:
+        while not stopping.wait(0.5):
+            now = time.monotonic()
+            for i, process in enumerate(workers):
+                if restart_at[i] is not None:
+                    if now >= restart_at[i]:
+                        workers[i], started[i], restart_at[i] = start(i), now, None
+                    continue
+                if process.is_alive():
+                    continue
+                failed_starts[i] = failed_starts[i] + 1 if now - started[i] < WORKER_MIN_UPTIME else 0
+                if failed_starts[i] >= WORKER_MAX_FAILED_STARTS:
+                    logger.error("Worker %d exited with %s right after starting %d times in a row, giving up", i, process.exitcode, failed_starts[i])
+                    raise SystemExit(1)
+                delay = 0.0 if failed_starts[i] == 0 else min(WORKER_BACKOFF_MAX, WORKER_BACKOFF_MIN * 2 ** (failed_starts[i] - 1))
+                logger.warning("Worker %d (pid %d) exited with %s, restarting in %.1f s", i, process.pid, process.exitcode, delay)
+                if delay:
+                    restart_at[i] = now + delay
+                else:
+                    workers[i], started[i] = start(i), now
+    finally:
+        logger.info("Shutting down %d workers", len(workers))
+        for process in workers:
+            if process.is_alive():
+                process.terminate()  # SIGTERM: uvicorn stops accepting and drains in-flight calls
+        for process in workers:
+            process.join(options["graceful_timeout"] + 5)
+            if process.is_alive():
+                logger.warning("Worker pid %d did not stop in time, killing it", process.pid)
+                process.kill()
+                process.join()
+        sock.close()
+
+
+def serve(module: ModuleType, argv: Optional[List[str]] = None) -> None:
+    """
+    Runs a server script's `mcp` over stdio or streamable HTTP, as chosen on the
+    command line or through the MCP_* environment variables.
+    Args:
+        module: The server script's module, i.e. sys.modules[__name__]; it must
+            define `mcp` and may define `app_lifespan`.
+        argv: Command line arguments, defaults to sys.argv[1:].
+    """
+    setup_logging()
+    args = parse_args(argv)
+    if args.transport == "stdio":
+        # stdout carries the protocol, so metrics go to the log instead of /metrics
+        start_json_dump(module.mcp)
+        module.mcp.run()
+        return
+    options = {
+        "host": args.host,
+        "port": args.port,
+        "path": args.path,
+        "workers": max(1, args.workers),
+        "graceful_timeout": args.graceful_timeout,
+        "json_response": args.json_response,
+        "log_level": args.log_level,
+    }
+    if options["workers"] == 1:
+        app = build_http_app(module, args.path, stateless=args.stateless, json_response=args.json_response)
+        logger.info("Serving on http://%s:%d%s", args.host, args.port, args.path)
+        _uvicorn_server(app, options).run()
+        return
+    _supervise(os.path.abspath(module.__file__), options)
@@ -0,0 +1,115 @@
+# mcp_streaming.py
+# Partial results for long MCP tool calls, carried in progress notifications.
+#
+# Tools stream only when asked to (and sent a progress token; fastmcp clients
+# always send one), otherwise they return their complete result as before.
+# Streamed data goes out in progress notifications whose message is a JSON
+# document, so a StreamConsumer can act on it as it arrives:
+#   {"kind": "items", "items": [...], "received": 150}    next slice of a list result
+#   {"kind": "text", "author": "assistant", "text": "..."}  step of a nested agent run
+# A streamed list is not sent again as the result: the tool returns
+# ItemStream.summary(), {"streamed": true, "count": 150}, instead. Progress
+# notifications can be lost (a server answering with plain JSON drops them), so
+# clients compare the count with what arrived; see call_mcp_tool_streamed in
+# mcp_client_pool.py.
+#
+# Environment:
+#   MCP_STREAM_CHUNK_ITEMS  list items per notification, default 50; 0 disables streaming
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from app_logging import get_logger
+
+STREAM_CHUNK_ITEMS = int(os.getenv("MCP_STREAM_CHUNK_ITEMS", "50"))
+
+logger = get_logger("mcp_streaming")
+
+
+def wants_stream(ctx: Any) -> bool:
+    """True when the caller sent a progress token, i.e. can receive partial results."""
+    if ctx is None or STREAM_CHUNK_ITEMS <= 0:
+        return False
+    meta = ctx.request_context.meta
+    return meta is not None and meta.progressToken is not None
+
+
+class ItemStream:
+    """
+    Server side: sends a list result to the caller in slices of chunk_items as
+    items are added. The full list is kept in .items, e.g. for a cache.
+    Args:
+        ctx: FastMCP Context of the running tool call.
+        total (int): Expected number of items, if known.
+        chunk_items (int): Items per progress notification.
+    """
+
+    def __init__(self, ctx: Any, total: Optional[int] = None, chunk_items: int = STREAM_CHUNK_ITEMS):
+        self.ctx = ctx
+        self.total = total
+        self.chunk_items = max(1, chunk_items)
+        self.items: List[Any] = []
+        self._sent = 0
+
+    async def add(self, item: Any) -> None:
+        self.items.append(item)
+        if len(self.items) - self._sent >= self.chunk_items:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if self._sent == len(self.items):
+            return
+        chunk = self.items[self._sent:]
+        self._sent = len(self.items)
+        message = json.dumps({"kind": "items", "items": chunk, "received": self._sent}, separators=(",", ":"))
+        await self.ctx.report_progress(self._sent, self.total, message)
+
+    def summary(self) -> Dict[str, Any]:
+        """Tool result for a streamed list: how many items were sent."""
+        return {"streamed": True, "count": len(self.items)}
+
+
+async def send_text(ctx: Any, step: int, text: str, author: Optional[str] = None) -> None:
+    """Server side: sends one step of a long-running call, e.g. an agent event."""
+    message = json.dumps({"kind": "text", "author": author, "text": text}, separators=(",", ":"))
+    await ctx.report_progress(step, None, message)
+
+
+OnItems = Callable[[List[Any], int], Union[None, Awaitable[None]]]
+OnText = Callable[[str, Optional[str]], Union[None, Awaitable[None]]]
+
+
+class StreamConsumer:
+    """
+    Client side: a fastmcp progress handler that decodes partial results.
+    Pass it as call_tool(..., progress_handler=consumer). Items received so far
+    are kept in .items; messages that are not partial results are logged.
+    Args:
+        on_items (callable): Called with (new_items, received_so_far) per slice.
+        on_text (callable): Called with (text, author) per step.
+    """
+
+    def __init__(self, on_items: Optional[OnItems] = None, on_text: Optional[OnText] = None):
+        self.on_items = on_items
+        self.on_text = on_text
+        self.items: List[Any] = []
+        self.texts: List[str] = []
+
+    async def __call__(self, progress: float, total: Optional[float], message: Optional[str]) -> None:
+        try:
+            update = json.loads(message) if message else None
+        except ValueError:
+            update = None
+        if not isinstance(update, dict) or "kind" not in update:
+            logger.debug("Progress %s/%s %s", progress, total, message)
+            return
+        if update["kind"] == "items":
+            self.items.extend(update["items"])
+            result = self.on_items(update["items"], update["received"]) if self.on_items else None
+        elif update["kind"] == "text":
+            self.texts.append(update["text"])
+            result = self.on_text(update["text"], update.get("author")) if self.on_text else None
+        else:
+            return
+        if result is not None:
+            await result
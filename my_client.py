@@ -1,11 +1,11 @@
 import asyncio
-from fastmcp import Client
+from mcp_client_pool import mcp_client
 
 async def main():
-    # Create a client instance. FastMCP will infer the StdioTransport
-    # from the python script path.
-    # The client will manage the server subprocess lifecycle.
-    async with Client("my_server.py") as client:
+    # Create a client instance. The server script is loaded into this
+    # process and called in memory; set MCP_CLIENT_TRANSPORT=stdio to run it
+    # as a subprocess instead (the client then manages its lifecycle).
+    async with mcp_client("my_server.py") as client:
         # Call a tool on the server.
         # The first argument to call_tool is the tool name,
         # and the second is a dictionary of arguments.
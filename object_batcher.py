@@ -0,0 +1,85 @@
+# object_batcher.py
+# Dataloader-style batching of single-key async loads into one multi-key call.
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class Batcher(Generic[K, V]):
+    """
+    Collects load(key) calls made within a short window and resolves them all
+    with a single batch_fn(keys) call. Duplicate keys in a window share a result.
+    A batch is dispatched when the window closes or max_batch_size keys are
+    pending, whichever comes first. Must be used from a single event loop.
+    Args:
+        batch_fn (callable): Coroutine taking a list of keys and returning a
+            dict of key -> value. Keys absent from the dict resolve to None.
+        window (float): Seconds to wait for more keys after the first one.
+        max_batch_size (int): Maximum keys sent in one batch_fn call.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        window: float = 0.002,
+        max_batch_size: int = 50,
+    ):
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[K, "asyncio.Future[Optional[V]]"] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: "set[asyncio.Task]" = set()
+        self.loads = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    async def load(self, key: K) -> Optional[V]:
+        self.loads += 1
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        # shield so one cancelled caller does not cancel the shared result
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[K, "asyncio.Future[Optional[V]]"]) -> None:
+        try:
+            results = await self.batch_fn(list(batch))
+        except BaseException as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loads": self.loads,
+            "batches": self.batches,
+            "largest_batch": self.largest_batch,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,102 @@
+# object_cache.py
+# Bounded LRU cache with per-entry TTL, shared by the object read tools.
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Returned by TTLCache.get when the key is absent or expired
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a time-to-live.
+    When maxsize is reached the least recently used entry is evicted.
+    Cached values are shared between callers and must not be mutated.
+    With keep_stale, expired entries stay (until evicted) so get_stale() can
+    hand them out for revalidation, together with the meta stored alongside.
+    Args:
+        maxsize (int): Maximum number of entries kept.
+        ttl (float): Default lifetime of an entry in seconds.
+        keep_stale (bool): Keep expired entries for get_stale().
+        clock (callable): Monotonic time source, injectable for tests.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, keep_stale: bool = False, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.keep_stale = keep_stale
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value, _ = entry
+            if expires_at <= self._clock():
+                if not self.keep_stale:
+                    del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_stale(self, key: Hashable) -> Tuple[Any, Any]:
+        """Returns (value, meta) even if the entry has expired, or (MISSING, None)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING, None
+            return entry[1], entry[2]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, meta: Any = None) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + (self.ttl if ttl is None else ttl), value, meta)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drops every entry whose key matches predicate; returns how many were dropped."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss/eviction counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
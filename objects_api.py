@@ -0,0 +1,657 @@
+# objects_api.py
+# Shared client for the restful-api.dev objects service used by the agent tools.
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app_logging import get_logger
+from object_batcher import Batcher
+from json_stream import aiter_json_array, iter_json_array, project
+from object_cache import MISSING, TTLCache
+from singleflight import AsyncSingleFlight, SingleFlight
+
+# Point at a stand-in such as objects_stub_server.py with OBJECTS_API_BASE_URL
+BASE_URL = os.getenv("OBJECTS_API_BASE_URL", "https://api.restful-api.dev/objects")
+
+# (connect, read) timeout in seconds applied to every call unless overridden
+DEFAULT_TIMEOUT: Tuple[float, float] = (
+    float(os.getenv("OBJECTS_API_CONNECT_TIMEOUT", "3.05")),
+    float(os.getenv("OBJECTS_API_READ_TIMEOUT", "10")),
+)
+# Number of host pools to keep and number of keep-alive sockets per host
+POOL_CONNECTIONS = int(os.getenv("OBJECTS_API_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("OBJECTS_API_POOL_MAXSIZE", "32"))
+# Seconds an idle keep-alive socket is kept open by the async client
+KEEPALIVE_EXPIRY = float(os.getenv("OBJECTS_API_KEEPALIVE_EXPIRY", "30"))
+# Let the async client negotiate HTTP/2 (needs the optional h2 package)
+HTTP2 = os.getenv("OBJECTS_API_HTTP2", "false").lower() in ("1", "true", "yes")
+# Read cache size and lifetimes; the full list goes stale faster than single objects
+CACHE_MAXSIZE = int(os.getenv("OBJECTS_CACHE_MAXSIZE", "2048"))
+CACHE_TTL = float(os.getenv("OBJECTS_CACHE_TTL", "300"))
+CACHE_LIST_TTL = float(os.getenv("OBJECTS_CACHE_LIST_TTL", "30"))
+# Concurrent async single-object reads within this window are merged into one
+# multi-ID request of at most BATCH_MAX_SIZE IDs; a window of 0 disables batching
+BATCH_WINDOW = float(os.getenv("OBJECTS_BATCH_WINDOW_MS", "2")) / 1000
+BATCH_MAX_SIZE = int(os.getenv("OBJECTS_BATCH_MAX_SIZE", "50"))
+# Bytes read per chunk when streaming the object list
+STREAM_CHUNK_SIZE = int(os.getenv("OBJECTS_STREAM_CHUNK_SIZE", "65536"))
+
+Timeout = Union[float, Tuple[float, float]]
+
+logger = get_logger(__name__)
+
+
+class ObjectNotFoundError(LookupError):
+    """Raised when a batched single-object read finds no object with that ID."""
+
+
+class ObjectsApiClient:
+    """
+    Pooled, keep-alive HTTP client for the objects API.
+    One requests.Session is shared by every caller so TCP+TLS connections are
+    reused between tool calls. The pool is blocking: when all POOL_MAXSIZE
+    sockets are busy a caller waits for a free one instead of opening more.
+    Args:
+        base_url (str): Root URL of the objects collection.
+        timeout (tuple): Default (connect, read) timeout for each call.
+        pool_connections (int): Number of per-host pools to cache.
+        pool_maxsize (int): Maximum open sockets per host.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+
+    def url(self, object_id: Optional[str] = None) -> str:
+        if object_id is None or object_id == "":
+            return self.base_url
+        return f"{self.base_url}/{object_id}"
+
+    def request(
+        self,
+        method: str,
+        object_id: Optional[str] = None,
+        timeout: Optional[Timeout] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        return self.session.request(
+            method,
+            self.url(object_id),
+            timeout=self.timeout if timeout is None else timeout,
+            **kwargs,
+        )
+
+    def get(self, object_id: Optional[str] = None, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> requests.Response:
+        return self.request("GET", object_id, params=params, **kwargs)
+
+    def post(self, json: Any, object_id: Optional[str] = None, **kwargs: Any) -> requests.Response:
+        return self.request("POST", object_id, json=json, **kwargs)
+
+    def put(self, object_id: str, json: Any, **kwargs: Any) -> requests.Response:
+        return self.request("PUT", object_id, json=json, **kwargs)
+
+    def patch(self, object_id: str, json: Any, **kwargs: Any) -> requests.Response:
+        return self.request("PATCH", object_id, json=json, **kwargs)
+
+    def delete(self, object_id: str, **kwargs: Any) -> requests.Response:
+        return self.request("DELETE", object_id, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client: Optional[ObjectsApiClient] = None
+_client_lock = threading.Lock()
+
+
+def get_objects_client() -> ObjectsApiClient:
+    """Returns the process-wide ObjectsApiClient, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ObjectsApiClient()
+    return _client
+
+
+def close_objects_client() -> None:
+    """Closes the shared client and its pooled connections."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+class AsyncObjectsApiClient:
+    """
+    Non-blocking counterpart of ObjectsApiClient built on httpx.AsyncClient.
+    Tools awaiting it yield the event loop while waiting on the network, so
+    other Runner sessions keep making progress.
+    Args:
+        base_url (str): Root URL of the objects collection.
+        timeout (tuple): Default (connect, read) timeout for each call.
+        pool_maxsize (int): Maximum open sockets (also the keep-alive limit).
+        keepalive_expiry (float): Seconds an idle socket is kept.
+        http2 (bool): Negotiate HTTP/2 so concurrent calls share one connection;
+            ignored with a warning when h2 is not installed.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool_maxsize: int = POOL_MAXSIZE,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+        http2: bool = HTTP2,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = _httpx_timeout(timeout)
+        self.http2 = http2 and _h2_available()
+        self.client = httpx.AsyncClient(
+            http2=self.http2,
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(
+                max_connections=pool_maxsize,
+                max_keepalive_connections=pool_maxsize,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=self.timeout,
+        )
+
+    def url(self, object_id: Optional[str] = None) -> str:
+        if object_id is None or object_id == "":
+            return self.base_url
+        return f"{self.base_url}/{object_id}"
+
+    async def request(
+        self,
+        method: str,
+        object_id: Optional[str] = None,
+        timeout: Optional[Timeout] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        return await self.client.request(
+            method,
+            self.url(object_id),
+            timeout=self.timeout if timeout is None else _httpx_timeout(timeout),
+            **kwargs,
+        )
+
+    async def get(self, object_id: Optional[str] = None, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", object_id, params=params, **kwargs)
+
+    def stream(self, method: str, object_id: Optional[str] = None, timeout: Optional[Timeout] = None, **kwargs: Any):
+        """Returns an async context manager yielding a response whose body is not read yet."""
+        return self.client.stream(
+            method,
+            self.url(object_id),
+            timeout=self.timeout if timeout is None else _httpx_timeout(timeout),
+            **kwargs,
+        )
+
+    async def post(self, json: Any, object_id: Optional[str] = None, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", object_id, json=json, **kwargs)
+
+    async def put(self, object_id: str, json: Any, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", object_id, json=json, **kwargs)
+
+    async def patch(self, object_id: str, json: Any, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", object_id, json=json, **kwargs)
+
+    async def delete(self, object_id: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", object_id, **kwargs)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def _httpx_timeout(timeout: Timeout) -> httpx.Timeout:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+# httpx.AsyncClient and the batcher's futures are bound to the loop they first
+# run on, so keep one of each per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncObjectsApiClient]" = weakref.WeakKeyDictionary()
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Batcher]" = weakref.WeakKeyDictionary()
+
+
+def _per_loop(registry: weakref.WeakKeyDictionary, factory: Callable[[], Any]) -> Any:
+    loop = asyncio.get_running_loop()
+    value = registry.get(loop)
+    if value is None:
+        value = registry[loop] = factory()
+    return value
+
+
+def get_async_objects_client() -> AsyncObjectsApiClient:
+    """Returns the AsyncObjectsApiClient of the running event loop, creating it on first use."""
+    return _per_loop(_async_clients, AsyncObjectsApiClient)
+
+
+async def aclose_objects_client() -> None:
+    """Closes the running loop's async client and its pooled connections."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+# Read-through cache in front of the object reads, kept coherent by the writes below.
+# Keys are ("object", id) for single objects and ALL_OBJECTS_KEY for the full list.
+# Expired entries are kept with their ETag/Last-Modified validators so the next
+# read can revalidate them with a conditional GET instead of refetching the body.
+object_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL, keep_stale=True)
+ALL_OBJECTS_KEY = ("all",)
+
+# Cache misses for the same key that overlap in time share one upstream request
+read_flight = SingleFlight()
+async_read_flight = AsyncSingleFlight()
+
+# Outcomes of conditional GETs sent for stale cache entries
+revalidation_stats = {"conditional_requests": 0, "not_modified": 0, "modified": 0}
+
+# Bumped when a write starts and again when it ends (see _write_barrier), so a
+# read that overlapped a write does not cache what it read
+cache_generation = 0
+_generation_lock = threading.Lock()
+
+
+def _bump_generation() -> None:
+    global cache_generation
+    with _generation_lock:
+        cache_generation += 1
+
+
+def _object_key(object_id: Any) -> Tuple[str, str]:
+    return ("object", str(object_id))
+
+
+def _ids_key(ids: List[Any]) -> Tuple[str, Tuple[str, ...]]:
+    return ("ids", tuple(str(i) for i in ids))
+
+
+def _cached_objects(ids: List[Any]) -> Optional[List[Dict[str, Any]]]:
+    found = []
+    for object_id in ids:
+        cached = object_cache.get(_object_key(object_id))
+        if cached is MISSING:
+            return None
+        found.append(cached)
+    return found
+
+
+def _remember_objects(objects: List[Dict[str, Any]], generation: int) -> None:
+    if generation != cache_generation:
+        return
+    for obj in objects:
+        if isinstance(obj, dict) and "id" in obj:
+            object_cache.set(_object_key(obj["id"]), obj)
+
+
+def _write_barrier(object_id: Optional[str] = None) -> None:
+    # Runs when a write starts and again when it ends: drops the entries the write
+    # changes (the full list, always) and makes reads in flight skip caching
+    _bump_generation()
+    if object_id is not None:
+        object_cache.invalidate(_object_key(object_id))
+    object_cache.invalidate(ALL_OBJECTS_KEY)
+
+
+def _remember_write(obj: Any) -> None:
+    # The object a write returned is fresh
+    if isinstance(obj, dict) and "id" in obj:
+        object_cache.set(_object_key(obj["id"]), obj)
+
+
+def _validators(response: Any) -> Optional[Dict[str, str]]:
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["If-None-Match"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = response.headers["Last-Modified"]
+    return validators or None
+
+
+def _conditional_headers(key: Any) -> Tuple[Any, Dict[str, str]]:
+    # Returns the stale cached body (or MISSING) and the headers to revalidate it
+    stale, validators = object_cache.get_stale(key)
+    if stale is MISSING or not validators:
+        return MISSING, {}
+    revalidation_stats["conditional_requests"] += 1
+    return stale, validators
+
+
+def _store_response(key: Any, response: Any, stale: Any, generation: int, ttl: Optional[float] = None) -> Any:
+    # Serves the stale body on 304, otherwise parses and caches the new one;
+    # nothing is cached if a write happened since the read started (generation)
+    current = generation == cache_generation
+    if response.status_code == 304 and stale is not MISSING:
+        revalidation_stats["not_modified"] += 1
+        if current:
+            object_cache.set(key, stale, ttl=ttl, meta=_validators(response) or object_cache.get_stale(key)[1])
+        return stale
+    response.raise_for_status()
+    if stale is not MISSING:
+        revalidation_stats["modified"] += 1
+    data = response.json()
+    if current:
+        object_cache.set(key, data, ttl=ttl, meta=_validators(response))
+    return data
+
+
+def _load_all_objects() -> List[Dict[str, Any]]:
+    generation = cache_generation
+    stale, headers = _conditional_headers(ALL_OBJECTS_KEY)
+    response = get_objects_client().get(headers=headers)
+    return _store_response(ALL_OBJECTS_KEY, response, stale, generation, ttl=CACHE_LIST_TTL)
+
+
+def _load_objects_by_ids(ids: List[Any]) -> List[Dict[str, Any]]:
+    generation = cache_generation
+    response = get_objects_client().get(params={"id": ids})
+    response.raise_for_status()
+    data = response.json()
+    _remember_objects(data, generation)
+    return data
+
+
+def _load_object(object_id: str) -> Dict[str, Any]:
+    generation = cache_generation
+    key = _object_key(object_id)
+    stale, headers = _conditional_headers(key)
+    response = get_objects_client().get(object_id, headers=headers)
+    return _store_response(key, response, stale, generation)
+
+
+def fetch_all_objects() -> List[Dict[str, Any]]:
+    """Returns every object, from the cache when the list is still fresh."""
+    cached = object_cache.get(ALL_OBJECTS_KEY)
+    if cached is not MISSING:
+        return cached
+    return read_flight.do(ALL_OBJECTS_KEY, _load_all_objects)
+
+
+def fetch_objects_by_ids(ids: List[Any]) -> List[Dict[str, Any]]:
+    """Returns the objects with the given IDs, cached per object."""
+    cached = _cached_objects(ids)
+    if cached is not None:
+        return cached
+    return read_flight.do(_ids_key(ids), lambda: _load_objects_by_ids(ids))
+
+
+def fetch_object(object_id: str) -> Dict[str, Any]:
+    """Returns a single object, cached by ID."""
+    key = _object_key(object_id)
+    cached = object_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    return read_flight.do(key, lambda: _load_object(object_id))
+
+
+def create_object(payload: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+    _write_barrier()
+    try:
+        response = get_objects_client().post(json=payload, **kwargs)
+    finally:
+        _write_barrier()
+    response.raise_for_status()
+    data = response.json()
+    _remember_write(data)
+    return data
+
+
+def replace_object(object_id: str, payload: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+    _write_barrier(object_id)
+    try:
+        response = get_objects_client().put(object_id, json=payload, **kwargs)
+    finally:
+        _write_barrier(object_id)
+    response.raise_for_status()
+    data = response.json()
+    _remember_write(data)
+    return data
+
+
+def patch_object(object_id: str, fields: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+    _write_barrier(object_id)
+    try:
+        response = get_objects_client().patch(object_id, json=fields, **kwargs)
+    finally:
+        _write_barrier(object_id)
+    response.raise_for_status()
+    data = response.json()
+    _remember_write(data)
+    return data
+
+
+def remove_object(object_id: str, **kwargs: Any) -> Dict[str, Any]:
+    _write_barrier(object_id)
+    try:
+        response = get_objects_client().delete(object_id, **kwargs)
+    finally:
+        _write_barrier(object_id)
+    response.raise_for_status()
+    return response.json()
+
+
+async def _aload_all_objects() -> List[Dict[str, Any]]:
+    generation = cache_generation
+    stale, headers = _conditional_headers(ALL_OBJECTS_KEY)
+    response = await get_async_objects_client().get(headers=headers)
+    return _store_response(ALL_OBJECTS_KEY, response, stale, generation, ttl=CACHE_LIST_TTL)
+
+
+async def _aload_objects_by_ids(ids: List[Any]) -> List[Dict[str, Any]]:
+    # Also the batcher's fetch, so batched single-object reads get the same check
+    generation = cache_generation
+    response = await get_async_objects_client().get(params={"id": ids})
+    response.raise_for_status()
+    data = response.json()
+    _remember_objects(data, generation)
+    return data
+
+
+async def _aload_object(object_id: str) -> Dict[str, Any]:
+    generation = cache_generation
+    key = _object_key(object_id)
+    stale, headers = _conditional_headers(key)
+    # Only objects not cached at all are batched. A stale entry is revalidated on
+    # its own; one without validators (multi-ID responses carry none per object)
+    # is fetched on its own too, so the response brings them for the next time
+    if BATCH_WINDOW > 0 and object_cache.get_stale(key)[0] is MISSING:
+        data = await get_object_batcher().load(str(object_id))
+        if data is None:
+            raise ObjectNotFoundError(f"Object with id={object_id} was not found.")
+        return data
+    response = await get_async_objects_client().get(object_id, headers=headers)
+    return _store_response(key, response, stale, generation)
+
+
+async def _fetch_objects_batch(ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    data = await _aload_objects_by_ids(ids)
+    return {str(obj["id"]): obj for obj in data if isinstance(obj, dict) and "id" in obj}
+
+
+def get_object_batcher() -> Batcher:
+    """Returns the single-object read Batcher of the running event loop."""
+    return _per_loop(_batchers, lambda: Batcher(_fetch_objects_batch, window=BATCH_WINDOW, max_batch_size=BATCH_MAX_SIZE))
+
+
+async def afetch_all_objects() -> List[Dict[str, Any]]:
+    """Async fetch_all_objects."""
+    cached = object_cache.get(ALL_OBJECTS_KEY)
+    if cached is not MISSING:
+        return cached
+    return await async_read_flight.do(ALL_OBJECTS_KEY, _aload_all_objects)
+
+
+async def afetch_objects_by_ids(ids: List[Any]) -> List[Dict[str, Any]]:
+    """Async fetch_objects_by_ids."""
+    cached = _cached_objects(ids)
+    if cached is not None:
+        return cached
+    return await async_read_flight.do(_ids_key(ids), lambda: _aload_objects_by_ids(ids))
+
+
+async def afetch_object(object_id: str) -> Dict[str, Any]:
+    """Async fetch_object; cache misses are batched when BATCH_WINDOW is set."""
+    key = _object_key(object_id)
+    cached = object_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    return await async_read_flight.do(key, lambda: _aload_object(object_id))
+
+
+async def acreate_object(payload: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+    _write_barrier()
+    try:
+        response = await get_async_objects_client().post(json=payload, **kwargs)
+    finally:
+        _write_barrier()
+    response.raise_for_status()
+    data = response.json()
+    _remember_write(data)
+    return data
+
+
+async def areplace_object(object_id: str, payload: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+    _write_barrier(object_id)
+    try:
+        response = await get_async_objects_client().put(object_id, json=payload, **kwargs)
+    finally:
+        _write_barrier(object_id)
+    response.raise_for_status()
+    data = response.json()
+    _remember_write(data)
+    return data
+
+
+async def apatch_object(object_id: str, fields: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+    _write_barrier(object_id)
+    try:
+        response = await get_async_objects_client().patch(object_id, json=fields, **kwargs)
+    finally:
+        _write_barrier(object_id)
+    response.raise_for_status()
+    data = response.json()
+    _remember_write(data)
+    return data
+
+
+async def aremove_object(object_id: str, **kwargs: Any) -> Dict[str, Any]:
+    _write_barrier(object_id)
+    try:
+        response = await get_async_objects_client().delete(object_id, **kwargs)
+    finally:
+        _write_barrier(object_id)
+    response.raise_for_status()
+    return response.json()
+
+
+class _PageBuilder:
+    # Collects one limit/offset page of projected items from an item stream
+    def __init__(self, offset: int, limit: int, fields: Optional[List[str]]):
+        self.offset = max(offset, 0)
+        self.limit = max(limit, 0)
+        self.fields = fields
+        self.index = 0
+        self.objects: List[Any] = []
+        self.has_more = False
+
+    def add(self, item: Any) -> bool:
+        """Takes the next item; returns False once the page is complete."""
+        if self.index >= self.offset:
+            if len(self.objects) >= self.limit:
+                self.has_more = True
+                return False
+            self.objects.append(project(item, self.fields))
+        self.index += 1
+        return True
+
+    def page(self) -> Dict[str, Any]:
+        return {
+            "objects": self.objects,
+            "offset": self.offset,
+            "next_offset": self.offset + len(self.objects) if self.has_more else None,
+        }
+
+
+def fetch_objects_page(offset: int = 0, limit: int = 50, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Returns one page of the object list, projected to the given fields.
+    The upstream array is parsed incrementally and the connection is dropped
+    once the page is full, so memory does not grow with the collection.
+    """
+    builder = _PageBuilder(offset, limit, fields)
+    cached = object_cache.get(ALL_OBJECTS_KEY)
+    if cached is not MISSING:
+        for item in cached:
+            if not builder.add(item):
+                break
+        return builder.page()
+    with get_objects_client().get(stream=True) as response:
+        response.raise_for_status()
+        for item in iter_json_array(response.iter_content(STREAM_CHUNK_SIZE)):
+            if not builder.add(item):
+                break
+    return builder.page()
+
+
+async def afetch_objects_page(offset: int = 0, limit: int = 50, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Async fetch_objects_page."""
+    builder = _PageBuilder(offset, limit, fields)
+    cached = object_cache.get(ALL_OBJECTS_KEY)
+    if cached is not MISSING:
+        for item in cached:
+            if not builder.add(item):
+                break
+        return builder.page()
+    async with get_async_objects_client().stream("GET") as response:
+        response.raise_for_status()
+        async for item in aiter_json_array(response.aiter_bytes(STREAM_CHUNK_SIZE)):
+            if not builder.add(item):
+                break
+    return builder.page()
+
+
+def read_path_stats() -> Dict[str, Any]:
+    """Returns cache and single-flight counters for the object read path."""
+    return {
+        "cache": object_cache.stats(),
+        "single_flight": read_flight.stats(),
+        "async_single_flight": async_read_flight.stats(),
+        "revalidation": dict(revalidation_stats),
+    }
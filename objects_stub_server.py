@@ -0,0 +1,292 @@
+# objects_stub_server.py
+# Local stand-in for https://api.restful-api.dev/objects for offline and load tests.
+#
+# Run standalone:
+#   python objects_stub_server.py --port 8080 --latency-ms 20 --error-rate 0.01
+#   set OBJECTS_API_BASE_URL=http://127.0.0.1:8080/objects
+# or start it in-process with start_stub_server().
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class ObjectStore:
+    """
+    Thread-safe in-memory object collection, seeded with numbered objects.
+    Tracks when each object and the collection as a whole last changed, for
+    Last-Modified headers.
+    """
+
+    def __init__(self, seed_objects: int = 13):
+        self._lock = threading.Lock()
+        self._objects: Dict[str, Dict[str, Any]] = {}
+        self._modified: Dict[str, float] = {}
+        self.list_modified = time.time()
+        for i in range(1, seed_objects + 1):
+            self._modified[str(i)] = self.list_modified
+            self._objects[str(i)] = {
+                "id": str(i),
+                "name": f"Object {i}",
+                "data": {"color": random.choice(["Black", "White", "Silver"]), "capacity GB": 64 * (i % 4 + 1)},
+            }
+
+    def list(self, ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            if ids is None:
+                return list(self._objects.values())
+            return [self._objects[i] for i in ids if i in self._objects]
+
+    def get(self, object_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._objects.get(object_id)
+
+    def modified(self, object_id: Optional[str] = None) -> float:
+        with self._lock:
+            return self.list_modified if object_id is None else self._modified.get(object_id, self.list_modified)
+
+    def _touch(self, object_id: str) -> None:
+        self._modified[object_id] = self.list_modified = time.time()
+
+    def create(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        obj = {"id": uuid.uuid4().hex, "name": body.get("name"), "data": body.get("data"), "createdAt": _now()}
+        with self._lock:
+            self._objects[obj["id"]] = {k: obj[k] for k in ("id", "name", "data")}
+            self._touch(obj["id"])
+        return obj
+
+    def replace(self, object_id: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if object_id not in self._objects:
+                return None
+            obj = {"id": object_id, "name": body.get("name"), "data": body.get("data")}
+            self._objects[object_id] = obj
+            self._touch(object_id)
+        return {**obj, "updatedAt": _now()}
+
+    def patch(self, object_id: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if object_id not in self._objects:
+                return None
+            obj = {**self._objects[object_id], **{k: v for k, v in body.items() if k in ("name", "data")}}
+            self._objects[object_id] = obj
+            self._touch(object_id)
+        return {**obj, "updatedAt": _now()}
+
+    def delete(self, object_id: str) -> bool:
+        with self._lock:
+            self._modified.pop(object_id, None)
+            self.list_modified = time.time()
+            return self._objects.pop(object_id, None) is not None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real service
+    disable_nagle_algorithm = True  # headers and body are separate writes; avoid the delayed-ACK stall
+    server: "StubServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # keep benchmark output clean
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_cacheable(self, body: Any, modified: float) -> None:
+        # GET responses carry ETag/Last-Modified and honour conditional requests;
+        # If-None-Match takes precedence over If-Modified-Since
+        payload = json.dumps(body).encode("utf-8")
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        validators = {"ETag": etag, "Last-Modified": formatdate(modified, usegmt=True)}
+        if_none_match = self.headers.get("If-None-Match")
+        if_modified_since = self.headers.get("If-Modified-Since")
+        not_modified = False
+        if if_none_match is not None:
+            not_modified = etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        elif if_modified_since is not None:
+            try:
+                not_modified = int(modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                pass
+        self.server.conditional_requests += if_none_match is not None or if_modified_since is not None
+        if not_modified:
+            self.server.not_modified += 1
+            self.send_response(304)
+            for name, value in validators.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in validators.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _route(self) -> Tuple[Optional[str], Dict[str, List[str]]]:
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        if not parts or parts[0] != "objects" or len(parts) > 2:
+            return "", {}
+        return (parts[1] if len(parts) == 2 else None), parse_qs(url.query)
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _simulate(self) -> bool:
+        # Returns False when an injected error response has been sent
+        config = self.server
+        if config.latency:
+            time.sleep(config.latency + random.uniform(0, config.jitter))
+        if config.error_rate and random.random() < config.error_rate:
+            self._send(500, {"error": "Injected failure"})
+            return False
+        return True
+
+    def _not_found(self, object_id: str) -> None:
+        self._send(404, {"error": f"Object with id={object_id} was not found."})
+
+    def do_GET(self) -> None:
+        object_id, query = self._route()
+        if object_id == "":
+            return self._send(404, {"error": "Not found"})
+        if not self._simulate():
+            return
+        store = self.server.store
+        if object_id is None:
+            ids = query.get("id")
+            modified = store.modified() if ids is None else max((store.modified(i) for i in ids), default=store.modified())
+            return self._send_cacheable(store.list(ids), modified)
+        obj = store.get(object_id)
+        if obj is None:
+            return self._not_found(object_id)
+        self._send_cacheable(obj, store.modified(object_id))
+
+    def do_POST(self) -> None:
+        object_id, _ = self._route()
+        if object_id is not None:
+            return self._send(405, {"error": "Method not allowed"})
+        body = self._body()
+        if not self._simulate():
+            return
+        self._send(200, self.server.store.create(body))
+
+    def do_PUT(self) -> None:
+        object_id, _ = self._route()
+        if not object_id:
+            return self._send(405, {"error": "Method not allowed"})
+        body = self._body()
+        if not self._simulate():
+            return
+        obj = self.server.store.replace(object_id, body)
+        if obj is None:
+            return self._not_found(object_id)
+        self._send(200, obj)
+
+    def do_PATCH(self) -> None:
+        object_id, _ = self._route()
+        if not object_id:
+            return self._send(405, {"error": "Method not allowed"})
+        body = self._body()
+        if not self._simulate():
+            return
+        obj = self.server.store.patch(object_id, body)
+        if obj is None:
+            return self._not_found(object_id)
+        self._send(200, obj)
+
+    def do_DELETE(self) -> None:
+        object_id, _ = self._route()
+        if not object_id:
+            return self._send(405, {"error": "Method not allowed"})
+        if not self._simulate():
+            return
+        if not self.server.store.delete(object_id):
+            return self._not_found(object_id)
+        self._send(200, {"message": f"Object with id = {object_id} has been deleted."})
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server holding the stand-in's store and fault settings.
+    Args:
+        address (tuple): (host, port) to bind; port 0 picks a free port.
+        store (ObjectStore): Backing object collection.
+        latency (float): Seconds added to every request.
+        jitter (float): Extra random delay of up to this many seconds.
+        error_rate (float): Fraction of requests answered with HTTP 500.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128  # the default backlog of 5 drops connects under benchmark concurrency
+
+    def __init__(self, address: Tuple[str, int], store: ObjectStore, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0):
+        super().__init__(address, StubHandler)
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.conditional_requests = 0
+        self.not_modified = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/objects"
+
+
+def start_stub_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    seed_objects: int = 13,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+) -> StubServer:
+    """Starts the stand-in on a background thread; call shutdown() to stop it."""
+    server = StubServer((host, port), ObjectStore(seed_objects), latency=latency, jitter=jitter, error_rate=error_rate)
+    threading.Thread(target=server.serve_forever, name="objects-stub-server", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the restful-api.dev objects API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--objects", type=int, default=13, help="number of seeded objects")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server = StubServer(
+        (args.host, args.port),
+        ObjectStore(args.objects),
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+    )
+    print(f"Serving objects stand-in at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
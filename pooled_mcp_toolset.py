@@ -0,0 +1,74 @@
+# pooled_mcp_toolset.py
+# An ADK MCPToolset served by several pre-started stdio server processes.
+#
+#   toolset = PooledMCPToolset(connection_params=StdioServerParameters(command="python", args=["my_server.py"]), workers=4)
+#
+# A plain MCPToolset talks to one server process over one pipe, so tool calls
+# queue behind each other and a CPU-heavy tool uses a single core. Here the
+# toolset's tools dispatch every call to the least-loaded of `workers`
+# identical processes (see mcp_client_pool.McpWorkerPool), which are health
+# checked and restarted when they crash. Slow calls of tools in MCP_HEDGE_TOOLS
+# are hedged to a second worker.
+import os
+from typing import Any, Dict, Optional
+
+from fastmcp import Client
+from fastmcp.client.transports import StdioTransport
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+
+from mcp_client_pool import HEDGE_TOOLS, RETRY_TOOLS, STDIO_WORKERS, WORKER_CHECK_INTERVAL, McpWorkerPool
+
+
+class _WorkerPoolSession:
+    # The subset of mcp.ClientSession that MCPToolset and MCPTool use
+    def __init__(self, pool: McpWorkerPool):
+        self.pool = pool
+
+    async def list_tools(self):
+        return await self.pool.run(lambda client: client.list_tools_mcp(), "list_tools", retry=True)
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        return await self.pool.run(lambda client: client.call_tool_mcp(name, arguments or {}), name, retry=name in RETRY_TOOLS, hedge=name in HEDGE_TOOLS)
+
+
+class _WorkerPoolSessionManager:
+    # Stands in for ADK's MCPSessionManager; the same session serves every caller
+    def __init__(self, pool: McpWorkerPool):
+        self.pool = pool
+        self.session = _WorkerPoolSession(pool)
+
+    async def create_session(self, headers: Optional[Dict[str, str]] = None) -> _WorkerPoolSession:
+        await self.pool.start()
+        return self.session
+
+    async def close(self) -> None:
+        await self.pool.aclose()
+
+
+class PooledMCPToolset(MCPToolset):
+    """
+    MCPToolset over a pool of stdio server processes.
+    Args:
+        connection_params: StdioServerParameters (or StdioConnectionParams) of
+            the server; every worker runs the same command.
+        workers (int): Number of server processes, default MCP_STDIO_WORKERS.
+        check_interval (float): Seconds between worker health checks.
+        **kwargs: Passed on to MCPToolset, e.g. tool_filter.
+    """
+
+    def __init__(self, *, connection_params: Any, workers: int = STDIO_WORKERS, check_interval: float = WORKER_CHECK_INTERVAL, **kwargs: Any):
+        super().__init__(connection_params=connection_params, **kwargs)
+        # StdioConnectionParams wraps the StdioServerParameters
+        params = getattr(connection_params, "server_params", connection_params)
+        env = {**os.environ, **(params.env or {})}
+
+        def factory(target: str, http: Any) -> Client:
+            return Client(StdioTransport(params.command, list(params.args), env=env, cwd=params.cwd))
+
+        label = " ".join([params.command, *params.args])
+        self.pool = McpWorkerPool(label, factory, size=workers, check_interval=check_interval)
+        self._mcp_session_manager = _WorkerPoolSessionManager(self.pool)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-worker connects, restarts, calls and in-flight calls."""
+        return self.pool.stats()
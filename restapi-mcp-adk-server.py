@@ -1,12 +1,19 @@
 # rest_api_server.py
+import os
+import sys
 from fastmcp import FastMCP, Context
 import httpx
 import asyncio
+import json
 from fastmcp import Client
 import google.genai as genai
-from typing import Any
+from typing import Any, Awaitable, Callable, Optional
 from google.genai import types
 from dotenv import load_dotenv
+from app_logging import Payload, get_logger
+from mcp_metrics import install as install_metrics, upstream_finished, upstream_started, upstream_timer
+from mcp_serving import serve
+from mcp_streaming import send_text, wants_stream
 
 load_dotenv()
 
@@ -21,13 +28,16 @@ from google.adk.sessions import InMemorySessionService
 mcp = FastMCP(
     name="RESTful API Wrapper 🌐",
 )
+metrics = install_metrics(mcp)
 
-BASE_URL = "https://api.restful-api.dev/objects"
+BASE_URL = os.getenv("OBJECTS_API_BASE_URL", "https://api.restful-api.dev/objects")
 
 APP_NAME = "MCP_SERVER_WITH_ADK_AGENT"
 USER_ID = "1234"
 SESSION_ID = "session1234"
 
+logger = get_logger("restapi-mcp-adk-server")
+
 '''
 async def get_objects_by_ids(ids: list[str], ctx: Context):
     query = "&".join([f"id={i}" for i in ids])
@@ -39,9 +49,18 @@ async def get_objects_by_ids(ids: list[str], ctx: Context):
 '''
 async def get_object_by_id(object_id: str):
    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{BASE_URL}/{object_id}")
-        print("get_object_by_id",resp.json())
-        return resp.json()
+        with upstream_timer():
+            resp = await client.get(f"{BASE_URL}/{object_id}")
+        data = resp.json()
+        logger.debug("get_object_by_id %s", Payload(data))
+        return data
+
+# Gemini requests count as upstream time in the tool metrics, like the REST calls
+def mark_model_call(callback_context, llm_request):
+    upstream_started()
+
+def mark_model_done(callback_context, llm_response):
+    upstream_finished()
 
 call_mcp_server_agent = LlmAgent(
     model="gemini-2.0-flash",
@@ -51,6 +70,8 @@ call_mcp_server_agent = LlmAgent(
     When the user asks to fetch data for a specific object ID, use the `get_object_by_id` tool and pass the ID to it.
     """,
     tools=[get_object_by_id],
+    before_model_callback=mark_model_call,
+    after_model_callback=mark_model_done,
 )
 
 # Session and Runner
@@ -61,28 +82,51 @@ async def setup_session_and_runner():
         runner = Runner(agent=call_mcp_server_agent, app_name=APP_NAME, session_service=session_service)
     return session, runner
 
-async def get_agent_async(query):
+def describe_event(event: Event) -> str:
+    """Short text summary of an agent event for streaming to the caller."""
+    lines = [f"Calling {call.name}({json.dumps(call.args, default=str)})" for call in event.get_function_calls()]
+    lines += [f"{resp.name} returned {json.dumps(resp.response, default=str)}" for resp in event.get_function_responses()]
+    if event.content and event.content.parts:
+        lines += [part.text for part in event.content.parts if part.text]
+    return "\n".join(lines)
+
+async def get_agent_async(query, on_event: Optional[Callable[[Event], Awaitable[None]]] = None):
     content = types.Content(role='user', parts=[types.Part(text=query)])
     session, runner = await setup_session_and_runner()
     events = runner.run_async(user_id=USER_ID, session_id=SESSION_ID, new_message=content)
 
     final_response = "Agent did not produce a final response."
     async for event in events:
+        if on_event is not None:
+            await on_event(event)
         # You can uncomment the following line to see the full event flow for debugging
         # print(f"DEBUG Event: {event.model_dump_json(indent=2, exclude_none=True)}")
         if event.is_final_response() and event.content and event.content.parts:
-            print(f"Potential final response from [{event.author}]: {event.content.parts[0].text}")
+            logger.info("Potential final response from [%s]: %s", event.author, event.content.parts[0].text)
             final_response = event.content.parts[0].text
             #print final_response
-            print(f"final_response",final_response)
+            logger.info("final_response %s", final_response)
     return final_response
     
 @mcp.tool()
 async def get_objects_by_id_using_adk_agent(object_id: str,ctx: Context):
-    print(f"object_id:::::::::::::::::",object_id)
-    final_result = await get_agent_async(f"Fetch the data for object_id {object_id}, pass the id to get_object_by_id tool")
+    logger.info("object_id: %s", object_id)
+    on_event = None
+    if wants_stream(ctx):
+        # Forward the agent's tool calls and results as they happen, so the
+        # caller sees the object before the model has written its answer
+        steps = 0
+
+        async def on_event(event: Event):
+            nonlocal steps
+            text = describe_event(event)
+            if text:
+                steps += 1
+                await send_text(ctx, steps, text, event.author)
+
+    final_result = await get_agent_async(f"Fetch the data for object_id {object_id}, pass the id to get_object_by_id tool", on_event)
     return final_result
 
 if __name__ == "__main__":
-    #mcp.run(transport="streamable-http", host="127.0.0.1", port=8001, path="/mcp")
-    mcp.run()
+    # stdio by default; --transport http --port 8001 --workers 4 for a shared server
+    serve(sys.modules[__name__])
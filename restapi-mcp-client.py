@@ -1,8 +1,9 @@
 import asyncio
-from fastmcp import Client
 from typing import Any
 from google.genai import types
 from dotenv import load_dotenv
+from app_logging import Payload, get_logger, setup_logging
+from mcp_client_pool import call_mcp_tool, call_mcp_tool_batch, call_mcp_tool_streamed, closing_mcp_clients
 
 from google.adk.agents import LlmAgent
 from pydantic import BaseModel, Field
@@ -16,13 +17,31 @@ APP_NAME = "CALL_MCP_SERVER"
 USER_ID = "1234"
 SESSION_ID = "session1234"
 
+logger = get_logger(__name__)
+
 async def get_mcp_data(object_id: str) -> dict:
     """Fetches an object by its ID from the MCP server."""
-    print(f"Tool 'get_mcp_data' called with object_id: {object_id}")
-    async with Client("restapi-mcp-server.py") as client:
-        single = await client.call_tool("get_object_by_id", {"object_id": object_id})
-        print("Fetched single:", single)
-        return single
+    logger.info("Tool 'get_mcp_data' called with object_id: %s", object_id)
+    # Reuses one MCP session across calls instead of starting a server per call (in process by default, see MCP_CLIENT_TRANSPORT)
+    single = await call_mcp_tool("restapi-mcp-server.py", "get_object_by_id", {"object_id": object_id})
+    logger.debug("Fetched single: %s", Payload(single))
+    return single
+
+async def get_mcp_data_batch(object_ids: list[str]) -> dict:
+    """Fetches many objects by their IDs from the MCP server in one tool call, keeping the order of object_ids."""
+    logger.info("Tool 'get_mcp_data_batch' called with %d object_ids", len(object_ids))
+    # Concurrent calls over the pooled session; an ID that fails gets an error entry instead of failing the batch
+    batch = await call_mcp_tool_batch("restapi-mcp-server.py", "get_object_by_id", [{"object_id": object_id} for object_id in object_ids], key="object_id")
+    logger.debug("Fetched batch: %s", Payload(batch))
+    return batch
+
+async def get_all_mcp_objects() -> list:
+    """Fetches every object from the MCP server, surfacing each slice as it streams in."""
+    logger.info("Tool 'get_all_mcp_objects' called")
+    # Falls back to a plain call if the slices do not arrive, e.g. from a server answering with plain JSON
+    objects = await call_mcp_tool_streamed("restapi-mcp-server.py", "get_all_objects", on_items=lambda items, received: logger.info("Received %d objects so far", received))
+    logger.debug("Fetched all: %s", Payload(objects))
+    return objects
         
 call_mcp_server_agent = LlmAgent(
     model="gemini-2.0-flash",
@@ -30,8 +49,10 @@ call_mcp_server_agent = LlmAgent(
     description="This agent is used to get data using FASTMCP client by calling the FASTMCP server ",
     instruction="""Help user to fetch the data from the FASTMCP Server using FASTMCP Client.
     When the user asks to fetch data for a specific object ID, use the `get_mcp_data` tool and pass the ID to it.
+    When the user asks for several object IDs, use the `get_mcp_data_batch` tool once with all of the IDs instead of calling `get_mcp_data` for each.
+    When the user asks for all objects, use the `get_all_mcp_objects` tool.
     """,
-    tools=[get_mcp_data],
+    tools=[get_mcp_data, get_mcp_data_batch, get_all_mcp_objects],
 )
     
 # Session and Runner
@@ -51,12 +72,13 @@ async def get_agent_async(query):
         # You can uncomment the following line to see the full event flow for debugging
         # print(f"DEBUG Event: {event.model_dump_json(indent=2, exclude_none=True)}")
         if event.is_final_response() and event.content and event.content.parts:
-            print(f"Potential final response from [{event.author}]: {event.content.parts[0].text}")
+            logger.info("Potential final response from [%s]: %s", event.author, event.content.parts[0].text)
             final_response = event.content.parts[0].text
     
     return final_response
 
  
 if __name__ == "__main__":
-    final_result = asyncio.run(get_agent_async("Fetch the data for object_id 2"))
+    setup_logging()
+    final_result = asyncio.run(closing_mcp_clients(get_agent_async("Fetch the data for object_id 2")))
     print(f"\n--- Script Finished ---\nFinal returned value: {final_result}")
\ No newline at end of file
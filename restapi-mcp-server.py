@@ -1,61 +1,348 @@
 # rest_api_server.py
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, List, Optional
 from fastmcp import FastMCP, Context
+from fastmcp.exceptions import ToolError
 import httpx
+from admission import OverloadedError, admission_stats, limiter_for
+from app_logging import Payload, get_logger
+from json_stream import aiter_json_array
+from mcp_metrics import install as install_metrics, upstream_timer
+from mcp_serving import serve
+from mcp_streaming import ItemStream, wants_stream
+from object_cache import MISSING, TTLCache
+from objects_api import STREAM_CHUNK_SIZE, AsyncObjectsApiClient
+from singleflight import AsyncSingleFlight
 
-mcp = FastMCP(name="RESTful API Wrapper 🌐")
+BASE_URL = os.getenv("OBJECTS_API_BASE_URL", "https://api.restful-api.dev/objects")
 
-BASE_URL = "https://api.restful-api.dev/objects"
+# Upstream calls a bulk tool runs at once, unless the call asks for fewer
+BULK_CONCURRENCY = int(os.getenv("MCP_BULK_CONCURRENCY", "8"))
+
+# Read tool results are cached in-process; each tool has its own lifetime in
+# seconds (0 disables caching for that tool)
+CACHE_MAXSIZE = int(os.getenv("MCP_CACHE_MAXSIZE", "4096"))
+CACHE_TTLS = {
+    "get_all_objects": float(os.getenv("MCP_CACHE_TTL_ALL", "30")),
+    "get_objects_by_ids": float(os.getenv("MCP_CACHE_TTL_IDS", "120")),
+    "get_object_by_id": float(os.getenv("MCP_CACHE_TTL_ID", "300")),
+}
+
+# Read tools return the upstream body text as-is, without decoding the JSON and
+# encoding it again; bodies over MCP_RAW_MAX_BYTES are refused (0 = no cap)
+RAW_PASSTHROUGH = os.getenv("MCP_RAW_PASSTHROUGH", "false").lower() in ("1", "true", "yes")
+RAW_MAX_BYTES = int(os.getenv("MCP_RAW_MAX_BYTES", "0"))
+
+logger = get_logger("restapi-mcp-server")
+
+
+class UpstreamClient:
+    """
+    Owns the one pooled AsyncObjectsApiClient shared by every tool call, so
+    connections (and TLS sessions) are reused instead of opened per call.
+    Pool size, keep-alive, timeouts and HTTP/2 come from the OBJECTS_API_*
+    environment variables read by objects_api.py.
+    The client is opened on first use and closed when the last server
+    lifespan using it exits (one per stdio process, one per HTTP session).
+    """
+
+    def __init__(self, base_url: str = BASE_URL):
+        self.base_url = base_url
+        self._api: Optional[AsyncObjectsApiClient] = None
+        self._users = 0
+
+    @property
+    def api(self) -> AsyncObjectsApiClient:
+        if self._api is None:
+            self._api = AsyncObjectsApiClient(self.base_url)
+            logger.info("Opened upstream client for %s (http2=%s)", self.base_url, self._api.http2)
+        return self._api
+
+    async def aclose(self) -> None:
+        api, self._api = self._api, None
+        if api is not None:
+            await api.aclose()
+            logger.info("Closed upstream client for %s", self.base_url)
+
+    @asynccontextmanager
+    async def lifespan(self, server: FastMCP):
+        self._users += 1
+        try:
+            yield {"upstream": self.api}
+        finally:
+            self._users -= 1
+            if self._users == 0:
+                await self.aclose()
+
+
+upstream = UpstreamClient()
+# Held open by mcp_serving for the life of an HTTP worker, so the pool is not
+# rebuilt per session or per stateless request
+app_lifespan = upstream.lifespan
+
+mcp = FastMCP(name="RESTful API Wrapper 🌐", lifespan=upstream.lifespan)
+metrics = install_metrics(mcp)
+metrics.add_source("upstream", "host", admission_stats)
+
+# Concurrent identical reads share one upstream request and its parsed body
+inflight_reads = AsyncSingleFlight()
+
+# Keys are ("all",), ("ids", (id, ...)) and ("id", id), wrapped as ("raw", key)
+# for passthrough bodies. Cached values are shared between clients and must not
+# be mutated.
+response_cache = TTLCache(maxsize=CACHE_MAXSIZE)
+cache_counters = {tool: {"hits": 0, "misses": 0} for tool in CACHE_TTLS}
+# Bumped by every write, so a read that started before it does not cache its result
+cache_generation = 0
+
+@asynccontextmanager
+async def upstream_call():
+    """
+    Admits one upstream request under the per-host rate limit (see admission.py)
+    and times it. Over the limit, the tool call fails at once with an overload error.
+    """
+    try:
+        await limiter_for(upstream.base_url).acquire()
+    except OverloadedError as e:
+        raise ToolError(f"Server overloaded, retry later: {e}") from e
+    with upstream_timer():
+        yield
+
+def parse(resp: httpx.Response, label: str):
+    # The body is decoded exactly once; tools return this object as-is
+    data = resp.json()
+    logger.debug("%s %s", label, Payload(data))
+    return data
+
+async def fetch_json(label: str, key: tuple, object_id: Optional[str] = None, params: Optional[dict] = None):
+    generation = cache_generation
+    async with upstream_call():
+        resp = await upstream.api.get(object_id, params=params)
+    data = parse(resp, label)
+    if resp.is_success and CACHE_TTLS[label] > 0 and generation == cache_generation:
+        response_cache.set(key, data, ttl=CACHE_TTLS[label])
+    return data
+
+async def read_capped(resp: httpx.Response, label: str) -> bytes:
+    # Refuses oversized bodies up front when the length is known, else while reading
+    length = resp.headers.get("Content-Length")
+    if RAW_MAX_BYTES and length is not None and int(length) > RAW_MAX_BYTES:
+        raise ToolError(f"{label} response is {length} bytes, over the {RAW_MAX_BYTES} byte limit")
+    body = bytearray()
+    async for chunk in resp.aiter_bytes(STREAM_CHUNK_SIZE):
+        body += chunk
+        if RAW_MAX_BYTES and len(body) > RAW_MAX_BYTES:
+            raise ToolError(f"{label} response is over the {RAW_MAX_BYTES} byte limit")
+    return bytes(body)
+
+async def fetch_raw(label: str, key: tuple, object_id: Optional[str] = None, params: Optional[dict] = None) -> str:
+    generation = cache_generation
+    async with upstream_call():
+        async with upstream.api.stream("GET", object_id, params=params) as resp:
+            body = await read_capped(resp, label)
+    # Returned as text content verbatim; only the UTF-8 decode is left
+    text = body.decode(resp.encoding or "utf-8")
+    logger.debug("%s passthrough %d bytes", label, len(body))
+    if resp.is_success and CACHE_TTLS[label] > 0 and generation == cache_generation:
+        response_cache.set(key, text, ttl=CACHE_TTLS[label])
+    return text
+
+async def read_through(label: str, key: tuple, object_id: Optional[str] = None, params: Optional[dict] = None):
+    load = fetch_json
+    if RAW_PASSTHROUGH:
+        key, load = ("raw", key), fetch_raw
+    data = response_cache.get(key)
+    if data is not MISSING:
+        cache_counters[label]["hits"] += 1
+        return data
+    cache_counters[label]["misses"] += 1
+    return await inflight_reads.do(key, lambda: load(label, key, object_id, params))
+
+def invalidate_object(object_id: Optional[str] = None):
+    """Drops cached reads a write to object_id may have changed (the list, always)."""
+    global cache_generation
+    cache_generation += 1
+    if object_id is None:
+        response_cache.invalidate(("all",))
+        response_cache.invalidate(("raw", ("all",)))
+        return
+    def affected(key: tuple) -> bool:
+        if key[0] == "raw":
+            key = key[1]
+        return key == ("all",) or key == ("id", object_id) or (key[0] == "ids" and object_id in key[1])
+
+    response_cache.invalidate_where(affected)
+
+async def upstream_write(method: str, object_id: Optional[str] = None, data: Optional[dict] = None) -> httpx.Response:
+    try:
+        async with upstream_call():
+            return await upstream.api.request(method, object_id, json=data)
+    finally:
+        invalidate_object(object_id)
+
+async def stream_all_objects(stream: ItemStream):
+    # Parses the upstream array as it downloads and forwards each slice to the
+    # caller; the cache still gets the complete list
+    generation = cache_generation
+    async with upstream_call():
+        async with upstream.api.stream("GET") as resp:
+            if not resp.is_success:
+                await resp.aread()
+                return parse(resp, "get_all_objects")
+            async for obj in aiter_json_array(resp.aiter_bytes(STREAM_CHUNK_SIZE)):
+                await stream.add(obj)
+    await stream.flush()
+    logger.debug("get_all_objects streamed %d objects", len(stream.items))
+    if CACHE_TTLS["get_all_objects"] > 0 and generation == cache_generation:
+        response_cache.set(("all",), stream.items, ttl=CACHE_TTLS["get_all_objects"])
+    return stream.items
 
 @mcp.tool()
-async def get_all_objects(ctx: Context):
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(BASE_URL)
-        print("get_all_objects",resp.json())
-    return resp.json()
+async def get_all_objects(ctx: Context, stream: bool = False):
+    """
+    Returns every object. With stream=True and a progress handler, the list is
+    instead sent in slices while it downloads (see mcp_streaming.py) and the
+    result is only {"streamed": true, "count": N}, so it is not sent twice.
+    In passthrough mode the body is relayed whole.
+    """
+    if RAW_PASSTHROUGH or not stream or not wants_stream(ctx):
+        return await read_through("get_all_objects", ("all",))
+    items = ItemStream(ctx)
+    data = response_cache.get(("all",))
+    if data is not MISSING:
+        cache_counters["get_all_objects"]["hits"] += 1
+        for obj in data:
+            await items.add(obj)
+        await items.flush()
+    else:
+        cache_counters["get_all_objects"]["misses"] += 1
+        data = await stream_all_objects(items)
+        if not isinstance(data, list):
+            return data  # upstream error body
+    return items.summary()
 
 @mcp.tool()
 async def get_objects_by_ids(ids: list[str], ctx: Context):
-    query = "&".join([f"id={i}" for i in ids])
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{BASE_URL}?{query}")
-        print("get_objects_by_ids",resp.json())
-    return resp.json()
+    return await read_through("get_objects_by_ids", ("ids", tuple(ids)), params={"id": ids})
 
 @mcp.tool()
 async def get_object_by_id(object_id: str, ctx: Context):
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{BASE_URL}/{object_id}")
-        print("get_object_by_id",resp.json())
-    return resp.json()
+    return await read_through("get_object_by_id", ("id", object_id), object_id)
 
 @mcp.tool()
 async def add_object(data: dict, ctx: Context):
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(BASE_URL, json=data)
-        print("add_object",resp.json())
-    return resp.json()
+    return parse(await upstream_write("POST", data=data), "add_object")
 
 @mcp.tool()
 async def update_object(object_id: str, data: dict, ctx: Context):
-    async with httpx.AsyncClient() as client:
-        resp = await client.put(f"{BASE_URL}/{object_id}", json=data)
-        print("update_object",resp.json())
-    return resp.json()
+    return parse(await upstream_write("PUT", object_id, data), "update_object")
 
 @mcp.tool()
 async def patch_object(object_id: str, data: dict, ctx: Context):
-    async with httpx.AsyncClient() as client:
-        resp = await client.patch(f"{BASE_URL}/{object_id}", json=data)
-        print("patch_object",resp.json())
-    return resp.json()
+    return parse(await upstream_write("PATCH", object_id, data), "patch_object")
 
 @mcp.tool()
 async def delete_object(object_id: str, ctx: Context):
-    async with httpx.AsyncClient() as client:
-        resp = await client.delete(f"{BASE_URL}/{object_id}")
-        print("delete_object",resp.json())
+    resp = await upstream_write("DELETE", object_id)
+    logger.debug("delete_object %s", Payload(resp.text))
     return {"status_code": resp.status_code, "message": "Deleted" if resp.status_code == 200 else "Failed"}
 
+def body_of(resp: httpx.Response):
+    try:
+        return resp.json()
+    except ValueError:
+        return resp.text
+
+async def run_bulk(label: str, items: list, call: Callable[[dict], Awaitable[httpx.Response]], ctx: Optional[Context], concurrency: Optional[int]):
+    """
+    Runs call(item) for every item with at most `concurrency` upstream requests
+    in flight, reporting progress through ctx as items complete.
+    One failed item never fails the batch; each gets its own status entry,
+    in the same order as the input.
+    """
+    total = len(items)
+    semaphore = asyncio.Semaphore(max(1, min(concurrency or BULK_CONCURRENCY, BULK_CONCURRENCY)))
+    results: List[Optional[dict]] = [None] * total
+    done = 0
+
+    async def one(index: int, item):
+        nonlocal done
+        async with semaphore:
+            try:
+                resp = await call(item)
+                results[index] = {"index": index, "ok": resp.is_success, "status_code": resp.status_code, "result": body_of(resp)}
+            except (httpx.HTTPError, ToolError, KeyError, TypeError) as e:
+                results[index] = {"index": index, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        done += 1
+        if ctx is not None:
+            await ctx.report_progress(done, total)
+
+    await asyncio.gather(*(one(i, item) for i, item in enumerate(items)))
+    succeeded = sum(1 for r in results if r["ok"])
+    logger.info("%s: %d of %d succeeded", label, succeeded, total)
+    return {"total": total, "succeeded": succeeded, "failed": total - succeeded, "results": results}
+
+@mcp.tool()
+async def add_objects(items: list[dict], ctx: Context, concurrency: Optional[int] = None):
+    """
+    Creates many objects in one call.
+    Args:
+        items: Object bodies, each like {"name": ..., "data": {...}}.
+        concurrency: Upstream requests run at once, capped by MCP_BULK_CONCURRENCY.
+    """
+    return await run_bulk("add_objects", items, lambda item: upstream_write("POST", data=item), ctx, concurrency)
+
+@mcp.tool()
+async def update_objects(items: list[dict], ctx: Context, concurrency: Optional[int] = None):
+    """
+    Replaces many objects in one call.
+    Args:
+        items: Entries like {"object_id": "7", "data": {"name": ..., "data": {...}}}.
+        concurrency: Upstream requests run at once, capped by MCP_BULK_CONCURRENCY.
+    """
+    return await run_bulk("update_objects", items, lambda item: upstream_write("PUT", item["object_id"], item["data"]), ctx, concurrency)
+
+@mcp.tool()
+async def patch_objects(items: list[dict], ctx: Context, concurrency: Optional[int] = None):
+    """
+    Partially updates many objects in one call.
+    Args:
+        items: Entries like {"object_id": "7", "data": {"name": ...}}.
+        concurrency: Upstream requests run at once, capped by MCP_BULK_CONCURRENCY.
+    """
+    return await run_bulk("patch_objects", items, lambda item: upstream_write("PATCH", item["object_id"], item["data"]), ctx, concurrency)
+
+@mcp.tool()
+async def delete_objects(object_ids: list[str], ctx: Context, concurrency: Optional[int] = None):
+    """
+    Deletes many objects in one call.
+    Args:
+        object_ids: IDs of the objects to delete.
+        concurrency: Upstream requests run at once, capped by MCP_BULK_CONCURRENCY.
+    """
+    return await run_bulk("delete_objects", object_ids, lambda object_id: upstream_write("DELETE", object_id), ctx, concurrency)
+
+@mcp.tool()
+async def cache_admin(ctx: Context, clear: bool = False):
+    """
+    Reports the server's read cache hit rates, overall and per tool.
+    Args:
+        clear: Also drop every cached entry after reporting.
+    """
+    tools = {}
+    for tool, counts in cache_counters.items():
+        lookups = counts["hits"] + counts["misses"]
+        tools[tool] = {**counts, "hit_rate": counts["hits"] / lookups if lookups else 0.0, "ttl": CACHE_TTLS[tool]}
+    report = {"cache": response_cache.stats(), "tools": tools, "single_flight": inflight_reads.stats()}
+    if clear:
+        response_cache.clear()
+        report["cleared"] = True
+        logger.info("Read cache cleared")
+    return report
+
 if __name__ == "__main__":
-    #mcp.run(transport="streamable-http", host="127.0.0.1", port=8001, path="/mcp")
-    mcp.run()
+    # stdio by default; --transport http --port 8001 --workers 4 for a shared server
+    serve(sys.modules[__name__])
@@ -0,0 +1,34 @@
+# tests/conftest.py
+# The modules under test live at the repository root, next to the demo scripts.
+import functools
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from object_cache import TTLCache  # noqa: E402
+from objects_stub_server import start_stub_server  # noqa: E402
+
+
+@pytest.fixture
+def stub_server():
+    """objects_stub_server on a free port, with 13 seeded objects and 100 ms latency."""
+    server = start_stub_server(latency=0.1)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def objects_api(stub_server, monkeypatch):
+    """objects_api talking to stub_server, with an empty read cache."""
+    import objects_api
+
+    monkeypatch.setattr(objects_api, "_client", objects_api.ObjectsApiClient(stub_server.base_url))
+    monkeypatch.setattr(objects_api, "AsyncObjectsApiClient", functools.partial(objects_api.AsyncObjectsApiClient, stub_server.base_url))
+    monkeypatch.setattr(objects_api, "object_cache", TTLCache(maxsize=objects_api.CACHE_MAXSIZE, ttl=objects_api.CACHE_TTL, keep_stale=True))
+    monkeypatch.setattr(objects_api, "revalidation_stats", dict.fromkeys(objects_api.revalidation_stats, 0))
+    yield objects_api
+    objects_api._client.close()
@@ -0,0 +1,105 @@
+# tests/test_admission.py
+import asyncio
+
+import pytest
+
+from admission import OverloadedError, RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_burst_is_admitted_at_once_then_refills():
+    clock = Clock()
+    limiter = RateLimiter(rate=2, burst=3, max_queue=10, max_wait=0, clock=clock)
+
+    async def main():
+        for _ in range(3):
+            await limiter.acquire()
+        with pytest.raises(OverloadedError):
+            await limiter.acquire()
+        clock.now = 0.5  # one token back at 2/s
+        await limiter.acquire()
+
+    asyncio.run(main())
+    stats = limiter.stats()
+    assert (stats["admitted_total"], stats["rejected_wait_total"]) == (4, 1)
+
+
+def test_caller_waits_for_the_next_token():
+    limiter = RateLimiter(rate=100, burst=1, max_queue=10, max_wait=1)
+
+    async def main():
+        await limiter.acquire()
+        await limiter.acquire()  # next token is 10 ms away
+
+    asyncio.run(main())
+    assert limiter.stats()["admitted_total"] == 2
+    assert limiter.max_queued == 1
+
+
+def test_full_queue_is_rejected():
+    limiter = RateLimiter(rate=1, burst=1, max_queue=1, max_wait=10)
+
+    async def main():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queued == 1
+        with pytest.raises(OverloadedError, match="queue is full"):
+            await limiter.acquire()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(main())
+    stats = limiter.stats()
+    assert (stats["queued"], stats["rejected_queue_full_total"], stats["rejected_wait_total"]) == (0, 1, 0)
+
+
+def test_wait_longer_than_max_wait_is_rejected():
+    clock = Clock()
+    limiter = RateLimiter(rate=1, burst=1, max_queue=10, max_wait=0.5, clock=clock)
+
+    async def main():
+        await limiter.acquire()
+        with pytest.raises(OverloadedError, match="rate limited"):
+            await limiter.acquire()  # next token in 1 s
+
+    asyncio.run(main())
+    assert limiter.stats()["rejected_wait_total"] == 1
+    assert limiter.queued == 0
+
+
+def test_cancelled_waiter_gives_its_reservation_back():
+    clock = Clock()
+    limiter = RateLimiter(rate=1, burst=1, max_queue=10, max_wait=10, clock=clock)
+
+    async def main():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        clock.now = 1  # without the refund this token would already be spoken for
+        limiter.max_wait = 0
+        await limiter.acquire()
+
+    asyncio.run(main())
+
+
+def test_zero_rate_disables_limiting():
+    limiter = RateLimiter(rate=0, burst=1, max_queue=0, max_wait=0)
+
+    async def main():
+        for _ in range(100):
+            await limiter.acquire()
+
+    asyncio.run(main())
+    assert limiter.stats()["admitted_total"] == 100
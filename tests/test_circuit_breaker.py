@@ -0,0 +1,81 @@
+# tests/test_circuit_breaker.py
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def open_breaker(clock: Clock) -> CircuitBreaker:
+    breaker = CircuitBreaker("target", failures=3, reset=10, half_open_calls=1, clock=clock)
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    return breaker
+
+
+def test_consecutive_failures_open_the_circuit():
+    breaker = CircuitBreaker("target", failures=3, reset=10, clock=Clock())
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # a success resets the count
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_open_circuit_rejects_until_reset():
+    clock = Clock()
+    breaker = open_breaker(clock)
+    clock.now = 9.9
+    with pytest.raises(CircuitOpenError, match="is open"):
+        breaker.before_call()
+    assert breaker.stats() == {"state": OPEN, "consecutive_failures": 3, "opened_total": 1, "rejected_total": 1}
+
+
+def test_open_half_open_closed():
+    clock = Clock()
+    breaker = open_breaker(clock)
+    clock.now = 10
+    breaker.before_call()  # the trial call
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError, match="half-open"):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_failed_trial_opens_the_circuit_again():
+    clock = Clock()
+    breaker = open_breaker(clock)
+    clock.now = 10
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.stats()["opened_total"] == 2
+    clock.now = 19.9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now = 20
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+
+
+def test_abandoned_trial_frees_its_slot():
+    clock = Clock()
+    breaker = open_breaker(clock)
+    clock.now = 10
+    breaker.before_call()
+    breaker.abandon()
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
@@ -0,0 +1,87 @@
+# tests/test_json_stream.py
+import asyncio
+import json
+import random
+
+import pytest
+
+from json_stream import aiter_json_array, iter_json_array, project
+
+SAMPLE = [
+    {"id": "1", "name": "Google Pixel 6 Pro", "data": {"color": "Cloudy White", "capacity": "128 GB"}},
+    {"id": "2", "name": "Apple iPhone 12 Mini, 256GB, Blue", "data": None},
+    -500.0,
+    12,
+    1.5e10,
+    -2.25e-3,
+    0,
+    True,
+    False,
+    None,
+    "plain string with \"escapes\", commas, ] and \\u00e9: é",
+    "日本語 и кириллица",
+    [],
+    {},
+    [1, [2, [3.75]]],
+]
+
+
+def split_at(data: bytes, cuts: list) -> list:
+    points = [0, *sorted(cuts), len(data)]
+    return [data[a:b] for a, b in zip(points, points[1:])]
+
+
+@pytest.mark.parametrize("separators", [(",", ":"), (", ", ": ")])
+def test_every_single_boundary(separators):
+    data = json.dumps(SAMPLE, separators=separators, ensure_ascii=False).encode()
+    for cut in range(1, len(data)):
+        assert list(iter_json_array(split_at(data, [cut]))) == SAMPLE, data[:cut]
+
+
+def test_random_chunk_boundaries():
+    rng = random.Random(1234)
+    data = json.dumps(SAMPLE, indent=2, ensure_ascii=False).encode()
+    for _ in range(500):
+        cuts = rng.sample(range(1, len(data)), rng.randint(1, 40))
+        assert list(iter_json_array(split_at(data, cuts))) == SAMPLE
+
+
+def test_number_cut_before_fraction():
+    # raw_decode would read "-500." as -500 and leave ".0" behind
+    assert list(iter_json_array([b"[1, -500.", b"0, 2e", b"3]"])) == [1, -500.0, 2e3]
+
+
+def test_byte_at_a_time_async():
+    data = json.dumps(SAMPLE, ensure_ascii=False).encode()
+
+    async def chunks():
+        for i in range(len(data)):
+            yield data[i:i + 1]
+
+    async def collect():
+        return [item async for item in aiter_json_array(chunks())]
+
+    assert asyncio.run(collect()) == SAMPLE
+
+
+def test_stops_at_the_end_of_the_array():
+    chunks = iter([b"[1, 2]", b"this is never read"])
+    assert list(iter_json_array(chunks)) == [1, 2]
+    assert next(chunks) == b"this is never read"
+
+
+@pytest.mark.parametrize("body", [b"[1, 2", b"[1, 2,", b"[1, -500.", b'[{"id": 1}'])
+def test_truncated_array_raises(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array([body]))
+
+
+def test_not_an_array_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"id": 1}']))
+
+
+def test_project_keeps_dotted_fields():
+    obj = {"id": "1", "name": "x", "data": {"color": "red", "size": 2}}
+    assert project(obj, ["id", "data.color", "missing", "data.nope"]) == {"id": "1", "data": {"color": "red"}}
+    assert project(obj, None) is obj
@@ -0,0 +1,314 @@
+# tests/test_mcp_client_pool.py
+import asyncio
+import time
+
+import pytest
+from fastmcp import FastMCP
+from fastmcp.client.transports import FastMCPTransport
+from fastmcp.exceptions import ToolError
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, INVALID_PARAMS, ErrorData
+
+import mcp_client_pool
+from circuit_breaker import CLOSED, CircuitBreaker, CircuitOpenError
+from mcp_client_pool import Hedger, McpClientPool, PooledSession, SessionLostError, call_mcp_tool
+from object_cache import TTLCache
+
+
+class FakeClient:
+    """Stands in for a fastmcp Client; call_tool runs the test's handler(client, name)."""
+
+    transport = None
+
+    def __init__(self, handler, index):
+        self.handler = handler
+        self.index = index  # 0 for the first session, 1 for its replacement, ...
+        self.connected = False
+
+    async def __aenter__(self):
+        self.connected = True
+        return self
+
+    async def close(self):
+        self.connected = False
+
+    def is_connected(self):
+        return self.connected
+
+    async def ping(self):
+        return True
+
+    async def call_tool(self, name, arguments=None, **kwargs):
+        return await self.handler(self, name)
+
+
+class InProcessClient(FakeClient):
+    """A FakeClient whose session looks like a server loaded in this process."""
+
+    transport = FastMCPTransport(FastMCP("in-process"))
+
+
+class Target:
+    """Factory for FakeClients that records every client made and every call sent."""
+
+    def __init__(self, handler, client_class=FakeClient):
+        self.handler = handler
+        self.client_class = client_class
+        self.clients = []
+        self.calls = []
+
+    def __call__(self, target, http=None):
+        client = self.client_class(self._handle, len(self.clients))
+        self.clients.append(client)
+        return client
+
+    async def _handle(self, client, name):
+        self.calls.append(name)
+        return await self.handler(client, name)
+
+
+async def breaks_first_session(client, name):
+    if client.index == 0:
+        raise SessionLostError("server went away")
+    return f"{name} answered"
+
+
+def session_with(handler):
+    target = Target(handler)
+    return PooledSession("server.py", target), target
+
+
+def test_write_is_not_resent_after_a_lost_session():
+    session, target = session_with(breaks_first_session)
+    with pytest.raises(SessionLostError):
+        asyncio.run(session.call_tool("add_object", {"data": {"name": "x"}}))
+    assert target.calls == ["add_object"]
+    assert session.reconnects == 1
+
+
+def test_retry_tool_is_resent_once_on_a_new_session(monkeypatch):
+    monkeypatch.setattr(mcp_client_pool, "RETRY_TOOLS", {"lookup"})
+    session, target = session_with(breaks_first_session)
+    assert asyncio.run(session.call_tool("lookup", {})) == "lookup answered"
+    assert target.calls == ["lookup", "lookup"]
+    assert (session.connects, session.reconnects) == (2, 1)
+
+
+def test_retry_tool_is_not_resent_twice(monkeypatch):
+    monkeypatch.setattr(mcp_client_pool, "RETRY_TOOLS", {"lookup"})
+
+    async def always_lost(client, name):
+        raise SessionLostError("server went away")
+
+    session, target = session_with(always_lost)
+    with pytest.raises(SessionLostError):
+        asyncio.run(session.call_tool("lookup", {}))
+    assert target.calls == ["lookup", "lookup"]
+
+
+def test_protocol_error_keeps_the_session():
+    async def invalid_params(client, name):
+        raise McpError(ErrorData(code=INVALID_PARAMS, message="object_id is required"))
+
+    session, target = session_with(invalid_params)
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(McpError):
+                await session.call_tool("get_object_by_id", {})
+
+    asyncio.run(main())
+    assert target.calls == ["get_object_by_id", "get_object_by_id"]  # not resent
+    assert len(target.clients) == 1 and target.clients[0].connected
+    assert (session.connects, session.reconnects, session.reused) == (1, 0, 1)
+
+
+def test_closed_connection_counts_as_a_lost_session():
+    async def closed_once(client, name):
+        if client.index == 0:
+            raise McpError(ErrorData(code=CONNECTION_CLOSED, message="Connection closed"))
+        return "answered"
+
+    session, target = session_with(closed_once)
+    assert asyncio.run(session.call_tool("get_object_by_id", {"object_id": "1"})) == "answered"
+    assert session.reconnects == 1
+
+
+class Result:
+    """Stands in for a CallToolResult."""
+
+    is_error = False
+
+    def __init__(self, text):
+        self.text = text
+
+
+async def answers(client, name):
+    return Result(f"{name} answered")
+
+
+@pytest.fixture
+def client_cache(monkeypatch):
+    """An empty client result cache, and no writes seen yet."""
+    monkeypatch.setattr(mcp_client_pool, "result_cache", TTLCache(keep_stale=True))
+    monkeypatch.setattr(mcp_client_pool, "_write_counts", {})
+    return mcp_client_pool.result_cache
+
+
+def run_with_pool(target, calls):
+    """Runs calls(pool) with a pool of target's FakeClients as the loop's pool for call_mcp_tool."""
+
+    async def main():
+        pool = mcp_client_pool._pools[asyncio.get_running_loop()] = McpClientPool(target)
+        return await calls(pool)
+
+    return asyncio.run(main())
+
+
+def open_circuit(pool):
+    breaker = pool._breakers["server.py"] = CircuitBreaker("server.py", failures=1)
+    breaker.record_failure()
+
+
+def test_expired_result_past_the_stale_max_age_is_not_served(client_cache, monkeypatch):
+    monkeypatch.setattr(mcp_client_pool, "STALE_MAX_AGE", 0.05)
+    target = Target(answers)
+
+    async def calls(pool):
+        await call_mcp_tool("server.py", "lookup", {"id": "1"}, cache_ttl=0.01)
+        open_circuit(pool)
+        await asyncio.sleep(0.1)
+        with pytest.raises(CircuitOpenError):
+            await call_mcp_tool("server.py", "lookup", {"id": "1"}, cache_ttl=0.01)
+
+    run_with_pool(target, calls)
+    assert target.calls == ["lookup"]
+
+
+def test_write_drops_the_cached_results_of_its_target(client_cache):
+    target = Target(answers)
+
+    async def calls(pool):
+        await call_mcp_tool("server.py", "lookup", {"id": "1"}, cache_ttl=60)
+        await call_mcp_tool("server.py", "lookup", {"id": "1"}, cache_ttl=60)  # a hit
+        client_cache.set(("other.py", "lookup", "{}"), Result("kept"))
+        await call_mcp_tool("server.py", "rename", {"id": "1"})
+        await call_mcp_tool("server.py", "lookup", {"id": "1"}, cache_ttl=60)
+
+    run_with_pool(target, calls)
+    assert target.calls == ["lookup", "rename", "lookup"]
+    assert len(client_cache) == 2  # the new lookup and the other target's result
+
+
+def test_read_overlapping_a_write_is_not_cached(client_cache):
+    async def slow_lookup(client, name):
+        if name == "lookup":
+            await asyncio.sleep(0.05)
+        return Result(f"{name} answered")
+
+    target = Target(slow_lookup)
+
+    async def calls(pool):
+        read = asyncio.ensure_future(call_mcp_tool("server.py", "lookup", {"id": "1"}, cache_ttl=60))
+        await asyncio.sleep(0.01)
+        await call_mcp_tool("server.py", "rename", {"id": "1"})
+        await read
+        await call_mcp_tool("server.py", "lookup", {"id": "1"}, cache_ttl=60)
+
+    run_with_pool(target, calls)
+    assert target.calls == ["lookup", "rename", "lookup"]
+
+
+def test_timeout_counts_as_a_breaker_failure_and_a_tool_error_does_not():
+    async def handler(client, name):
+        if name == "slow":
+            await asyncio.sleep(1)
+        raise ToolError("object_id is required")
+
+    async def main():
+        pool = McpClientPool(Target(handler))
+        breaker = pool.breaker("server.py")
+        with pytest.raises(TimeoutError):
+            await pool.call_tool("server.py", "slow", {}, deadline=0.05)
+        after_timeout = breaker.consecutive_failures
+        with pytest.raises(ToolError):
+            await pool.call_tool("server.py", "lookup", {})
+        return after_timeout, breaker.consecutive_failures, breaker.state
+
+    assert asyncio.run(main()) == (1, 0, CLOSED)
+
+
+def test_open_circuit_serves_the_expired_result_of_a_cached_tool(client_cache):
+    target = Target(answers)
+
+    async def calls(pool):
+        fresh = await call_mcp_tool("server.py", "lookup", {"id": "1"}, cache_ttl=0.01)
+        open_circuit(pool)
+        await asyncio.sleep(0.03)  # let the entry expire
+        return fresh, await call_mcp_tool("server.py", "lookup", {"id": "1"}, cache_ttl=0.01)
+
+    fresh, stale = run_with_pool(target, calls)
+    assert stale is fresh
+    assert target.calls == ["lookup"]
+
+
+def primed_hedger(latency=0.05):
+    hedger = Hedger()
+    hedger.latencies.extend([latency] * mcp_client_pool.HEDGE_MIN_SAMPLES)
+    return hedger
+
+
+def hedge_race(hedger, primary_latency):
+    """Runs hedger.run over a primary taking primary_latency and an instant backup; returns (result, when the backup started)."""
+    backup_started = []
+
+    async def main():
+        started = time.perf_counter()
+
+        async def primary():
+            await asyncio.sleep(primary_latency)
+            return "primary"
+
+        async def backup():
+            backup_started.append(time.perf_counter() - started)
+            return "backup"
+
+        return await hedger.run(primary, backup)
+
+    return asyncio.run(main()), backup_started
+
+
+def test_hedge_is_sent_once_the_p95_latency_has_passed():
+    hedger = primed_hedger(0.05)
+    result, backup_started = hedge_race(hedger, 1)
+    assert result == "backup"
+    assert len(backup_started) == 1 and backup_started[0] >= 0.045
+    assert (hedger.hedged, hedger.backup_wins) == (1, 1)
+
+
+def test_call_answering_within_the_p95_latency_is_not_hedged():
+    hedger = primed_hedger(0.05)
+    result, backup_started = hedge_race(hedger, 0.01)
+    assert result == "primary"
+    assert backup_started == []
+    assert hedger.hedged == 0
+
+
+def test_tool_is_not_hedged_until_enough_calls_are_timed():
+    hedger = primed_hedger(0.001)
+    hedger.latencies.pop()
+    result, backup_started = hedge_race(hedger, 0.05)
+    assert result == "primary" and backup_started == []
+
+
+@pytest.mark.parametrize("client_class, hedged", [(FakeClient, True), (InProcessClient, False)])
+def test_in_process_targets_are_not_hedged(client_class, hedged):
+    async def main():
+        pool = McpClientPool(Target(answers, client_class))
+        for _ in range(2):  # the first call connects the session
+            await pool.call_tool("server.py", "lookup", {}, hedge=True)
+        return pool
+
+    pool = asyncio.run(main())
+    assert bool(pool._backups) is hedged
+    assert bool(pool._hedgers) is hedged
@@ -0,0 +1,61 @@
+# tests/test_mcp_streaming.py
+import asyncio
+import sys
+
+import pytest
+
+from mcp_client_pool import call_mcp_tool_streamed, closing_mcp_clients
+
+SERVER = '''
+from fastmcp import Context, FastMCP
+from mcp_streaming import ItemStream, wants_stream
+
+mcp = FastMCP("lists")
+ITEMS = [{"id": str(i)} for i in range(120)]
+calls = []
+
+
+@mcp.tool()
+async def listing(ctx: Context, stream: bool = False):
+    calls.append(("listing", stream))
+    if not (stream and wants_stream(ctx)):
+        return ITEMS
+    items = ItemStream(ctx, chunk_items=50)
+    for item in ITEMS:
+        await items.add(item)
+    await items.flush()
+    return items.summary()
+
+
+@mcp.tool()
+async def lossy(ctx: Context, stream: bool = False):
+    # Like a server answering with plain JSON: the slices never reach the client
+    calls.append(("lossy", stream))
+    return {"streamed": True, "count": len(ITEMS)} if stream else ITEMS
+'''
+
+
+@pytest.fixture
+def server_script(tmp_path):
+    script = tmp_path / "list_server.py"
+    script.write_text(SERVER)
+    yield str(script)
+    sys.modules.pop("mcp_inprocess_list_server", None)
+
+
+def calls_made():
+    return sys.modules["mcp_inprocess_list_server"].calls
+
+
+def test_streamed_list_is_assembled_from_the_slices(server_script):
+    slices = []
+    items = asyncio.run(closing_mcp_clients(call_mcp_tool_streamed(server_script, "listing", on_items=lambda new, received: slices.append(received))))
+    assert items == [{"id": str(i)} for i in range(120)]
+    assert slices == [50, 100, 120]
+    assert calls_made() == [("listing", True)]
+
+
+def test_lost_slices_fall_back_to_a_plain_call(server_script):
+    items = asyncio.run(closing_mcp_clients(call_mcp_tool_streamed(server_script, "lossy")))
+    assert items == [{"id": str(i)} for i in range(120)]
+    assert calls_made() == [("lossy", True), ("lossy", False)]
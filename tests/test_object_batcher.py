@@ -0,0 +1,103 @@
+# tests/test_object_batcher.py
+import asyncio
+
+import pytest
+
+from object_batcher import Batcher
+
+
+class Upstream:
+    """Multi-key fetch that records the keys of every call."""
+
+    def __init__(self, known=None, error: Exception = None):
+        self.known = known
+        self.error = error
+        self.calls = []
+
+    async def __call__(self, keys):
+        self.calls.append(list(keys))
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return {key: f"object {key}" for key in keys if self.known is None or key in self.known}
+
+
+def test_loads_in_one_window_are_flushed_together():
+    upstream = Upstream()
+    batcher = Batcher(upstream, window=0.01, max_batch_size=50)
+
+    async def main():
+        return await asyncio.gather(*(batcher.load(key) for key in ["1", "2", "1", "3"]))
+
+    assert asyncio.run(main()) == ["object 1", "object 2", "object 1", "object 3"]
+    assert upstream.calls == [["1", "2", "3"]]  # duplicates share one slot
+    assert batcher.stats() == {"loads": 4, "batches": 1, "largest_batch": 3, "pending": 0}
+
+
+def test_later_loads_go_in_the_next_window():
+    upstream = Upstream()
+    batcher = Batcher(upstream, window=0.005)
+
+    async def main():
+        first = await batcher.load("1")
+        second = await asyncio.gather(batcher.load("2"), batcher.load("3"))
+        return first, second
+
+    assert asyncio.run(main()) == ("object 1", ["object 2", "object 3"])
+    assert upstream.calls == [["1"], ["2", "3"]]
+
+
+def test_max_batch_size_splits_the_window():
+    upstream = Upstream()
+    batcher = Batcher(upstream, window=10, max_batch_size=3)
+    keys = [str(i) for i in range(7)]
+
+    async def main():
+        loads = [asyncio.ensure_future(batcher.load(key)) for key in keys]
+        await asyncio.sleep(0.01)
+        # full batches went out at once; the remainder waits for the (long) window
+        assert [len(call) for call in upstream.calls] == [3, 3]
+        batcher._dispatch()
+        return await asyncio.gather(*loads)
+
+    assert asyncio.run(main()) == [f"object {key}" for key in keys]
+    assert upstream.calls == [keys[0:3], keys[3:6], keys[6:]]
+    assert batcher.largest_batch == 3
+
+
+def test_missing_key_resolves_to_none():
+    upstream = Upstream(known={"1"})
+    batcher = Batcher(upstream, window=0.001)
+
+    async def main():
+        return await asyncio.gather(batcher.load("1"), batcher.load("404"))
+
+    assert asyncio.run(main()) == ["object 1", None]
+
+
+def test_batch_error_reaches_every_load():
+    upstream = Upstream(error=ConnectionError("upstream down"))
+    batcher = Batcher(upstream, window=0.001)
+
+    async def main():
+        return await asyncio.gather(batcher.load("1"), batcher.load("2"), return_exceptions=True)
+
+    outcomes = asyncio.run(main())
+    assert [type(outcome) for outcome in outcomes] == [ConnectionError, ConnectionError]
+    assert len(upstream.calls) == 1
+
+
+def test_cancelled_load_leaves_the_batch_running():
+    upstream = Upstream()
+    batcher = Batcher(upstream, window=0.005)
+
+    async def main():
+        first = asyncio.ensure_future(batcher.load("1"))
+        second = asyncio.ensure_future(batcher.load("1"))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "object 1"
@@ -0,0 +1,77 @@
+# tests/test_object_cache.py
+from object_cache import MISSING, TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entry_expires_after_its_ttl():
+    clock = Clock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=30)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is MISSING
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (2, 1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, clock=Clock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_setting_a_key_again_refreshes_it():
+    clock = Clock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    clock.now = 5
+    cache.set("a", 10)
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    clock.now = 12
+    assert cache.get("a") == 10
+
+
+def test_keep_stale_hands_out_expired_entries():
+    clock = Clock()
+    cache = TTLCache(ttl=10, keep_stale=True, clock=clock)
+    cache.set("a", {"id": "a"}, meta='"etag-1"')
+    clock.now = 11
+    assert cache.get("a") is MISSING
+    assert cache.get_stale("a") == ({"id": "a"}, '"etag-1"')
+    assert cache.get_stale("missing") == (MISSING, None)
+
+
+def test_expired_entries_are_dropped_without_keep_stale():
+    clock = Clock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1, meta="etag")
+    clock.now = 11
+    assert cache.get("a") is MISSING
+    assert cache.get_stale("a") == (MISSING, None)
+
+
+def test_invalidate_where_drops_matching_keys():
+    cache = TTLCache(clock=Clock())
+    for key in [("object", "1"), ("object", "2"), ("all",)]:
+        cache.set(key, key)
+    assert cache.invalidate_where(lambda key: key[0] == "object") == 2
+    assert cache.get(("all",)) == ("all",)
+    assert len(cache) == 1
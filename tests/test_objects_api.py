@@ -0,0 +1,73 @@
+# tests/test_objects_api.py
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+NEW = {"name": "Renamed", "data": {"color": "Red"}}
+
+
+def read_during(read, write):
+    """Starts read() on a thread, runs write() while it waits on the stub, and returns what read() got."""
+    result = {}
+    reader = threading.Thread(target=lambda: result.update(value=read()))
+    reader.start()
+    time.sleep(0.03)  # the GET is in the stub's 100 ms latency, before it reads the store
+    write()
+    reader.join()
+    return result["value"]
+
+
+def test_read_overlapping_an_update_is_not_cached(objects_api):
+    old = read_during(lambda: objects_api.fetch_object("1"), lambda: objects_api.replace_object("1", NEW))
+    assert old["name"] == "Object 1"  # served, but not kept
+    cached = objects_api.object_cache.get(("object", "1"))
+    assert cached is objects_api.MISSING or cached["name"] == "Renamed"
+    assert objects_api.fetch_object("1")["name"] == "Renamed"
+
+
+def test_read_overlapping_a_delete_is_not_cached(objects_api):
+    read_during(lambda: objects_api.fetch_object("2"), lambda: objects_api.remove_object("2"))
+    assert objects_api.object_cache.get(("object", "2")) is objects_api.MISSING
+    with pytest.raises(requests.HTTPError):
+        objects_api.fetch_object("2")
+
+
+def test_list_read_overlapping_a_write_is_not_cached(objects_api):
+    read_during(objects_api.fetch_all_objects, lambda: objects_api.remove_object("3"))
+    assert "3" not in [obj["id"] for obj in objects_api.fetch_all_objects()]
+
+
+def test_batched_async_read_overlapping_an_update_is_not_cached(objects_api):
+    async def main():
+        read = asyncio.ensure_future(objects_api.afetch_object("4"))
+        await asyncio.sleep(0.03)
+        await objects_api.areplace_object("4", NEW)
+        old = await read
+        try:
+            return old, await objects_api.afetch_object("4")
+        finally:
+            await objects_api.aclose_objects_client()
+
+    old, now = asyncio.run(main())
+    assert old["name"] == "Object 4"
+    assert now["name"] == "Renamed"
+
+
+def test_stale_async_read_is_revalidated(objects_api, stub_server, monkeypatch):
+    monkeypatch.setattr(objects_api, "object_cache", objects_api.TTLCache(ttl=0.05, keep_stale=True))
+
+    async def main():
+        try:
+            for _ in range(3):
+                assert (await objects_api.afetch_object("5"))["name"] == "Object 5"
+                await asyncio.sleep(0.06)  # let the entry go stale
+        finally:
+            await objects_api.aclose_objects_client()
+
+    asyncio.run(main())
+    # 1st read batched (no validators), 2nd fetched on its own, 3rd a conditional GET
+    assert stub_server.not_modified > 0
+    assert objects_api.revalidation_stats["not_modified"] > 0
@@ -0,0 +1,116 @@
+# tests/test_restapi_mcp_server.py
+import asyncio
+import os
+import sys
+
+import pytest
+from fastmcp import Client
+
+from mcp_client_pool import _servers, call_mcp_tool_batch, closing_mcp_clients, load_server, result_data
+from mcp_serving import load_script
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "restapi-mcp-server.py")
+
+
+@pytest.fixture
+def server(stub_server):
+    """A fresh restapi-mcp-server module, with an empty read cache, whose upstream is stub_server."""
+    module = load_script(SCRIPT, prefix="test_")
+    module.upstream = module.UpstreamClient(stub_server.base_url)
+    return module
+
+
+def run(server, calls):
+    """Runs calls(client) against the server in process and returns what it returns."""
+
+    async def main():
+        try:
+            async with Client(server.mcp) as client:
+                return await calls(client)
+        finally:
+            await server.upstream.aclose()
+
+    return asyncio.run(main())
+
+
+async def read_all(client):
+    """Calls every read tool once with arguments that cover object 1."""
+    await client.call_tool("get_object_by_id", {"object_id": "1"})
+    await client.call_tool("get_objects_by_ids", {"ids": ["1", "2"]})
+    await client.call_tool("get_objects_by_ids", {"ids": ["3", "1"]})
+    await client.call_tool("get_all_objects", {})
+
+
+def misses(server):
+    return {tool: counts["misses"] for tool, counts in server.cache_counters.items()}
+
+
+@pytest.mark.parametrize("write", [
+    ("update_object", {"object_id": "1", "data": {"name": "Renamed", "data": {}}}),
+    ("patch_object", {"object_id": "1", "data": {"name": "Renamed"}}),
+    ("update_objects", {"items": [{"object_id": "1", "data": {"name": "Renamed", "data": {}}}]}),
+    ("delete_objects", {"object_ids": ["1"]}),
+])
+def test_write_invalidates_every_read_covering_the_object(server, write):
+    async def calls(client):
+        await read_all(client)
+        await read_all(client)  # all hits
+        before = misses(server)
+        await client.call_tool(*write)
+        await read_all(client)
+        return before
+
+    before = run(server, calls)
+    assert before == {"get_all_objects": 1, "get_objects_by_ids": 2, "get_object_by_id": 1}
+    assert misses(server) == {"get_all_objects": 2, "get_objects_by_ids": 4, "get_object_by_id": 2}
+
+
+def test_write_keeps_reads_of_other_objects(server):
+    async def calls(client):
+        await client.call_tool("get_object_by_id", {"object_id": "2"})
+        await client.call_tool("get_objects_by_ids", {"ids": ["2", "3"]})
+        await client.call_tool("update_object", {"object_id": "1", "data": {"name": "Renamed", "data": {}}})
+        await client.call_tool("get_object_by_id", {"object_id": "2"})
+        await client.call_tool("get_objects_by_ids", {"ids": ["2", "3"]})
+
+    run(server, calls)
+    assert misses(server)["get_object_by_id"] == 1
+    assert misses(server)["get_objects_by_ids"] == 1
+
+
+def test_reads_after_an_update_return_the_new_object(server):
+    async def calls(client):
+        await read_all(client)
+        await client.call_tool("update_object", {"object_id": "1", "data": {"name": "Renamed", "data": {}}})
+        single = result_data(await client.call_tool("get_object_by_id", {"object_id": "1"}))
+        some = result_data(await client.call_tool("get_objects_by_ids", {"ids": ["1", "2"]}))
+        every = result_data(await client.call_tool("get_all_objects", {}))
+        return single, some, every
+
+    single, some, every = run(server, calls)
+    assert single["name"] == "Renamed"
+    assert some[0]["name"] == "Renamed"
+    assert next(obj for obj in every if obj["id"] == "1")["name"] == "Renamed"
+
+
+def test_batch_reports_a_missing_object_as_failed(stub_server):
+    # Through the client pool, which loads the script in process under its own name
+    load_server(SCRIPT)
+    module = sys.modules["mcp_inprocess_restapi_mcp_server"]
+    module.upstream = module.UpstreamClient(stub_server.base_url)
+
+    async def main():
+        try:
+            return await call_mcp_tool_batch(SCRIPT, "get_object_by_id", [{"object_id": "1"}, {"object_id": "nope"}], key="object_id")
+        finally:
+            await module.upstream.aclose()
+
+    try:
+        batch = asyncio.run(closing_mcp_clients(main()))
+    finally:
+        _servers.pop(SCRIPT, None)
+        sys.modules.pop("mcp_inprocess_restapi_mcp_server", None)
+    assert (batch["succeeded"], batch["failed"]) == (1, 1)
+    ok, missing = batch["results"]
+    assert ok["ok"] and ok["result"]["id"] == "1"
+    assert missing == {"index": 1, "object_id": "nope", "ok": False, "error": "Object with id=nope was not found."}
@@ -0,0 +1,120 @@
+# tests/test_singleflight.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from singleflight import AsyncSingleFlight, SingleFlight
+
+CALLERS = 8
+
+
+def wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_threads(group: SingleFlight, fn) -> list:
+    outcomes = [None] * CALLERS
+
+    def caller(i: int) -> None:
+        try:
+            outcomes[i] = group.do("key", fn)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_concurrent_threads_share_one_call():
+    group = SingleFlight()
+    upstream = []
+
+    def fetch():
+        upstream.append(1)
+        wait_for(lambda: group.calls == CALLERS)  # hold the flight open until everyone has joined
+        return {"id": "1"}
+
+    outcomes = run_threads(group, fetch)
+    assert upstream == [1]
+    assert outcomes == [{"id": "1"}] * CALLERS
+    assert group.stats() == {"calls": CALLERS, "executions": 1, "collapsed": CALLERS - 1, "in_flight": 0}
+
+
+def test_error_reaches_every_waiting_thread():
+    group = SingleFlight()
+    error = ConnectionError("upstream down")
+
+    def fetch():
+        wait_for(lambda: group.calls == CALLERS)
+        raise error
+
+    assert run_threads(group, fetch) == [error] * CALLERS
+    assert group.executions == 1
+
+
+def test_thread_key_is_released_after_the_call():
+    group = SingleFlight()
+    assert group.do("key", lambda: 1) == 1
+    assert group.do("key", lambda: 2) == 2
+    assert group.stats()["executions"] == 2
+
+
+def test_concurrent_coroutines_share_one_call():
+    group = AsyncSingleFlight()
+    upstream = []
+
+    async def fetch():
+        upstream.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": "1"}
+
+    async def main():
+        return await asyncio.gather(*(group.do("key", fetch) for _ in range(CALLERS)))
+
+    assert asyncio.run(main()) == [{"id": "1"}] * CALLERS
+    assert upstream == [1]
+    assert group.stats() == {"calls": CALLERS, "executions": 1, "collapsed": CALLERS - 1, "in_flight": 0}
+
+
+def test_error_reaches_every_waiting_coroutine():
+    group = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("upstream down")
+
+    async def main():
+        return await asyncio.gather(*(group.do("key", fetch) for _ in range(CALLERS)), return_exceptions=True)
+
+    outcomes = asyncio.run(main())
+    assert all(isinstance(outcome, ConnectionError) for outcome in outcomes)
+    assert len({id(outcome) for outcome in outcomes}) == 1
+    assert group.executions == 1
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    group = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(group.do("key", fetch))
+        second = asyncio.ensure_future(group.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
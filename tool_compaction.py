@@ -0,0 +1,150 @@
+# tool_compaction.py
+# Shrinks tool results before they are sent back to the model.
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from app_logging import get_logger
+from json_stream import project
+
+logger = get_logger(__name__)
+
+# Rough size of one model token in bytes of JSON, used for the savings estimate
+BYTES_PER_TOKEN = 4
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha1(_dumps(value).encode("utf-8")).hexdigest()[:16]
+
+
+class ToolResultCompactor:
+    """
+    Compacts tool results in an after_tool_callback:
+      * keeps only the allowlisted fields of each object for a tool,
+      * truncates long lists and strings, noting how much was cut,
+      * replaces objects (or whole results) already sent in this session with
+        a short reference, tracked in the session state.
+    The original result is never mutated, since it may be a shared cache entry.
+    Args:
+        field_allowlists (dict): Tool name -> fields to keep per object
+            (dotted paths allowed, e.g. "data.color").
+        max_list_items (int): Items kept from any list; 0 disables.
+        max_string_chars (int): Characters kept from any string; 0 disables.
+        dedupe (bool): Whether to replace results already sent in the session.
+        max_remembered (int): Digests of sent objects kept in the session state.
+        state_key (str): Session state key holding the sent digests.
+    """
+
+    def __init__(
+        self,
+        field_allowlists: Optional[Dict[str, List[str]]] = None,
+        max_list_items: int = 25,
+        max_string_chars: int = 2000,
+        dedupe: bool = True,
+        max_remembered: int = 500,
+        state_key: str = "compaction_sent",
+    ):
+        self.field_allowlists = field_allowlists or {}
+        self.max_list_items = max_list_items
+        self.max_string_chars = max_string_chars
+        self.dedupe = dedupe
+        self.max_remembered = max_remembered
+        self.state_key = state_key
+
+    def compact(self, tool_name: str, result: Any, sent: Optional[List[str]] = None) -> Any:
+        """
+        Returns the compacted result. sent is the list of digests already sent
+        in the session; it is updated in place when dedupe is on.
+        """
+        whole = None
+        if self.dedupe and sent is not None:
+            whole = _digest(result)
+            if whole in sent:
+                return {"unchanged": True, "note": f"{tool_name} returned the same data earlier in this session."}
+        fields = self.field_allowlists.get(tool_name)
+        compacted = self._compact_value(result, fields, sent, top=True)
+        if whole is not None and whole not in sent:
+            self._remember(sent, whole)
+        return compacted
+
+    def _compact_value(self, value: Any, fields: Optional[List[str]], sent: Optional[List[str]], top: bool = False) -> Any:
+        if isinstance(value, list):
+            items = value
+            omitted = 0
+            if self.max_list_items and len(items) > self.max_list_items:
+                omitted = len(items) - self.max_list_items
+                items = items[:self.max_list_items]
+            compacted = [self._compact_object(item, fields, sent) for item in items]
+            if omitted:
+                compacted.append(f"... {omitted} more items omitted (total {len(value)})")
+            return compacted
+        if isinstance(value, dict):
+            # Paged results carry their objects under "objects"
+            if top and isinstance(value.get("objects"), list):
+                return {**value, "objects": self._compact_value(value["objects"], fields, sent)}
+            return self._compact_object(value, fields, sent)
+        return self._truncate(value)
+
+    def _compact_object(self, obj: Any, fields: Optional[List[str]], sent: Optional[List[str]]) -> Any:
+        if not isinstance(obj, dict):
+            return self._truncate(obj)
+        obj = project(obj, fields)
+        if self.dedupe and sent is not None and "id" in obj:
+            digest = _digest(obj)
+            if digest in sent:
+                return {"id": obj["id"], "already_sent": True}
+            self._remember(sent, digest)
+        return {key: self._truncate_nested(value) for key, value in obj.items()}
+
+    def _truncate_nested(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: self._truncate_nested(item) for key, item in value.items()}
+        if isinstance(value, list):
+            if self.max_list_items and len(value) > self.max_list_items:
+                kept = [self._truncate_nested(item) for item in value[:self.max_list_items]]
+                return kept + [f"... {len(value) - self.max_list_items} more items omitted (total {len(value)})"]
+            return [self._truncate_nested(item) for item in value]
+        return self._truncate(value)
+
+    def _truncate(self, value: Any) -> Any:
+        if isinstance(value, str) and self.max_string_chars and len(value) > self.max_string_chars:
+            return value[:self.max_string_chars] + f"... [{len(value) - self.max_string_chars} chars omitted]"
+        return value
+
+    def _remember(self, sent: List[str], digest: str) -> None:
+        sent.append(digest)
+        if len(sent) > self.max_remembered:
+            del sent[:len(sent) - self.max_remembered]
+
+    def savings(self, original: Any, compacted: Any) -> Dict[str, int]:
+        """Returns bytes and estimated tokens saved by compaction."""
+        before = len(_dumps(original).encode("utf-8"))
+        after = len(_dumps(compacted).encode("utf-8"))
+        return {
+            "bytes_before": before,
+            "bytes_after": after,
+            "bytes_saved": before - after,
+            "tokens_saved": (before - after) // BYTES_PER_TOKEN,
+        }
+
+    def after_tool_callback(self, tool, args: Dict[str, Any], tool_context, tool_response: Any) -> Optional[Any]:
+        """ADK after_tool_callback: returns the compacted result, or None to keep the original."""
+        if tool_response is None:
+            return None
+        sent = list(tool_context.state.get(self.state_key, [])) if self.dedupe else None
+        compacted = self.compact(tool.name, tool_response, sent)
+        if sent is not None:
+            tool_context.state[self.state_key] = sent
+        report = self.savings(tool_response, compacted)
+        totals = dict(tool_context.state.get("compaction_savings", {}))
+        totals["bytes_saved"] = totals.get("bytes_saved", 0) + report["bytes_saved"]
+        totals["tokens_saved"] = totals.get("tokens_saved", 0) + report["tokens_saved"]
+        tool_context.state["compaction_savings"] = totals
+        logger.info("Tool %s result compacted: %s", tool.name, report)
+        if report["bytes_saved"] <= 0:
+            return None
+        return compacted